@@ -0,0 +1,167 @@
+"""Microbenchmarks for QuantumSimulator with baseline regression tracking.
+
+Times generate_rabi_data, generate_decay_data and generate_bell_data over a
+scaling grid of time_steps and shots, records peak traced memory, and compares
+the results with a stored baseline JSON. Runs offline; nothing but NumPy needed.
+
+    python benchmark.py                      # run and compare with benchmark_baseline.json
+    python benchmark.py --quick -k rabi      # small sizes only, Rabi cases only
+    python benchmark.py --save               # store this run as the new baseline
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from quantum_simulator import QuantumSimulator
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+# Scaling grid as powers of ten
+TIME_STEPS = range(2, 7)
+SHOTS = range(2, 8)
+# Fixed value of the other axis while one axis is scanned
+BASE_TIME_STEPS = 1000
+BASE_SHOTS = 1000
+QUICK_LIMIT = 4
+
+simulator = QuantumSimulator()
+
+
+def cases(quick: bool = False) -> Dict[str, Callable[[], Any]]:
+    """Benchmark name -> zero-argument call; each scan varies one axis with the other fixed"""
+    generators = {
+        "rabi": lambda steps, shots: simulator.generate_rabi_data(
+            omega=2.0, time_max=10.0, time_steps=steps, noise_rate=0.05, shots=shots, seed=0, format="arrays"),
+        "decay": lambda steps, shots: simulator.generate_decay_data(
+            t1=5.0, t2=3.0, time_max=15.0, time_steps=steps, noise_rate=0.05, shots=shots, seed=0, format="arrays"),
+    }
+    limit = QUICK_LIMIT if quick else float("inf")
+    table = {}
+    for name, generate in generators.items():
+        for k in TIME_STEPS:
+            if k <= limit:
+                table[f"{name}/time_steps=1e{k}"] = lambda g=generate, n=10 ** k: g(n, BASE_SHOTS)
+        for k in SHOTS:
+            if k <= limit:
+                table[f"{name}/shots=1e{k}"] = lambda g=generate, n=10 ** k: g(BASE_TIME_STEPS, n)
+    for k in SHOTS:
+        if k <= limit:
+            table[f"bell/shots=1e{k}"] = lambda n=10 ** k: simulator.generate_bell_data(
+                noise_rate=0.1, shots=n, seed=0, format="arrays")
+    return table
+
+
+def measure(call: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Best and median wall time over `repeat` runs, then peak traced memory of one more run"""
+    call()  # warm-up: imports, caches, first-touch page faults
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - start)
+
+    # tracemalloc slows allocation-heavy code, so memory gets its own run
+    tracemalloc.start()
+    try:
+        call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"time_min": min(times), "time_median": float(np.median(times)), "peak_bytes": peak}
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float, memory_threshold: float, min_delta: float = 0.0) -> List[str]:
+    """Names of cases whose best time or peak memory grew beyond the thresholds.
+
+    Slowdowns below `min_delta` seconds are ignored so millisecond cases do not flap.
+    """
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        slower = current["time_min"] / reference["time_min"] - 1
+        bigger = current["peak_bytes"] / max(reference["peak_bytes"], 1) - 1
+        if slower > threshold and current["time_min"] - reference["time_min"] > min_delta:
+            regressions.append(f"{name}: time {slower:+.0%}")
+        if bigger > memory_threshold:
+            regressions.append(f"{name}: memory {bigger:+.0%}")
+    return regressions
+
+
+def format_row(name: str, current: Dict[str, float], reference: Dict[str, float] = None) -> str:
+    row = f"{name:<28} {current['time_min'] * 1e3:>10.2f} ms {current['peak_bytes'] / 2 ** 20:>10.1f} MiB"
+    if reference:
+        row += (f"   time {current['time_min'] / reference['time_min'] - 1:+7.1%}"
+                f"   mem {current['peak_bytes'] / max(reference['peak_bytes'], 1) - 1:+7.1%}")
+    return row
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--save", action="store_true", help="merge this run into the baseline file")
+    parser.add_argument("--output", help="also write this run's results to a JSON file")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative slowdown before a case counts as a regression (default 0.25)")
+    parser.add_argument("--memory-threshold", type=float, default=0.10,
+                        help="allowed relative growth of peak memory (default 0.10)")
+    parser.add_argument("--min-delta", type=float, default=0.002,
+                        help="ignore slowdowns smaller than this many seconds (default 0.002)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (default 3)")
+    parser.add_argument("--quick", action="store_true", help=f"only sizes up to 1e{QUICK_LIMIT}")
+    parser.add_argument("-k", dest="filter", default="", help="only cases whose name contains this")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+        baseline = stored["results"]
+        if stored.get("environment") != environment():
+            print(f"note: baseline was recorded on {stored.get('environment')}", file=sys.stderr)
+
+    results = {}
+    for name, call in cases(args.quick).items():
+        if args.filter not in name:
+            continue
+        results[name] = measure(call, args.repeat)
+        print(format_row(name, results[name], baseline.get(name)), flush=True)
+
+    run = {"environment": environment(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(run, f, indent=2)
+    if args.save:
+        # Cases left out by --quick or -k keep their stored numbers
+        with open(args.baseline, "w") as f:
+            json.dump({"environment": environment(), "results": dict(baseline, **results)}, f, indent=2)
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.threshold, args.memory_threshold, args.min_delta)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
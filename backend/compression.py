@@ -0,0 +1,134 @@
+import gzip
+import zlib
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from metrics import phase
+
+try:
+    import zstandard
+except ImportError:  # zstd is only offered when the package is installed
+    zstandard = None
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick zstd or gzip from an Accept-Encoding header, honouring q=0"""
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            accepted.add(coding.strip().lower())
+    if zstandard is not None and ("zstd" in accepted or "*" in accepted):
+        return "zstd"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+class CompressionMiddleware:
+    """Negotiated gzip/zstd response compression.
+
+    Complete bodies smaller than `minimum_size` are sent as-is; streamed bodies
+    are compressed incrementally and flushed per chunk so clients still see
+    records as soon as they are produced.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, zstd_level: int = 3):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.zstd_level = zstd_level
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(self, encoding, send)
+        await self.app(scope, receive, responder)
+
+    def compress(self, encoding: str, body: bytes) -> bytes:
+        if encoding == "zstd":
+            return zstandard.ZstdCompressor(level=self.zstd_level).compress(body)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def compressor(self, encoding: str):
+        """Incremental compressor returning (compress, flush, finish) callables"""
+        if encoding == "zstd":
+            compressor = zstandard.ZstdCompressor(level=self.zstd_level).compressobj()
+            return (compressor.compress,
+                    lambda: compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+                    compressor.flush)
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return (compressor.compress,
+                lambda: compressor.flush(zlib.Z_SYNC_FLUSH),
+                compressor.flush)
+
+
+class _CompressingResponder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start_message: Optional[Message] = None
+        self.streaming: Optional[Tuple] = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message):
+        if message["type"] == "http.response.start":
+            # Hold the start message until the first body chunk tells us whether to compress
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            # Byte-range resources are always sent as-is so offsets refer to the stored bytes
+            self.passthrough = any(name in headers for name in ("content-encoding", "content-range", "accept-ranges"))
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            if self.passthrough or (not more_body and len(body) < self.middleware.minimum_size):
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body:
+                with phase("compression"):
+                    body = self.middleware.compress(self.encoding, body)
+                headers["Content-Length"] = str(len(body))
+                await self.send(start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            del headers["Content-Length"]
+            self.streaming = self.middleware.compressor(self.encoding)
+            await self.send(start)
+
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        compress, flush, finish = self.streaming
+        with phase("compression"):
+            chunk = compress(body) + (flush() if more_body else finish())
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
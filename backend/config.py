@@ -0,0 +1,47 @@
+import os
+from dataclasses import dataclass, field
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Backend settings, read from QP_* environment variables at startup"""
+
+    # Executor for CPU-bound generation: "thread" or "process"
+    worker_pool: str = field(default_factory=lambda: os.getenv("QP_WORKER_POOL", "thread"))
+    # Number of generation workers
+    workers: int = field(default_factory=lambda: _env_int("QP_WORKERS", os.cpu_count() or 1))
+    # Requests allowed to wait for a free worker before new ones get a 503
+    queue_depth: int = field(default_factory=lambda: _env_int("QP_QUEUE_DEPTH", 32))
+    # Total size of cached responses for seeded requests; 0 disables the cache
+    cache_max_bytes: int = field(default_factory=lambda: _env_int("QP_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+    # Responses smaller than this many bytes are sent uncompressed
+    compression_min_size: int = field(default_factory=lambda: _env_int("QP_COMPRESSION_MIN_SIZE", 1024))
+    # gzip level (1-9) and zstd level (1-22) for negotiated response compression
+    gzip_level: int = field(default_factory=lambda: _env_int("QP_GZIP_LEVEL", 6))
+    zstd_level: int = field(default_factory=lambda: _env_int("QP_ZSTD_LEVEL", 3))
+    # Directory holding background job records and results, and the number of jobs run at once
+    job_dir: str = field(default_factory=lambda: os.getenv("QP_JOB_DIR", "jobs"))
+    job_workers: int = field(default_factory=lambda: _env_int("QP_JOB_WORKERS", 1))
+    # Directory of the memory-mapped dataset store, and the most rows one /slice response may return
+    dataset_dir: str = field(default_factory=lambda: os.getenv("QP_DATASET_DIR", "datasets"))
+    slice_max_points: int = field(default_factory=lambda: _env_int("QP_SLICE_MAX_POINTS", 1_000_000))
+    # Total size of stored dataset arrays; least recently used datasets are removed beyond it, 0 keeps all
+    dataset_max_bytes: int = field(default_factory=lambda: _env_int("QP_DATASET_MAX_BYTES", 1024 * 1024 * 1024))
+    # Largest ensemble_size x points one request may draw
+    ensemble_max_points: int = field(default_factory=lambda: _env_int("QP_ENSEMBLE_MAX_POINTS", 10_000_000))
+    # Largest sweep grid size x points one request may generate
+    sweep_max_points: int = field(default_factory=lambda: _env_int("QP_SWEEP_MAX_POINTS", 10_000_000))
+    # Most batches a WebSocket stream sends ahead of the client's acks, and how long it waits for one
+    stream_window: int = field(default_factory=lambda: _env_int("QP_STREAM_WINDOW", 16))
+    stream_ack_timeout: int = field(default_factory=lambda: _env_int("QP_STREAM_ACK_TIMEOUT", 60))
+    # Request metrics at /metrics and the Server-Timing header; 0 turns each off
+    metrics: bool = field(default_factory=lambda: bool(_env_int("QP_METRICS", 1)))
+    server_timing: bool = field(default_factory=lambda: bool(_env_int("QP_SERVER_TIMING", 1)))
+
+
+settings = Settings()
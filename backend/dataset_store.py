@@ -0,0 +1,256 @@
+import json
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from exporters import flatten_columns, split_shots
+from serialization import dumps
+
+
+class DatasetNotFound(Exception):
+    """Raised for an unknown dataset id or column"""
+
+
+def is_shot_plane(name: str) -> bool:
+    return name.rsplit(".", 1)[-1].startswith("shots_packed")
+
+
+def build_dataset(directory: str, key: str, experiment: str,
+                  generate: Callable[..., Dict[str, Any]], params: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate a dataset and write every array as its own .npy file; runs in a pool worker.
+
+    Files go to a private temporary directory that is renamed into place at the
+    end, so readers never see a partly written dataset.
+    """
+    data = generate(format="arrays", **params)
+    columns = flatten_columns(data.pop("measurements"))
+    shots = None
+    if "shots" in data:
+        planes, shots = split_shots(data.pop("shots"))
+        columns.update(planes)
+
+    final = os.path.join(directory, key)
+    temporary = f"{final}.{os.getpid()}.{threading.get_ident()}.tmp"
+    os.makedirs(temporary)
+    try:
+        for name, values in columns.items():
+            np.save(os.path.join(temporary, f"{name}.npy"), np.ascontiguousarray(values))
+        meta = json.loads(dumps({
+            "id": key,
+            "experiment": experiment,
+            "experiment_type": data["experiment_type"],
+            "parameters": data["parameters"],
+            "statistics": data["statistics"],
+            "metadata": data["metadata"],
+            "shots": shots,
+            "columns": {name: {"dtype": values.dtype.str, "shape": list(values.shape)}
+                        for name, values in columns.items()},
+            "bytes": int(sum(values.nbytes for values in columns.values())),
+            "created_at": time.time(),
+        }))
+        with open(os.path.join(temporary, "meta.json"), "w") as f:
+            json.dump(meta, f)
+        os.rename(temporary, final)
+    except OSError:
+        shutil.rmtree(temporary, ignore_errors=True)
+        if not os.path.isdir(final):
+            raise
+        # Another worker stored the same parameters first; its files are identical
+        with open(os.path.join(final, "meta.json")) as f:
+            meta = json.load(f)
+    return meta
+
+
+class DatasetStore:
+    """Generated datasets kept on disk as one memory-mappable .npy file per column.
+
+    Datasets are keyed by a hash of their experiment and parameters; index.json
+    maps each key to a short summary so listing never opens the arrays. Reads map
+    the files with np.load(mmap_mode='r'), so serving a window only touches the
+    pages it covers.
+
+    The store is bounded by the total size of its arrays: registering a dataset
+    evicts the least recently used ones until it fits. The newest dataset is
+    always kept, even when it alone is over the budget.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 0):
+        self.directory = os.path.abspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self.max_bytes = max_bytes  # 0 means unbounded
+        self._lock = threading.Lock()
+        # Least recently used first; the order lives in memory and starts from creation time
+        self._index: "OrderedDict[str, Dict[str, Any]]" = OrderedDict(
+            sorted(self._load_index().items(), key=lambda item: item[1]["created_at"]))
+        self.total_bytes = sum(summary["bytes"] for summary in self._index.values())
+        self.evictions = 0
+        self._evict()
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.directory, "index.json")) as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            # Missing or damaged index: rebuild it from the datasets themselves
+            index = {}
+            for key in os.listdir(self.directory):
+                meta = os.path.join(self.directory, key, "meta.json")
+                if os.path.isfile(meta):
+                    with open(meta) as f:
+                        index[key] = self._summary(json.load(f))
+            return index
+
+    def _save_index(self):
+        path = os.path.join(self.directory, "index.json")
+        with open(f"{path}.tmp", "w") as f:
+            json.dump(self._index, f)
+        os.replace(f"{path}.tmp", path)
+
+    @staticmethod
+    def _summary(meta: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: meta[key] for key in ("id", "experiment", "parameters", "bytes", "created_at")}
+
+    def path(self, key: str, name: str = "") -> str:
+        # Keys are SHA-256 hex digests; anything else cannot name a dataset directory
+        if not (len(key) == 64 and all(c in "0123456789abcdef" for c in key)):
+            raise DatasetNotFound(key)
+        return os.path.join(self.directory, key, name)
+
+    def exists(self, key: str) -> bool:
+        return key in self._index
+
+    def _evict(self) -> List[str]:
+        """Drop least recently used entries until the budget holds; call with the lock held or in __init__"""
+        evicted = []
+        while self.max_bytes and self.total_bytes > self.max_bytes and len(self._index) > 1:
+            key, summary = self._index.popitem(last=False)
+            self.total_bytes -= summary["bytes"]
+            self.evictions += 1
+            evicted.append(key)
+        if evicted:
+            self._save_index()
+        for key in evicted:
+            shutil.rmtree(self.path(key), ignore_errors=True)
+        return evicted
+
+    def register(self, meta: Dict[str, Any]):
+        with self._lock:
+            previous = self._index.pop(meta["id"], None)
+            if previous is not None:
+                self.total_bytes -= previous["bytes"]
+            self._index[meta["id"]] = self._summary(meta)
+            self.total_bytes += meta["bytes"]
+            self._save_index()
+            self._evict()
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return sorted(self._index.values(), key=lambda summary: summary["created_at"])
+
+    def describe(self, key: str) -> Dict[str, Any]:
+        with self._lock:
+            if key not in self._index:
+                raise DatasetNotFound(key)
+            self._index.move_to_end(key)
+        with open(self.path(key, "meta.json")) as f:
+            return json.load(f)
+
+    def delete(self, key: str):
+        with self._lock:
+            summary = self._index.pop(key, None)
+            if summary is None:
+                raise DatasetNotFound(key)
+            self.total_bytes -= summary["bytes"]
+            self._save_index()
+        shutil.rmtree(self.path(key), ignore_errors=True)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._index),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+            }
+
+    def open(self, key: str, column: str) -> np.memmap:
+        """Read-only memory map of one column"""
+        meta = self.describe(key)
+        if column not in meta["columns"]:
+            raise DatasetNotFound(f"{key}/{column}")
+        return np.load(self.path(key, f"{column}.npy"), mmap_mode="r")
+
+    def point_range(self, key: str, start: Optional[int] = None, stop: Optional[int] = None,
+                    time_start: Optional[float] = None, time_stop: Optional[float] = None) -> Tuple[int, int]:
+        """Row range [start, stop) from row indices and/or a closed time window"""
+        meta = self.describe(key)
+        points = next(iter(meta["columns"].values()))["shape"][0]
+        start, stop, _ = slice(start, stop).indices(points)
+        if time_start is not None or time_stop is not None:
+            names = [name for name in meta["columns"] if name.rsplit(".", 1)[-1] == "time"]
+            if not names:
+                raise ValueError(f"{meta['experiment']} datasets have no time axis")
+            # Times are sorted, so a binary search on the map finds the window without reading it all
+            time = self.open(key, names[0])
+            if time_start is not None:
+                start = max(start, int(np.searchsorted(time, time_start, side="left")))
+            if time_stop is not None:
+                stop = min(stop, int(np.searchsorted(time, time_stop, side="right")))
+        return start, max(start, stop)
+
+    def read(self, key: str, columns: Sequence[str], start: int, stop: int, step: int = 1) -> Dict[str, np.ndarray]:
+        """Copy rows start:stop:step of each column out of its memory map"""
+        return {name: np.array(self.open(key, name)[start:stop:step]) for name in columns}
+
+    def read_shots(self, key: str, planes: Sequence[str], start: int, stop: int, step: int = 1,
+                   shot_start: int = 0, shot_stop: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Shots [shot_start, shot_stop) of rows start:stop:step, repacked to start at bit 0.
+
+        Only the bytes that cover the shot window are read from each row.
+        """
+        shots = self.describe(key)["parameters"]["shots"]
+        first, last, _ = slice(shot_start, shot_stop).indices(shots)
+        last = max(first, last)
+        out = {}
+        for name in planes:
+            packed = self.open(key, name)
+            window = np.array(packed[start:stop:step, first // 8:-(-last // 8)])
+            bits = np.unpackbits(window, axis=1)[:, first % 8:first % 8 + last - first]
+            out[name] = np.packbits(bits, axis=1)
+        return out
+
+
+def byte_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Inclusive (first, last) byte positions of a single-range Range header, or None to send everything.
+
+    Raises ValueError when the range cannot be satisfied. Multiple ranges are not
+    supported and fall back to the full body, as RFC 9110 allows.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first, _, last = header[len("bytes="):].strip().partition("-")
+    try:
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0:
+                raise ValueError(header)
+            return max(0, size - length), size - 1
+        first = int(first)
+        last = min(int(last), size - 1) if last else size - 1
+    except ValueError:
+        raise ValueError(header)
+    if first >= size or last < first:
+        raise ValueError(header)
+    return first, last
+
+
+def iter_bytes(buffer: np.ndarray, first: int, last: int, chunk_bytes: int = 1 << 20) -> Iterator[bytes]:
+    """Yield buffer[first:last + 1] in chunks, reading a memory map only as far as it is consumed"""
+    for position in range(first, last + 1, chunk_bytes):
+        yield buffer[position:min(position + chunk_bytes, last + 1)].tobytes()
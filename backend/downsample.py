@@ -0,0 +1,107 @@
+import json
+import os
+from typing import Any, Dict
+
+import numpy as np
+
+from dataset_store import is_shot_plane
+from metrics import phase
+from quantum_simulator import QuantumSimulator
+from serialization import dumps
+
+# Column that picks the kept points in each channel; the other columns follow its indices
+Y_COLUMNS = ("measured_prob", "measured_signal")
+
+
+def lttb(x: np.ndarray, y: np.ndarray, num_points: int) -> np.ndarray:
+    """Indices of `num_points` points chosen by Largest-Triangle-Three-Buckets.
+
+    The first and last points are kept; the rest are split into num_points - 2
+    buckets, and each bucket keeps the point forming the largest triangle with the
+    previously kept point and the mean of the next bucket. Peaks and edges survive
+    where plain striding would alias them away.
+    """
+    size = len(y)
+    if num_points >= size or num_points < 3:
+        return np.arange(size)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, size - 1, num_points - 1).astype(np.int64)
+    indices = np.empty(num_points, dtype=np.int64)
+    indices[0], indices[-1] = 0, size - 1
+
+    previous = 0
+    for i in range(num_points - 2):
+        start, stop = edges[i], edges[i + 1]
+        # The last bucket looks ahead to the final point only
+        following = slice(stop, edges[i + 2] if i + 2 < len(edges) else size)
+        mean_x, mean_y = x[following].mean(), y[following].mean()
+        px, py = x[previous], y[previous]
+        area = np.abs((px - mean_x) * (y[start:stop] - py) - (px - x[start:stop]) * (mean_y - py))
+        previous = start + int(np.argmax(area))
+        indices[i + 1] = previous
+    return indices
+
+
+def downsample_columns(columns: Dict[str, np.ndarray], max_points: int) -> Dict[str, np.ndarray]:
+    """LTTB-downsample flat 'channel.field' columns, channel by channel, keeping rows aligned"""
+    channels: Dict[str, Dict[str, np.ndarray]] = {}
+    for name, values in columns.items():
+        prefix, _, field = name.rpartition(".")
+        channels.setdefault(prefix, {})[field] = values
+
+    out = {}
+    for prefix, fields in channels.items():
+        length = len(next(iter(fields.values())))
+        y_name = next((name for name in Y_COLUMNS if name in fields), None)
+        if "time" in fields and y_name is not None:
+            indices = lttb(fields["time"], fields[y_name], max_points)
+        else:
+            # Nothing to rank points by: keep an even spread
+            indices = np.unique(np.linspace(0, length - 1, min(max_points, length)).astype(np.int64))
+        for field, values in fields.items():
+            out[f"{prefix}.{field}" if prefix else field] = np.asarray(values[indices])
+    return out
+
+
+def encode_downsampled(directory: str, key: str, max_points: int, format: str) -> bytes:
+    """JSON envelope of a stored dataset with its measurements reduced to about `max_points` per channel.
+
+    Parameters and statistics are those of the full-resolution data; the
+    `resolution` block points at the stored dataset for zooming in.
+    """
+    with phase("generation"):
+        with open(os.path.join(directory, key, "meta.json")) as f:
+            meta = json.load(f)
+        total = next(iter(meta["columns"].values()))["shape"][0]
+        columns = {
+            name: np.load(os.path.join(directory, key, f"{name}.npy"), mmap_mode="r")
+            for name in meta["columns"] if not is_shot_plane(name)
+        }
+        reduced = downsample_columns(columns, max_points)
+
+    with phase("serialization"):
+        channels: Dict[str, Dict[str, np.ndarray]] = {}
+        for name, values in reduced.items():
+            prefix, _, field = name.rpartition(".")
+            channels.setdefault(prefix, {})[field] = values
+        if "" in channels:
+            measurements: Any = QuantumSimulator._format_columns(channels[""], format)
+        else:
+            measurements = {prefix: QuantumSimulator._format_columns(fields, format)
+                            for prefix, fields in channels.items()}
+        data = {
+            "experiment_type": meta["experiment_type"],
+            "parameters": meta["parameters"],
+            "measurements": measurements,
+            "statistics": meta["statistics"],
+            "metadata": meta["metadata"],
+            "resolution": {
+                "method": "lttb",
+                "points": len(next(iter(reduced.values()))),
+                "total_points": total,
+                "dataset": key,
+                "slice_url": f"/datasets/{key}/slice",
+            },
+        }
+        return dumps({"status": "success", "data": data})
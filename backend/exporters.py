@@ -0,0 +1,137 @@
+import io
+import json
+from typing import Any, Callable, Dict, Tuple
+
+import numpy as np
+
+from metrics import phase
+from serialization import dumps
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Arrow IPC and Parquet export are optional
+    pa = pq = None
+
+# Export format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "npz": ("application/octet-stream", "npz"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrow"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+METADATA_KEY = "quantumpulse"
+
+
+class ExportUnavailable(Exception):
+    """Raised when the library for an export format is not installed"""
+
+
+def flatten_columns(measurements: Dict[str, Any], prefix: str = "") -> Dict[str, np.ndarray]:
+    """Flatten nested channel dicts (e.g. decay's t1_decay/t2_coherence) into 'channel.field' columns"""
+    columns = {}
+    for key, value in measurements.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            columns.update(flatten_columns(value, prefix=f"{name}."))
+        else:
+            columns[name] = np.asarray(value)
+    return columns
+
+
+def split_shots(shots: Dict[str, Any], prefix: str = "") -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """Separate the packed per-shot arrays of a `shots` block from its description.
+
+    Arrays are returned under the same 'channel.field' names as flatten_columns.
+    """
+    planes, description = {}, {}
+    for key, value in shots.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            nested, description[key] = split_shots(value, prefix=f"{name}.")
+            planes.update(nested)
+        elif isinstance(value, np.ndarray):
+            planes[name] = value
+        else:
+            description[key] = value
+    return planes, description
+
+
+def _to_npz(columns: Dict[str, np.ndarray], metadata: Dict[str, Any]) -> bytes:
+    buffer = io.BytesIO()
+    # Metadata travels as a JSON string in a 0-d unicode array, so no pickling is needed to read it
+    np.savez(buffer, **columns, __metadata__=np.array(json.dumps(metadata)))
+    return buffer.getvalue()
+
+
+def _to_arrow_array(values: np.ndarray):
+    if values.ndim == 2 and values.dtype == np.uint8:
+        # Packed shot rows become fixed-size binary values, one per point, without copying bits
+        return pa.FixedSizeBinaryArray.from_buffers(
+            pa.binary(values.shape[1]), len(values), [None, pa.py_buffer(np.ascontiguousarray(values))]
+        )
+    if values.ndim == 2:
+        # Per-point vectors (e.g. an ensemble's realizations) become fixed-size lists
+        return pa.FixedSizeListArray.from_arrays(pa.array(np.ascontiguousarray(values).ravel()), values.shape[1])
+    return pa.array(values)
+
+
+def _to_table(columns: Dict[str, np.ndarray], metadata: Dict[str, Any]):
+    if pa is None:
+        raise ExportUnavailable("Arrow and Parquet export need the 'pyarrow' package")
+    table = pa.table({name: _to_arrow_array(values) for name, values in columns.items()})
+    return table.replace_schema_metadata({METADATA_KEY: json.dumps(metadata)})
+
+
+def _to_arrow(columns: Dict[str, np.ndarray], metadata: Dict[str, Any]) -> bytes:
+    table = _to_table(columns, metadata)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _to_parquet(columns: Dict[str, np.ndarray], metadata: Dict[str, Any]) -> bytes:
+    table = _to_table(columns, metadata)
+    sink = pa.BufferOutputStream()
+    pq.write_table(table, sink)
+    return sink.getvalue().to_pybytes()
+
+
+ENCODERS = {
+    "npz": _to_npz,
+    "arrow": _to_arrow,
+    "parquet": _to_parquet,
+}
+
+
+def encode_json(generate: Callable[..., Dict[str, Any]], *args, **kwargs) -> bytes:
+    """Run a generator and encode the API's JSON envelope"""
+    with phase("generation"):
+        data = generate(*args, **kwargs)
+    with phase("serialization"):
+        return dumps({"status": "success", "data": data})
+
+
+def encode_binary(kind: str, generate: Callable[..., Dict[str, Any]], *args, **kwargs) -> bytes:
+    """Run a generator on its raw arrays and encode them as npz, Arrow IPC stream or Parquet.
+
+    Everything except the measurements (experiment type, parameters, statistics,
+    metadata) is embedded as file-level JSON metadata. Packed per-shot arrays are
+    stored next to the channel columns they belong to.
+    """
+    with phase("generation"):
+        data = generate(*args, format="arrays", **kwargs)
+    with phase("serialization"):
+        columns = flatten_columns(data.pop("measurements"))
+        if "shots" in data:
+            planes, data["shots"] = split_shots(data["shots"])
+            columns.update(planes)
+        return ENCODERS[kind](columns, data)
+
+
+def packed_shots(generate: Callable[..., Dict[str, Any]], *args, **kwargs) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+    """Run a generator in per-shot mode and return its packed shot arrays and their description"""
+    with phase("generation"):
+        data = generate(*args, format="arrays", per_shot=True, **kwargs)
+    return split_shots(data["shots"])
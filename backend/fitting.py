@@ -0,0 +1,199 @@
+from typing import Callable, Dict, Sequence, Tuple
+
+import numpy as np
+
+# Longer traces are fitted on an evenly strided subset of this many points at most
+MAX_FIT_POINTS = 20000
+
+# model(x, params) -> (values, jacobian) with params (N, P), values (N, T), jacobian (N, T, P)
+Model = Callable[[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]]
+
+
+def fit_stride(num_points: int) -> int:
+    """Stride that brings a trace of `num_points` down to at most MAX_FIT_POINTS"""
+    return max(1, -(-num_points // MAX_FIT_POINTS))
+
+
+def exponential(x: np.ndarray, params: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """y = A exp(-x / tau) + C"""
+    a, tau, c = (params[:, i, None] for i in range(3))
+    decay = np.exp(-x / tau)
+    jacobian = np.stack([decay, a * decay * x / tau ** 2, np.ones_like(decay)], axis=-1)
+    return a * decay + c, jacobian
+
+
+def damped_cosine(x: np.ndarray, params: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """y = A exp(-x / tau) cos(2 pi f x + phi) + C"""
+    a, tau, f, phi, c = (params[:, i, None] for i in range(5))
+    decay = np.exp(-x / tau)
+    phase = 2 * np.pi * f * x + phi
+    cos, sin = np.cos(phase), np.sin(phase)
+    jacobian = np.stack([
+        decay * cos,
+        a * decay * cos * x / tau ** 2,
+        -a * decay * sin * 2 * np.pi * x,
+        -a * decay * sin,
+        np.ones_like(decay),
+    ], axis=-1)
+    return a * decay * cos + c, jacobian
+
+
+def rabi(x: np.ndarray, params: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """y = A exp(-x / tau) sin^2(omega x / 2)"""
+    a, omega, tau = (params[:, i, None] for i in range(3))
+    decay = np.exp(-x / tau)
+    sin2 = np.sin(omega * x / 2) ** 2
+    jacobian = np.stack([
+        decay * sin2,
+        a * decay * np.sin(omega * x) * x / 2,
+        a * decay * sin2 * x / tau ** 2,
+    ], axis=-1)
+    return a * decay * sin2, jacobian
+
+
+def levenberg_marquardt(model: Model, x: np.ndarray, y: np.ndarray, p0: np.ndarray,
+                        max_iterations: int = 100, tolerance: float = 1e-10) -> Dict[str, np.ndarray]:
+    """Fit `model` to every row of `y` at once by Levenberg-Marquardt.
+
+    Each trace keeps its own damping factor and accept/reject decision; the loop
+    stops when every trace has converged. Returns the parameters, their standard
+    errors from the covariance s^2 (J^T J)^-1, the residual cost and a converged flag,
+    all with one entry per trace.
+    """
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    params = np.array(p0, dtype=float, ndmin=2)
+    traces, num_params = params.shape
+    damping = np.full(traces, 1e-3)
+    converged = np.zeros(traces, dtype=bool)
+
+    with np.errstate(all='ignore'):
+        values, jacobian = model(x, params)
+        residual = y - values
+        cost = np.sum(residual ** 2, axis=1)
+
+        for _ in range(max_iterations):
+            active = ~converged
+            if not active.any():
+                break
+            j, r = jacobian[active], residual[active]
+            # Batched matmul runs on BLAS; the equivalent einsum is several times slower for many traces
+            jt = np.swapaxes(j, 1, 2)
+            jtj = jt @ j
+            gradient = (jt @ r[..., None])[..., 0]
+            scale = np.diagonal(jtj, axis1=1, axis2=2)
+            system = jtj + (damping[active, None] * np.maximum(scale, 1e-300))[:, :, None] * np.eye(num_params)
+            try:
+                step = np.linalg.solve(system, gradient[..., None])[..., 0]
+            except np.linalg.LinAlgError:
+                step = np.stack([np.linalg.lstsq(m, g, rcond=None)[0] for m, g in zip(system, gradient)])
+
+            trial = params[active] + step
+            trial_values, trial_jacobian = model(x, trial)
+            trial_residual = y[active] - trial_values
+            trial_cost = np.sum(trial_residual ** 2, axis=1)
+
+            better = np.isfinite(trial_cost) & (trial_cost <= cost[active])
+            index = np.flatnonzero(active)
+            accepted = index[better]
+            small_step = np.all(np.abs(step) <= tolerance * (np.abs(params[active]) + tolerance), axis=1)
+            small_gain = cost[active] - np.where(better, trial_cost, cost[active]) <= tolerance * cost[active]
+
+            params[accepted] = trial[better]
+            values[accepted] = trial_values[better]
+            jacobian[accepted] = trial_jacobian[better]
+            residual[accepted] = trial_residual[better]
+            cost[accepted] = trial_cost[better]
+            damping[index] = np.where(better, damping[index] / 10, damping[index] * 10)
+            converged[index] = (better & (small_step | small_gain)) | (damping[index] > 1e12)
+
+        jtj = np.swapaxes(jacobian, 1, 2) @ jacobian
+        dof = max(y.shape[1] - num_params, 1)
+        covariance = np.linalg.pinv(jtj) * (cost / dof)[:, None, None]
+        errors = np.sqrt(np.abs(np.diagonal(covariance, axis1=1, axis2=2)))
+
+    return {'params': params, 'errors': errors, 'cost': cost, 'converged': converged}
+
+
+def _dominant_frequency(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Frequency and phase of the strongest non-DC Fourier component of each (uniformly sampled) row"""
+    spacing = (x[-1] - x[0]) / (x.size - 1)
+    # Zero padding interpolates the spectrum, so short traces with few periods still get a fine estimate
+    length = 8 * x.size
+    spectrum = np.fft.rfft(y - y.mean(axis=1, keepdims=True), n=length, axis=1)
+    peak = 1 + np.argmax(np.abs(spectrum[:, 1:]), axis=1)
+    frequency = peak / (length * spacing)
+    phase = np.angle(spectrum[np.arange(len(y)), peak]) - 2 * np.pi * frequency * x[0]
+    return frequency, phase
+
+
+def _named(result: Dict[str, np.ndarray], names: Sequence[str]) -> Dict[str, Dict[str, np.ndarray]]:
+    return {
+        'params': dict(zip(names, result['params'].T)),
+        'errors': dict(zip(names, result['errors'].T)),
+        'cost': result['cost'],
+        'converged': result['converged'],
+    }
+
+
+def fit_exponential(x: np.ndarray, y: np.ndarray) -> Dict[str, Dict[str, np.ndarray]]:
+    """Fit A exp(-x / tau) + C to each row of `y`; params 'amplitude', 'tau', 'offset'"""
+    x = np.asarray(x, dtype=float)
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    # Offset from the tail, amplitude from the head, and tau from the area under the curve
+    tail = max(1, x.size // 10)
+    offset = y[:, -tail:].mean(axis=1)
+    amplitude = y[:, 0] - offset
+    above = y - offset[:, None]
+    area = np.sum((above[:, 1:] + above[:, :-1]) / 2 * np.diff(x), axis=1)
+    tau = np.clip(area / np.where(amplitude == 0, 1, amplitude), (x[-1] - x[0]) / x.size, 10 * (x[-1] - x[0]))
+    result = levenberg_marquardt(exponential, x, y, np.stack([amplitude, tau, offset], axis=1))
+    return _named(result, ('amplitude', 'tau', 'offset'))
+
+
+def fit_damped_cosine(x: np.ndarray, y: np.ndarray) -> Dict[str, Dict[str, np.ndarray]]:
+    """Fit A exp(-x / tau) cos(2 pi f x + phi) + C; params 'amplitude', 'tau', 'frequency', 'phase', 'offset'"""
+    x = np.asarray(x, dtype=float)
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    offset = y.mean(axis=1)
+    frequency, phase = _dominant_frequency(x, y)
+    amplitude = np.abs(y - offset[:, None]).max(axis=1)
+    tau = np.full(len(y), (x[-1] - x[0]) / 2)
+    result = levenberg_marquardt(damped_cosine, x, y, np.stack([amplitude, tau, frequency, phase, offset], axis=1))
+    return _named(result, ('amplitude', 'tau', 'frequency', 'phase', 'offset'))
+
+
+def _spectral_peaks(x: np.ndarray, y: np.ndarray, count: int) -> np.ndarray:
+    """Frequencies of the `count` strongest local maxima of each row's (zero-padded) spectrum"""
+    spacing = (x[-1] - x[0]) / (x.size - 1)
+    length = 8 * x.size
+    magnitude = np.abs(np.fft.rfft(y - y.mean(axis=1, keepdims=True), n=length, axis=1))
+    inner = magnitude[:, 1:-1]
+    local = (inner > magnitude[:, :-2]) & (inner >= magnitude[:, 2:])
+    peaks = 1 + np.argsort(np.where(local, inner, 0), axis=1)[:, -count:]
+    return peaks / (length * spacing)
+
+
+def fit_rabi(x: np.ndarray, y: np.ndarray) -> Dict[str, Dict[str, np.ndarray]]:
+    """Fit A exp(-x / tau) sin^2(omega x / 2); params 'amplitude', 'omega', 'tau'"""
+    x = np.asarray(x, dtype=float)
+    y = np.atleast_2d(np.asarray(y, dtype=float))
+    span = x[-1] - x[0]
+    
+    # The decaying mean of sin^2 leaks into the low end of the spectrum, so the
+    # strongest peak is not always the Rabi frequency. Score the top spectral peaks
+    # against a few decay times, with the amplitude solved linearly for each pair,
+    # and start from the best one.
+    best = np.full(len(y), np.inf)
+    p0 = np.zeros((len(y), 3))
+    for frequency in _spectral_peaks(x, y, 8).T:
+        for tau in (0.3 * span, span, 3 * span):
+            shape = np.exp(-x / tau) * np.sin(np.pi * frequency[:, None] * x) ** 2
+            norm = np.maximum(np.sum(shape ** 2, axis=1), 1e-300)
+            overlap = np.sum(shape * y, axis=1)
+            cost = -overlap ** 2 / norm
+            better = cost < best
+            best[better] = cost[better]
+            p0[better] = np.stack([overlap / norm, 2 * np.pi * frequency, np.full(len(y), tau)], axis=1)[better]
+    
+    result = levenberg_marquardt(rabi, x, y, p0)
+    return _named(result, ('amplitude', 'omega', 'tau'))
@@ -0,0 +1,217 @@
+"""Generate many simulated datasets from a spec file across all cores.
+
+The spec names an experiment, how many datasets to draw, a root seed, and a value
+or distribution for every parameter:
+
+    {
+      "experiment": "rabi",
+      "count": 10000,
+      "seed": 2024,
+      "shard_size": 500,
+      "format": "parquet",
+      "params": {
+        "omega": {"uniform": [0.5, 3.0]},
+        "noise_rate": {"loguniform": [0.01, 0.2]},
+        "shots": {"choice": [100, 1000, 10000]},
+        "time_max": 10.0,
+        "time_steps": 200
+      }
+    }
+
+Distributions are {"uniform": [low, high]}, {"loguniform": [low, high]},
+{"normal": [mean, std]}, {"integers": [low, high]} (inclusive) and
+{"choice": [values...]}; anything else is used as a constant. Drawn values
+are validated by the API's parameter models, so parameters left out take the
+API defaults and out-of-range draws are rejected the same way.
+
+Dataset i draws its parameters and its simulation seed from child i of
+SeedSequence(seed).spawn(count), so every dataset, and every shard file, is
+bit-identical whatever the number of workers. Shards hold the datasets' points
+back to back with a `dataset` index column; each dataset's parameters, seed and
+statistics are in the shard's JSON metadata and in manifest.json.
+
+    python generate_datasets.py spec.json --output datasets/rabi
+    python generate_datasets.py spec.json --output /tmp/sample --count 100 --workers 2
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List
+
+import numpy as np
+from pydantic import ValidationError
+
+from exporters import EXPORT_FORMATS, ENCODERS, flatten_columns
+from models import PARAM_MODELS
+from quantum_simulator import QuantumSimulator
+from serialization import dumps
+
+EXPERIMENTS = ("rabi", "decay", "bell")
+SHARD_FORMATS = ("npz", "parquet")
+
+simulator = QuantumSimulator()
+
+
+def draw(rng: np.random.Generator, value: Any) -> Any:
+    """One value from a parameter spec: a distribution dict or a constant"""
+    if not isinstance(value, dict):
+        return value
+    (kind, args), = value.items()
+    if kind == "uniform":
+        return float(rng.uniform(*args))
+    if kind == "loguniform":
+        return float(np.exp(rng.uniform(np.log(args[0]), np.log(args[1]))))
+    if kind == "normal":
+        return float(rng.normal(*args))
+    if kind == "integers":
+        return int(rng.integers(args[0], args[1], endpoint=True))
+    if kind == "choice":
+        return args[int(rng.integers(len(args)))]
+    raise ValueError(f"Unknown distribution '{kind}'")
+
+
+def dataset_seeds(seed: int, index: int) -> np.random.SeedSequence:
+    """Child `index` of SeedSequence(seed).spawn(...), built directly so workers never spawn the whole list"""
+    root = np.random.SeedSequence(seed)
+    return np.random.SeedSequence(root.entropy, spawn_key=root.spawn_key + (index,), pool_size=root.pool_size)
+
+
+def generate_dataset(experiment: str, params: Dict[str, Any], seed: int, index: int) -> Dict[str, Any]:
+    params_seq, simulation_seq = dataset_seeds(seed, index).spawn(2)
+    # Sorted names keep the draw order independent of how the spec was written
+    rng = np.random.default_rng(params_seq)
+    drawn = {name: draw(rng, params[name]) for name in sorted(params)}
+    simulation_seed = int(simulation_seq.generate_state(1, np.uint64)[0])
+    generate = getattr(simulator, f"generate_{experiment}_data")
+    return generate(**validate(experiment, drawn), seed=simulation_seed, format="arrays")
+
+
+def validate(experiment: str, drawn: Dict[str, Any]) -> Dict[str, Any]:
+    """Drawn parameters checked and completed by the API's model for the experiment"""
+    model = PARAM_MODELS[experiment]
+    unknown = sorted(set(drawn) - set(model.model_fields))
+    if unknown:
+        raise ValueError(f"unknown {experiment} parameters: {', '.join(unknown)}")
+    try:
+        values = model(**drawn)
+    except ValidationError as e:
+        errors = "; ".join(f"{'.'.join(map(str, error['loc']))}: {error['msg']}" for error in e.errors())
+        raise ValueError(f"invalid {experiment} parameters: {errors}")
+    return values.model_dump(exclude={"seed", "per_shot"})
+
+
+def write_shard(spec: Dict[str, Any], shard: int, start: int, stop: int, output: str) -> Dict[str, Any]:
+    """Generate datasets [start, stop) into one shard file; runs in a worker process"""
+    chunks: Dict[str, List[np.ndarray]] = {}
+    datasets = []
+    offset = 0
+    for index in range(start, stop):
+        data = generate_dataset(spec["experiment"], spec["params"], spec["seed"], index)
+        columns = flatten_columns(data["measurements"])
+        length = len(next(iter(columns.values())))
+        columns = dict(dataset=np.full(length, index, dtype=np.int64), **columns)
+        for name, values in columns.items():
+            chunks.setdefault(name, []).append(values)
+        datasets.append({
+            "index": index,
+            "offset": offset,
+            "length": length,
+            "parameters": data["parameters"],
+            "statistics": data["statistics"],
+        })
+        offset += length
+
+    columns = {name: np.concatenate(parts) for name, parts in chunks.items()}
+    metadata = json.loads(dumps({
+        "experiment_type": data["experiment_type"],
+        "shard": shard,
+        "datasets": datasets,
+    }))
+    body = ENCODERS[spec["format"]](columns, metadata)
+    name = f"shard-{shard:05d}.{EXPORT_FORMATS[spec['format']][1]}"
+    with open(os.path.join(output, name), "wb") as f:
+        f.write(body)
+    return {
+        "file": name,
+        "datasets": [start, stop],
+        "points": offset,
+        "bytes": len(body),
+        "sha256": hashlib.sha256(body).hexdigest(),
+        "records": metadata["datasets"],
+    }
+
+
+def load_spec(path: str, overrides: Dict[str, Any]) -> Dict[str, Any]:
+    with open(path) as f:
+        spec = json.load(f)
+    spec.update({key: value for key, value in overrides.items() if value is not None})
+    spec.setdefault("seed", 0)
+    spec.setdefault("shard_size", 1000)
+    spec.setdefault("format", "npz")
+    spec.setdefault("params", {})
+
+    if spec.get("experiment") not in EXPERIMENTS:
+        raise ValueError(f"experiment must be one of {', '.join(EXPERIMENTS)}")
+    if spec["format"] not in SHARD_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(SHARD_FORMATS)}")
+    if not isinstance(spec.get("count"), int) or spec["count"] < 1:
+        raise ValueError("count must be a positive integer")
+    for name in ("seed", "format", "per_shot"):
+        if name in spec["params"]:
+            raise ValueError(f"'{name}' cannot be set per dataset")
+    # Fail before starting any workers if a parameter is unknown or a distribution malformed
+    generate_dataset(spec["experiment"], spec["params"], spec["seed"], 0)
+    return spec
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("spec", help="JSON spec file")
+    parser.add_argument("--output", required=True, help="directory for the shards and manifest.json")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: all cores); output does not depend on it")
+    parser.add_argument("--count", type=int, help="override the spec's dataset count")
+    parser.add_argument("--seed", type=int, help="override the spec's root seed")
+    parser.add_argument("--shard-size", dest="shard_size", type=int, help="override datasets per shard")
+    parser.add_argument("--format", choices=SHARD_FORMATS, help="override the shard format")
+    args = parser.parse_args(argv)
+
+    try:
+        spec = load_spec(args.spec, {"count": args.count, "seed": args.seed,
+                                     "shard_size": args.shard_size, "format": args.format})
+    except (OSError, ValueError, TypeError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+
+    os.makedirs(args.output, exist_ok=True)
+    count, size = spec["count"], spec["shard_size"]
+    bounds = [(shard, start, min(start + size, count)) for shard, start in enumerate(range(0, count, size))]
+
+    shards = [None] * len(bounds)
+    with ProcessPoolExecutor(max_workers=min(args.workers, len(bounds))) as executor:
+        futures = {executor.submit(write_shard, spec, shard, start, stop, args.output): shard
+                   for shard, start, stop in bounds}
+        for done, future in enumerate(as_completed(futures), 1):
+            shards[futures[future]] = future.result()
+            print(f"[{done}/{len(bounds)}] {shards[futures[future]]['file']}", file=sys.stderr, flush=True)
+
+    # No timestamps or worker counts, so the manifest is as reproducible as the shards
+    manifest = {
+        "spec": spec,
+        "count": count,
+        "points": sum(shard["points"] for shard in shards),
+        "shards": [{key: value for key, value in shard.items() if key != "records"} for shard in shards],
+        "datasets": [record for shard in shards for record in shard["records"]],
+        "environment": {"numpy": np.__version__},
+    }
+    with open(os.path.join(args.output, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"{count} datasets in {len(shards)} shards written to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
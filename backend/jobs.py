@@ -0,0 +1,247 @@
+import json
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from exporters import EXPORT_FORMATS, encode_binary, encode_json
+
+# Lifecycle of a job; the last three are final
+QUEUED, RUNNING, SUCCEEDED, FAILED, CANCELLED = "queued", "running", "succeeded", "failed", "cancelled"
+FINAL = (SUCCEEDED, FAILED, CANCELLED)
+
+# Stages a running job moves through; progress is the share of them completed
+STAGES = ("generation", "serialization", "writing")
+
+
+class JobNotFound(Exception):
+    """Raised for an unknown job id"""
+
+
+class JobStore:
+    """Job records and results on the local filesystem, one directory per job.
+
+    Records are rewritten atomically (write to a temporary file, then rename), and
+    results only appear once complete, so a crash never leaves a half-written file
+    that looks finished.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = os.path.abspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, job_id: str, name: str = "") -> str:
+        # Ids are generated by uuid4().hex; anything else cannot name a job directory
+        if not (len(job_id) == 32 and all(c in "0123456789abcdef" for c in job_id)):
+            raise JobNotFound(job_id)
+        return os.path.join(self.directory, job_id, name)
+
+    def _write(self, path: str, data: bytes):
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(data)
+        os.replace(temporary, path)
+
+    def create(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        job_id = uuid.uuid4().hex
+        os.makedirs(self.path(job_id))
+        return self.save({
+            "id": job_id,
+            "status": QUEUED,
+            "stage": None,
+            "progress": 0.0,
+            "spec": spec,
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "attempts": 0,
+            "error": None,
+            "result": None,
+        })
+
+    def save(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        self._write(self.path(job["id"], "job.json"), json.dumps(job).encode())
+        return job
+
+    def load(self, job_id: str) -> Dict[str, Any]:
+        try:
+            with open(self.path(job_id, "job.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise JobNotFound(job_id)
+
+    def update(self, job_id: str, **fields) -> Dict[str, Any]:
+        job = self.load(job_id)
+        job.update(fields)
+        return self.save(job)
+
+    def write_result(self, job_id: str, name: str, body: bytes):
+        self._write(self.path(job_id, name), body)
+
+    def delete(self, job_id: str):
+        shutil.rmtree(self.path(job_id), ignore_errors=True)
+
+    def ids(self) -> List[str]:
+        return [name for name in os.listdir(self.directory)
+                if os.path.isfile(os.path.join(self.directory, name, "job.json"))]
+
+
+def run_job(directory: str, job_id: str):
+    """Execute one job in a worker process and record its outcome in the store"""
+    store = JobStore(directory)
+    job = store.load(job_id)
+    spec = job["spec"]
+
+    def stage(name: str, **fields):
+        store.update(job_id, stage=name, progress=STAGES.index(name) / len(STAGES), **fields)
+
+    stage("generation", status=RUNNING, started_at=time.time(), pid=os.getpid())
+    try:
+        from quantum_simulator import QuantumSimulator
+        simulator = QuantumSimulator()
+
+        def generate(*args, **kwargs):
+            data = method(*args, **kwargs)
+            stage("serialization")
+            return data
+
+        task, experiment, params = spec["task"], spec["experiment"], spec["params"]
+        if task == "export":
+            method = getattr(simulator, f"generate_{experiment}_data")
+            media_type, extension = EXPORT_FORMATS[spec["format"]]
+            body = encode_binary(spec["format"], generate, **params)
+        elif task == "sweep":
+            method = simulator.generate_sweep_data
+            grid = {name: np.linspace(r["start"], r["stop"], r["num"]) for name, r in spec["sweep"].items()}
+            media_type, extension = "application/json", "json"
+            body = encode_json(generate, experiment, grid, **params)
+        else:
+            method = getattr(simulator, f"generate_{experiment}_data")
+            media_type, extension = "application/json", "json"
+            body = encode_json(generate, format=spec["format"], **params)
+
+        stage("writing")
+        name = f"result.{extension}"
+        store.write_result(job_id, name, body)
+    except Exception as e:
+        store.update(job_id, status=FAILED, error=f"{type(e).__name__}: {e}", finished_at=time.time())
+        return
+    store.update(job_id, status=SUCCEEDED, stage=None, progress=1.0, finished_at=time.time(),
+                 result={"file": name, "media_type": media_type, "bytes": len(body)})
+
+
+class JobManager:
+    """Runs queued jobs on a fixed number of local worker processes.
+
+    Each job runs this module as a fresh Python process, so a running job can be
+    cancelled by terminating it and a crash only fails that job; the process starts
+    clean rather than inheriting the server's threads, locks and imports. Jobs
+    still queued or running when the server stopped are picked up again from the
+    store on start().
+    """
+
+    def __init__(self, store: JobStore, workers: int = 1):
+        self.store = store
+        self.workers = workers
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._running: Dict[str, subprocess.Popen] = {}
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+
+    def start(self):
+        pending = []
+        for job_id in self.store.ids():
+            job = self.store.load(job_id)
+            if job["status"] not in FINAL:
+                # Interrupted by a restart; run it again from scratch
+                pending.append(self.store.update(job_id, status=QUEUED, stage=None, progress=0.0))
+        for job in sorted(pending, key=lambda job: job["submitted_at"]):
+            self._queue.put(job["id"])
+        for _ in range(self.workers):
+            thread = threading.Thread(target=self._dispatch, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+        job = self.store.create(spec)
+        self._queue.put(job["id"])
+        return job
+
+    def get(self, job_id: str) -> Dict[str, Any]:
+        return self.store.load(job_id)
+
+    def list(self) -> List[Dict[str, Any]]:
+        jobs = [self.store.load(job_id) for job_id in self.store.ids()]
+        return sorted(jobs, key=lambda job: job["submitted_at"])
+
+    def cancel(self, job_id: str) -> Dict[str, Any]:
+        """Cancel a queued or running job; finished jobs are returned unchanged"""
+        with self._lock:
+            job = self.store.load(job_id)
+            if job["status"] in FINAL:
+                return job
+            process = self._running.get(job_id)
+            if process is not None:
+                process.terminate()
+                process.wait()
+            # A queued id stays in the queue; the dispatcher skips it once it is cancelled
+            return self.store.update(job_id, status=CANCELLED, finished_at=time.time())
+
+    def delete(self, job_id: str):
+        self.cancel(job_id)
+        self.store.delete(job_id)
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {"queued": self._queue.qsize(), "running": len(self._running)}
+
+    def shutdown(self):
+        """Stop dispatching and terminate running jobs; they stay running in the store and resume on restart"""
+        self._stopping = True
+        for _ in self._threads:
+            self._queue.put(None)
+        with self._lock:
+            for process in self._running.values():
+                process.terminate()
+
+    def _dispatch(self):
+        while True:
+            job_id = self._queue.get()
+            if job_id is None or self._stopping:
+                return
+            with self._lock:
+                try:
+                    job = self.store.load(job_id)
+                except JobNotFound:
+                    continue
+                if job["status"] != QUEUED:
+                    continue
+                self.store.update(job_id, attempts=job["attempts"] + 1)
+                process = subprocess.Popen([sys.executable, os.path.abspath(__file__), self.store.directory, job_id],
+                                           cwd=os.path.dirname(os.path.abspath(__file__)))
+                self._running[job_id] = process
+
+            process.wait()
+            with self._lock:
+                self._running.pop(job_id, None)
+                if self._stopping:
+                    continue
+                try:
+                    job = self.store.load(job_id)
+                except JobNotFound:
+                    continue
+                if job["status"] not in FINAL:
+                    self.store.update(job_id, status=FAILED, finished_at=time.time(),
+                                      error=f"Worker exited with code {process.returncode}")
+
+
+if __name__ == "__main__":
+    run_job(sys.argv[1], sys.argv[2])
@@ -95,15 +95,37 @@
 #     import uvicorn
 #     uvicorn.run(app, host="0.0.0.0", port=8000)
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import FileResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Optional
+from starlette.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field, ValidationError
+from typing import Any, Dict, List, Literal, Optional
 import numpy as np
 from quantum_simulator import QuantumSimulator
+from config import settings
+from worker_pool import GenerationPool, PoolOverloaded
+from result_cache import ResultCache
+from exporters import EXPORT_FORMATS, ExportUnavailable, encode_binary, encode_json, packed_shots
+from serialization import NumpyJSONResponse, dumps
+from compression import CompressionMiddleware
+from dataset_store import DatasetNotFound, DatasetStore, build_dataset, byte_range, is_shot_plane, iter_bytes
+from jobs import JobManager, JobNotFound, JobStore
+from metrics import CONTENT_TYPE, Gauge, MetricsMiddleware, add_phases, mark, phase, registry, run_timed
+from downsample import downsample_columns, encode_downsampled
+from noise import parse_model
+from models import PARAM_MODELS, BellParams, DecayParams, RabiParams
+import asyncio
+import base64
 import json
+import math
+import secrets
 
-app = FastAPI(title="Quantum Data Generator API", version="1.0.0")
+app = FastAPI(
+    title="Quantum Data Generator API",
+    version="1.0.0",
+    default_response_class=NumpyJSONResponse
+)
 
 # Add CORS middleware
 app.add_middleware(
@@ -114,78 +136,724 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-class RabiParams(BaseModel):
-    omega: float = 1.0  # Drive frequency
-    time_max: float = 10.0
-    time_steps: int = 100
-    noise_rate: float = 0.1
-    shots: int = 1000
-    seed: Optional[int] = None
-
-class DecayParams(BaseModel):
-    t1: float = 5.0  # T1 decay time
-    t2: float = 3.0  # T2 decay time
-    time_max: float = 15.0
-    time_steps: int = 100
-    noise_rate: float = 0.05
-    shots: int = 1000
-    seed: Optional[int] = None
-
-class BellParams(BaseModel):
-    noise_rate: float = 0.1
-    shots: int = 10000
-    theta: float = 0.0  # Bell state parameter
-    seed: Optional[int] = None
+# Negotiated gzip/zstd compression for large payloads
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_min_size,
+    gzip_level=settings.gzip_level,
+    zstd_level=settings.zstd_level,
+)
+
+# Per-route metrics and Server-Timing; added last so it wraps compression and sees wire sizes
+if settings.metrics:
+    app.add_middleware(MetricsMiddleware, server_timing=settings.server_timing)
+
+class SweepRange(BaseModel):
+    start: float
+    stop: float
+    num: int = Field(50, ge=1, le=1000)
+
+class SweepRequest(BaseModel):
+    params: Dict[str, Any] = {}  # Fixed experiment parameters, validated per experiment
+    sweep: Dict[str, SweepRange]  # One or two parameters to scan
+
+Experiment = Literal["rabi", "decay", "bell"]
+
+# Layout of the `measurements` field: list of per-point dicts or one array per field
+MeasurementFormat = Literal["records", "columnar"]
 
 simulator = QuantumSimulator()
 
+# Generation runs in worker threads/processes so large requests never block the event loop
+pool = GenerationPool(settings.worker_pool, settings.workers, settings.queue_depth)
+
+# Seeded requests are deterministic, so their serialized responses can be reused
+cache = ResultCache(settings.cache_max_bytes)
+
+# Long-running jobs execute in separate processes and keep their records and results on disk
+jobs = JobManager(JobStore(settings.job_dir), settings.job_workers)
+
+# Generated arrays kept on disk as memory-mapped .npy files, keyed by a parameter hash
+datasets = DatasetStore(settings.dataset_dir, settings.dataset_max_bytes)
+
+pool_pending = registry.register(Gauge(
+    "quantumpulse_pool_pending", "Generation calls running or queued in the worker pool"))
+cache_gauge = registry.register(Gauge(
+    "quantumpulse_cache", "Result cache counters and sizes", ("stat",)))
+
+dataset_gauge = registry.register(Gauge(
+    "quantumpulse_datasets", "Dataset store counters and sizes", ("stat",)))
+
+jobs_gauge = registry.register(Gauge(
+    "quantumpulse_jobs", "Background jobs waiting for or holding a job worker", ("state",)))
+
+def collect_state():
+    """Copy pool, cache, dataset and job state into gauges; runs only when /metrics is scraped"""
+    pool_pending.set(pool.pending)
+    for stat, value in cache.stats().items():
+        cache_gauge.set(value, stat)
+    for stat, value in datasets.stats().items():
+        dataset_gauge.set(value, stat)
+    for state, value in jobs.counts().items():
+        jobs_gauge.set(value, state)
+
+registry.collectors.append(collect_state)
+
+def parse_params(experiment: str, params: Dict[str, Any]) -> BaseModel:
+    """Validate raw experiment parameters against that experiment's model"""
+    try:
+        model = PARAM_MODELS[experiment](**params)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+    check_options(model)
+    return model
+
+def check_options(params: BaseModel):
+    """Reject noise models and ensemble requests the simulator cannot serve"""
+    try:
+        parse_model(params.noise_model)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if getattr(params, "draw_order", "vectorized") == "interleaved":
+        if params.per_shot or params.ensemble_size > 1 or params.noise_model:
+            raise HTTPException(
+                status_code=400,
+                detail="draw_order 'interleaved' does not support per_shot, ensembles or noise_model"
+            )
+    if params.ensemble_size == 1:
+        return
+    if params.per_shot:
+        raise HTTPException(status_code=400, detail="per_shot is not supported for ensembles")
+    points = params.ensemble_size * getattr(params, "time_steps", len(QuantumSimulator.BELL_BASES))
+    if points > settings.ensemble_max_points:
+        raise HTTPException(
+            status_code=413,
+            detail=f"ensemble_size x points is {points}; the limit is {settings.ensemble_max_points}"
+        )
+
+# Per-request options that sweeps do not take
+SWEEP_EXCLUDED = {"per_shot", "engine", "ensemble_size", "ensemble_raw", "ensemble_fit", "draw_order"}
+
+def check_sweep(experiment: str, params: BaseModel, sweep: Dict[str, SweepRange]):
+    if params.per_shot:
+        raise HTTPException(status_code=400, detail="per_shot is not supported for sweeps")
+    if params.ensemble_size > 1:
+        raise HTTPException(status_code=400, detail="ensemble_size is not supported for sweeps")
+    if params.engine != "analytic":
+        raise HTTPException(status_code=400, detail="Sweeps only support the analytic engine")
+    if getattr(params, "draw_order", "vectorized") != "vectorized":
+        raise HTTPException(status_code=400, detail="Sweeps only support draw_order 'vectorized'")
+    
+    allowed = simulator.SWEEP_PARAMETERS[experiment]
+    if not 1 <= len(sweep) <= 2 or any(name not in allowed for name in sweep):
+        raise HTTPException(
+            status_code=400,
+            detail=f"{experiment} sweeps take one or two of: {', '.join(allowed)}"
+        )
+    # Swept values are linear in each range, so the endpoints meet the model's bounds if every point does
+    for name, r in sweep.items():
+        for value in (r.start, r.stop):
+            parse_params(experiment, {**params.model_dump(), name: value})
+    points = math.prod(r.num for r in sweep.values()) * getattr(params, "time_steps", len(QuantumSimulator.BELL_BASES))
+    if points > settings.sweep_max_points:
+        raise HTTPException(
+            status_code=422,
+            detail=f"sweep grid x points is {points}; the limit is {settings.sweep_max_points}"
+        )
+
+def overloaded(e: PoolOverloaded) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+async def generate_response(key: Optional[str], encode, *args, media_type: str = "application/json",
+                            headers: Optional[Dict[str, str]] = None, **kwargs) -> Response:
+    """Run generation and encoding in the pool and return the bytes, going through the cache when keyed"""
+    mark("validation")
+    headers = dict(headers or {})
+    if key is not None:
+        body = cache.get(key)
+        if body is not None:
+            headers["X-Cache"] = "HIT"
+            return Response(body, media_type=media_type, headers=headers)
+    
+    try:
+        body, phases = await pool.run(run_timed, encode, *args, **kwargs)
+    except PoolOverloaded as e:
+        raise overloaded(e)
+    except ExportUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    add_phases(phases)
+    
+    if key is not None:
+        cache.put(key, body)
+        headers["X-Cache"] = "MISS"
+    return Response(body, media_type=media_type, headers=headers)
+
+def cache_key(experiment: str, params: BaseModel, **options) -> Optional[str]:
+    """Cache key for seeded requests; unseeded requests bypass the cache"""
+    if params.seed is None or settings.cache_max_bytes <= 0:
+        return None
+    return ResultCache.make_key(experiment, params.model_dump(), **options)
+
+@app.on_event("startup")
+async def start_jobs():
+    jobs.start()
+
+@app.on_event("shutdown")
+async def shutdown_pool():
+    pool.shutdown()
+    jobs.shutdown()
+
 @app.get("/")
 async def root():
     return {"message": "Quantum Data Generator API", "version": "1.0.0"}
 
+@app.get("/cache/stats")
+async def cache_stats():
+    return cache.stats()
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus text exposition of request, pool and cache metrics"""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
 @app.post("/generate/rabi")
-async def generate_rabi(params: RabiParams):
+async def generate_rabi(params: RabiParams, format: MeasurementFormat = "records",
+                        max_points: Optional[int] = Query(None, ge=3)):
+    check_options(params)
+    if max_points is not None and params.time_steps > max_points:
+        return await downsampled_response("rabi", params, format, max_points)
+    return await generate_response(
+        cache_key("rabi", params, format=format),
+        encode_json,
+        simulator.generate_rabi_data,
+        omega=params.omega,
+        time_max=params.time_max,
+        time_steps=params.time_steps,
+        noise_rate=params.noise_rate,
+        shots=params.shots,
+        seed=params.seed,
+        draw_order=params.draw_order,
+        format=format,
+        per_shot=params.per_shot,
+        engine=params.engine,
+        t1=params.t1,
+        t2=params.t2,
+        ensemble_size=params.ensemble_size,
+        ensemble_raw=params.ensemble_raw,
+        noise_model=params.noise_model,
+        ensemble_fit=params.ensemble_fit
+    )
+
+@app.post("/generate/decay")
+async def generate_decay(params: DecayParams, format: MeasurementFormat = "records",
+                         max_points: Optional[int] = Query(None, ge=3)):
+    check_options(params)
+    if max_points is not None and params.time_steps > max_points:
+        return await downsampled_response("decay", params, format, max_points)
+    return await generate_response(
+        cache_key("decay", params, format=format),
+        encode_json,
+        simulator.generate_decay_data,
+        t1=params.t1,
+        t2=params.t2,
+        time_max=params.time_max,
+        time_steps=params.time_steps,
+        noise_rate=params.noise_rate,
+        shots=params.shots,
+        seed=params.seed,
+        draw_order=params.draw_order,
+        format=format,
+        per_shot=params.per_shot,
+        engine=params.engine,
+        ensemble_size=params.ensemble_size,
+        ensemble_raw=params.ensemble_raw,
+        noise_model=params.noise_model,
+        ensemble_fit=params.ensemble_fit
+    )
+
+@app.post("/generate/bell")
+async def generate_bell(params: BellParams, format: MeasurementFormat = "records"):
+    check_options(params)
+    return await generate_response(
+        cache_key("bell", params, format=format),
+        encode_json,
+        simulator.generate_bell_data,
+        noise_rate=params.noise_rate,
+        shots=params.shots,
+        theta=params.theta,
+        seed=params.seed,
+        format=format,
+        per_shot=params.per_shot,
+        engine=params.engine,
+        ensemble_size=params.ensemble_size,
+        ensemble_raw=params.ensemble_raw,
+        noise_model=params.noise_model
+    )
+
+@app.post("/generate/{experiment}/sweep")
+async def generate_sweep(experiment: Experiment, request: SweepRequest):
+    params = parse_params(experiment, request.params)
+    check_sweep(experiment, params, request.sweep)
+    
+    return await generate_response(
+        cache_key(f"{experiment}/sweep", params, sweep=request.model_dump()["sweep"]),
+        encode_json,
+        simulator.generate_sweep_data,
+        experiment,
+        {
+            name: np.linspace(r.start, r.stop, r.num)
+            for name, r in request.sweep.items()
+        },
+        **params.model_dump(exclude=SWEEP_EXCLUDED, exclude_none=True)
+    )
+
+ExportFormat = Literal["npz", "arrow", "parquet"]
+
+GENERATORS = {
+    "rabi": simulator.generate_rabi_data,
+    "decay": simulator.generate_decay_data,
+    "bell": simulator.generate_bell_data,
+}
+
+@app.post("/export/{experiment}")
+async def export_data(experiment: Experiment, params: Dict[str, Any] = {},
+                      format: ExportFormat = "npz"):
+    params = parse_params(experiment, params)
+    
+    media_type, extension = EXPORT_FORMATS[format]
+    return await generate_response(
+        cache_key(f"export/{experiment}", params, format=format),
+        encode_binary,
+        format,
+        GENERATORS[experiment],
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{experiment}_data.{extension}"'},
+        **params.model_dump()
+    )
+
+def packed_chunks(planes: Dict[str, np.ndarray], chunk_bytes: int = 1 << 20):
+    """Yield the raw bytes of each packed plane in turn, in chunks of about `chunk_bytes`"""
+    for packed in planes.values():
+        flat = packed.reshape(-1)
+        for start in range(0, flat.size, chunk_bytes):
+            yield flat[start:start + chunk_bytes].tobytes()
+
+@app.post("/export/{experiment}/shots")
+async def export_shots(experiment: Experiment, params: Dict[str, Any] = {}):
+    """Raw bit-packed shot outcomes: each plane is (points x ceil(shots / 8)) bytes, planes back to back"""
+    params = parse_params(experiment, params)
+    if params.ensemble_size > 1:
+        raise HTTPException(status_code=400, detail="Shot export takes a single realization")
+    if getattr(params, "draw_order", "vectorized") != "vectorized":
+        raise HTTPException(status_code=400, detail="Shot export needs draw_order 'vectorized'")
+    
+    mark("validation")
     try:
-        data = simulator.generate_rabi_data(
-            omega=params.omega,
-            time_max=params.time_max,
-            time_steps=params.time_steps,
-            noise_rate=params.noise_rate,
-            shots=params.shots,
-            seed=params.seed
+        (planes, _), phases = await pool.run(
+            run_timed, packed_shots, GENERATORS[experiment], **params.model_dump(exclude={"per_shot"})
         )
-        return {"status": "success", "data": data}
+    except PoolOverloaded as e:
+        raise overloaded(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    add_phases(phases)
+    
+    points, row_bytes = next(iter(planes.values())).shape
+    headers = {
+        "Content-Disposition": f'attachment; filename="{experiment}_shots.bin"',
+        "X-Shot-Planes": ",".join(planes),
+        "X-Shot-Shape": f"{points},{row_bytes}",
+        "X-Shots-Per-Point": str(params.shots),
+        "X-Bit-Order": "big",
+    }
+    return StreamingResponse(packed_chunks(planes), media_type="application/octet-stream", headers=headers)
 
-@app.post("/generate/decay")
-async def generate_decay(params: DecayParams):
+JobTask = Literal["generate", "sweep", "export"]
+
+class JobRequest(BaseModel):
+    task: JobTask = "generate"
+    experiment: Experiment
+    params: Dict[str, Any] = {}
+    sweep: Optional[Dict[str, SweepRange]] = None  # Required for sweep jobs
+    format: Optional[str] = None  # records/columnar for generate and sweep jobs, npz/arrow/parquet for exports
+
+def job_view(job: Dict[str, Any]) -> Dict[str, Any]:
+    view = {key: value for key, value in job.items() if key != "pid"}
+    if job["status"] == "succeeded":
+        view["result_url"] = f"/jobs/{job['id']}/result"
+    return view
+
+def find_job(job_id: str) -> Dict[str, Any]:
     try:
-        data = simulator.generate_decay_data(
-            t1=params.t1,
-            t2=params.t2,
-            time_max=params.time_max,
-            time_steps=params.time_steps,
-            noise_rate=params.noise_rate,
-            shots=params.shots,
-            seed=params.seed
-        )
-        return {"status": "success", "data": data}
+        return jobs.get(job_id)
+    except JobNotFound:
+        raise HTTPException(status_code=404, detail=f"Unknown job '{job_id}'")
+
+@app.post("/jobs", status_code=202)
+async def submit_job(request: JobRequest):
+    """Queue a generation, sweep or export that may take longer than a request timeout"""
+    params = parse_params(request.experiment, request.params)
+    spec = {"task": request.task, "experiment": request.experiment}
+    
+    if request.task == "export":
+        fmt = request.format or "npz"
+        if fmt not in EXPORT_FORMATS:
+            raise HTTPException(status_code=400, detail=f"Export jobs take a format of: {', '.join(EXPORT_FORMATS)}")
+        spec.update(format=fmt, params=params.model_dump())
+    else:
+        fmt = request.format or "records"
+        if fmt not in ("records", "columnar"):
+            raise HTTPException(status_code=400, detail="format must be 'records' or 'columnar'")
+        spec["format"] = fmt
+        if request.task == "sweep":
+            if not request.sweep:
+                raise HTTPException(status_code=400, detail="Sweep jobs need a 'sweep' object")
+            check_sweep(request.experiment, params, request.sweep)
+            spec.update(
+                params=params.model_dump(exclude=SWEEP_EXCLUDED, exclude_none=True),
+                sweep={name: r.model_dump() for name, r in request.sweep.items()},
+            )
+        else:
+            spec["params"] = params.model_dump()
+    
+    return job_view(jobs.submit(spec))
+
+@app.get("/jobs")
+async def list_jobs():
+    return [job_view(job) for job in jobs.list()]
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    return job_view(find_job(job_id))
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    job = find_job(job_id)
+    if job["status"] != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Job is {job['status']}")
+    result = job["result"]
+    return FileResponse(jobs.store.path(job_id, result["file"]), media_type=result["media_type"],
+                        filename=f"{job['spec']['experiment']}_{job_id}.{result['file'].rsplit('.', 1)[1]}")
+
+@app.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    find_job(job_id)
+    # Terminating a worker waits for the process to exit, so keep it off the event loop
+    return job_view(await asyncio.to_thread(jobs.cancel, job_id))
+
+@app.delete("/jobs/{job_id}", status_code=204)
+async def delete_job(job_id: str):
+    """Cancel the job if it is still pending and remove its record and result"""
+    find_job(job_id)
+    await asyncio.to_thread(jobs.delete, job_id)
+    return Response(status_code=204)
+
+def find_dataset(dataset_id: str) -> Dict[str, Any]:
+    try:
+        return datasets.describe(dataset_id)
+    except DatasetNotFound:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset '{dataset_id}'")
+
+def dataset_view(meta: Dict[str, Any]) -> Dict[str, Any]:
+    return dict(meta, urls={
+        "slice": f"/datasets/{meta['id']}/slice",
+        "raw": {name: f"/datasets/{meta['id']}/raw/{name}" for name in meta["columns"]},
+    })
+
+async def stored_dataset(experiment: str, params: BaseModel) -> Dict[str, Any]:
+    """Description of the stored dataset for these parameters, generating it first if needed"""
+    if params.seed is None:
+        # Stored datasets must be reproducible from their parameters, so pick the seed up front
+        params = params.model_copy(update={"seed": secrets.randbits(63)})
+    key = ResultCache.make_key(f"dataset/{experiment}", params.model_dump())
+    try:
+        return datasets.describe(key)
+    except DatasetNotFound:
+        pass
+    
+    try:
+        meta = await pool.run(build_dataset, datasets.directory, key, experiment, GENERATORS[experiment],
+                              params.model_dump())
+    except PoolOverloaded as e:
+        raise overloaded(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    datasets.register(meta)
+    return meta
 
-@app.post("/generate/bell")
-async def generate_bell(params: BellParams):
+@app.post("/datasets/{experiment}")
+async def store_dataset(experiment: Experiment, params: Dict[str, Any] = {}):
+    """Generate a dataset into the store, or return the stored one with the same parameters"""
+    return dataset_view(await stored_dataset(experiment, parse_params(experiment, params)))
+
+async def downsampled_response(experiment: str, params: BaseModel, format: str, max_points: int) -> Response:
+    """LTTB view of a trace, with the full-resolution data kept in the dataset store for zooming"""
+    mark("validation")
+    with phase("storage"):
+        meta = await stored_dataset(experiment, params)
+    return await generate_response(
+        cache_key(f"{experiment}/lttb", params, format=format, max_points=max_points),
+        encode_downsampled,
+        datasets.directory,
+        meta["id"],
+        max_points,
+        format
+    )
+
+@app.get("/datasets")
+async def list_datasets():
+    return datasets.list()
+
+@app.get("/datasets/{dataset_id}")
+async def get_dataset(dataset_id: str):
+    return dataset_view(find_dataset(dataset_id))
+
+@app.delete("/datasets/{dataset_id}", status_code=204)
+async def delete_dataset(dataset_id: str):
+    find_dataset(dataset_id)
+    datasets.delete(dataset_id)
+    return Response(status_code=204)
+
+@app.get("/datasets/{dataset_id}/slice")
+def slice_dataset(dataset_id: str,
+                  columns: Optional[str] = Query(None, description="Comma-separated columns; all by default"),
+                  start: Optional[int] = None, stop: Optional[int] = None, step: int = Query(1, ge=1),
+                  time_start: Optional[float] = None, time_stop: Optional[float] = None,
+                  shot_start: Optional[int] = Query(None, ge=0), shot_stop: Optional[int] = Query(None, ge=0),
+                  max_points: Optional[int] = Query(None, ge=3)):
+    """Rows of a stored dataset, read from the memory maps without loading whole columns.
+
+    Rows are chosen by index (start/stop/step) and/or a time window. With
+    max_points, a larger window is reduced by LTTB instead (step is ignored).
+    Packed shot planes are only included when asked for by name or with a shot
+    range, and are cut to shots [shot_start, shot_stop).
+    """
+    meta = find_dataset(dataset_id)
+    names = columns.split(",") if columns else list(meta["columns"])
+    unknown = [name for name in names if name not in meta["columns"]]
+    if unknown:
+        raise HTTPException(status_code=404, detail=f"Unknown columns: {', '.join(unknown)}")
+    planes = [name for name in names if is_shot_plane(name)]
+    if not columns and shot_start is None and shot_stop is None:
+        planes = []
+    names = [name for name in names if not is_shot_plane(name)]
+    
     try:
-        data = simulator.generate_bell_data(
-            noise_rate=params.noise_rate,
-            shots=params.shots,
-            theta=params.theta,
-            seed=params.seed
+        first, last = datasets.point_range(dataset_id, start, stop, time_start, time_stop)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if max_points is not None and last - first > max_points:
+        if planes:
+            raise HTTPException(status_code=400, detail="max_points cannot be combined with shot planes")
+        reduced = downsample_columns(datasets.read(dataset_id, names, first, last), max_points)
+        return NumpyJSONResponse({"id": dataset_id, "start": first, "stop": last, "method": "lttb",
+                                  "rows": len(next(iter(reduced.values()), ())), "columns": reduced})
+    
+    rows = len(range(first, last, step))
+    if rows > settings.slice_max_points:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Slice has {rows} rows (limit {settings.slice_max_points}); narrow it, raise step, "
+                   f"or fetch /datasets/{dataset_id}/raw/<column> with a Range header"
         )
-        return {"status": "success", "data": data}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    
+    body = {
+        "id": dataset_id,
+        "start": first,
+        "stop": last,
+        "step": step,
+        "rows": rows,
+        "columns": datasets.read(dataset_id, names, first, last, step),
+    }
+    if planes:
+        packed = datasets.read_shots(dataset_id, planes, first, last, step, shot_start or 0, shot_stop)
+        shots = meta["parameters"]["shots"]
+        window = range(*slice(shot_start, shot_stop).indices(shots))
+        body["shots"] = {
+            "shot_start": window.start,
+            "shot_stop": max(window.start, window.stop),
+            "shots_per_point": len(window),
+            "bit_order": "big",
+            "encoding": "base64",
+            **{name: base64.b64encode(values).decode("ascii") for name, values in packed.items()},
+            "shape": list(next(iter(packed.values())).shape),
+        }
+    # Returned directly so the arrays are written natively instead of through jsonable_encoder
+    return NumpyJSONResponse(body)
+
+@app.get("/datasets/{dataset_id}/raw/{column}")
+def raw_column(dataset_id: str, column: str, request: Request):
+    """Raw little-endian buffer of one column, with single-range Range support.
+
+    X-Dtype and X-Shape describe the buffer; row i starts at byte i * row size.
+    """
+    find_dataset(dataset_id)
+    try:
+        values = datasets.open(dataset_id, column)
+    except DatasetNotFound:
+        raise HTTPException(status_code=404, detail=f"Unknown column '{column}'")
+    buffer = values.reshape(-1).view(np.uint8)
+    size = buffer.size
+    headers = {
+        "Accept-Ranges": "bytes",
+        "X-Dtype": values.dtype.str,
+        "X-Shape": ",".join(map(str, values.shape)),
+    }
+    try:
+        requested = byte_range(request.headers.get("range"), size)
+    except ValueError:
+        raise HTTPException(status_code=416, detail="Range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    
+    if requested is None:
+        first, last, status = 0, size - 1, 200
+    else:
+        (first, last), status = requested, 206
+        headers["Content-Range"] = f"bytes {first}-{last}/{size}"
+    headers["Content-Length"] = str(last - first + 1)
+    return StreamingResponse(iter_bytes(buffer, first, last), status_code=status,
+                             media_type="application/octet-stream", headers=headers)
+
+async def ndjson_lines(records):
+    async for record in pool.iterate(records):
+        yield dumps(record) + b"\n"
+
+def admit_stream():
+    """Reject a stream up front when the generation pool's backlog is full"""
+    try:
+        pool.admit()
+    except PoolOverloaded as e:
+        raise overloaded(e)
+
+@app.post("/stream/rabi")
+async def stream_rabi(params: RabiParams, format: MeasurementFormat = "records",
+                chunk_size: int = Query(10000, ge=1, le=1_000_000)):
+    if params.per_shot:
+        raise HTTPException(status_code=400, detail="per_shot is not supported for streams; use /export/rabi/shots")
+    if params.ensemble_size > 1:
+        raise HTTPException(status_code=400, detail="ensemble_size is not supported for streams")
+    if params.draw_order != "vectorized":
+        raise HTTPException(status_code=400, detail="Streams only support draw_order 'vectorized'")
+    check_options(params)
+    admit_stream()
+    mark("validation")
+    records = simulator.stream_rabi_data(
+        omega=params.omega,
+        time_max=params.time_max,
+        time_steps=params.time_steps,
+        noise_rate=params.noise_rate,
+        shots=params.shots,
+        seed=params.seed,
+        format=format,
+        chunk_size=chunk_size,
+        engine=params.engine,
+        t1=params.t1,
+        t2=params.t2,
+        noise_model=params.noise_model
+    )
+    return StreamingResponse(ndjson_lines(records), media_type="application/x-ndjson")
+
+@app.post("/stream/decay")
+async def stream_decay(params: DecayParams, format: MeasurementFormat = "records",
+                 chunk_size: int = Query(10000, ge=1, le=1_000_000)):
+    if params.per_shot:
+        raise HTTPException(status_code=400, detail="per_shot is not supported for streams; use /export/decay/shots")
+    if params.ensemble_size > 1:
+        raise HTTPException(status_code=400, detail="ensemble_size is not supported for streams")
+    if params.draw_order != "vectorized":
+        raise HTTPException(status_code=400, detail="Streams only support draw_order 'vectorized'")
+    check_options(params)
+    admit_stream()
+    mark("validation")
+    records = simulator.stream_decay_data(
+        t1=params.t1,
+        t2=params.t2,
+        time_max=params.time_max,
+        time_steps=params.time_steps,
+        noise_rate=params.noise_rate,
+        shots=params.shots,
+        seed=params.seed,
+        format=format,
+        chunk_size=chunk_size,
+        engine=params.engine,
+        noise_model=params.noise_model
+    )
+    return StreamingResponse(ndjson_lines(records), media_type="application/x-ndjson")
+
+STREAMS = {
+    "rabi": simulator.stream_rabi_data,
+    "decay": simulator.stream_decay_data,
+}
+
+class StreamRequest(BaseModel):
+    params: Dict[str, Any] = {}
+    format: MeasurementFormat = "columnar"
+    chunk_size: int = Field(1000, ge=1, le=1_000_000)
+    window: int = Field(4, ge=1)  # Records the server may send ahead of the client's acks
+
+@app.websocket("/ws/stream/{experiment}")
+async def stream_socket(websocket: WebSocket, experiment: Literal["rabi", "decay"]):
+    """Live acquisition: measurement batches with running statistics, pushed as they are generated.
+
+    The client opens with a StreamRequest and acknowledges records with
+    {"ack": seq}. After the header, every record carries a seq, and at most
+    `window` of them are sent ahead of the last ack. The next chunk is only
+    generated once it may be sent, so a slow client holds back generation
+    instead of growing a buffer on the server.
+    """
+    await websocket.accept()
+    try:
+        request = StreamRequest(**await websocket.receive_json())
+        params = parse_params(experiment, request.params)
+    except ValidationError as e:
+        await websocket.send_json({"type": "error", "detail": json.loads(e.json())})
+        await websocket.close(code=1008)
+        return
+    except HTTPException as e:
+        await websocket.send_json({"type": "error", "detail": e.detail})
+        await websocket.close(code=1008)
+        return
+    except (ValueError, TypeError):
+        await websocket.send_json({"type": "error", "detail": "Expected a JSON object"})
+        await websocket.close(code=1008)
+        return
+    except WebSocketDisconnect:
+        return
+    if params.per_shot or params.ensemble_size > 1 or params.draw_order != "vectorized":
+        detail = "per_shot, ensembles and draw_order 'interleaved' are not supported for streams"
+        await websocket.send_json({"type": "error", "detail": detail})
+        await websocket.close(code=1008)
+        return
+    
+    window = min(request.window, settings.stream_window)
+    records = STREAMS[experiment](**params.model_dump(exclude={"per_shot", "ensemble_size", "ensemble_raw", "ensemble_fit", "draw_order"}),
+                                  format=request.format, chunk_size=request.chunk_size)
+    sent = acked = 0
+    try:
+        header = await run_in_threadpool(next, records)
+        await websocket.send_text(dumps({**header, "window": window}).decode())
+        while True:
+            while sent - acked >= window:
+                message = await asyncio.wait_for(websocket.receive_json(), settings.stream_ack_timeout)
+                if message.get("cancel"):
+                    await websocket.close(code=1000)
+                    return
+                acked = max(acked, int(message["ack"]))
+            record = await run_in_threadpool(next, records, None)
+            if record is None:
+                break
+            sent += 1
+            await websocket.send_text(dumps({**record, "seq": sent}).decode())
+        await websocket.close(code=1000)
+    except asyncio.TimeoutError:
+        await websocket.close(code=1008, reason="No ack received")
+    except (KeyError, ValueError, TypeError, AttributeError):
+        await websocket.close(code=1008, reason="Expected {\"ack\": seq} or {\"cancel\": true}")
+    except WebSocketDisconnect:
+        pass
+    finally:
+        records.close()
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,281 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Starlette appends "; charset=utf-8" to text/* media types
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = tuple(256 * 4 ** k for k in range(11))  # 256 B .. 256 MiB
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = (f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+             for name, value in zip(names, values))
+    return "{" + ",".join(pairs) + "}"
+
+
+class Metric:
+    """Base for labelled metrics; every update is one dict lookup under a lock"""
+
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.extend(self._samples(labels, value))
+        return lines
+
+    def _samples(self, labels: Tuple[str, ...], value) -> List[str]:
+        return [f"{self.name}{_labels(self.label_names, labels)} {value}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                # Per-bucket (non-cumulative) counts, then sum and count
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _samples(self, labels: Tuple[str, ...], value) -> List[str]:
+        counts, total, count = value
+        names = self.label_names + ("le",)
+        lines, cumulative = [], 0
+        for bound, bucket in zip(self.buckets + (float("inf"),), counts):
+            cumulative += bucket
+            le = "+Inf" if bound == float("inf") else repr(float(bound))
+            lines.append(f"{self.name}_bucket{_labels(names, labels + (le,))} {cumulative}")
+        lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {total}")
+        lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {count}")
+        return lines
+
+
+class Registry:
+    """Holds the metrics and renders them in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self.metrics: List[Metric] = []
+        # Called before each scrape to refresh gauges that mirror other components
+        self.collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> bytes:
+        for collect in self.collectors:
+            collect()
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return ("\n".join(lines) + "\n").encode()
+
+
+registry = Registry()
+
+requests_total = registry.register(Counter(
+    "quantumpulse_requests_total", "HTTP requests by route and status", ("method", "route", "status")))
+request_errors = registry.register(Counter(
+    "quantumpulse_request_errors_total", "Requests that ended in a 5xx or an unhandled exception", ("route",)))
+request_duration = registry.register(Histogram(
+    "quantumpulse_request_duration_seconds", "Request latency until the last body byte", ("method", "route")))
+request_size = registry.register(Histogram(
+    "quantumpulse_request_size_bytes", "Request body size", ("route",), SIZE_BUCKETS))
+response_size = registry.register(Histogram(
+    "quantumpulse_response_size_bytes", "Response body size on the wire (after compression)", ("route",),
+    SIZE_BUCKETS))
+in_flight = registry.register(Gauge(
+    "quantumpulse_requests_in_flight", "Requests currently being handled"))
+phase_duration = registry.register(Histogram(
+    "quantumpulse_phase_duration_seconds", "Time spent per request phase (Server-Timing)", ("phase",)))
+
+
+class Timings:
+    """Durations of the phases of one request, in seconds"""
+
+    __slots__ = ("start", "phases")
+
+    def __init__(self, start: Optional[float] = None):
+        self.start = time.perf_counter() if start is None else start
+        self.phases: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def header(self) -> str:
+        entries = [f"{name};dur={seconds * 1e3:.3f}" for name, seconds in self.phases.items()]
+        entries.append(f"total;dur={(time.perf_counter() - self.start) * 1e3:.3f}")
+        return ", ".join(entries)
+
+
+_timings: ContextVar[Optional[Timings]] = ContextVar("timings", default=None)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a block into the current request's Server-Timing; a no-op outside a request"""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - start)
+
+
+def mark(name: str):
+    """Record the time from the start of the request until now as phase `name`, once per request"""
+    timings = _timings.get()
+    if timings is not None and name not in timings.phases:
+        timings.add(name, time.perf_counter() - timings.start)
+
+
+def add_phases(phases: Dict[str, float]):
+    """Merge phases measured elsewhere (e.g. in a worker) into the current request"""
+    timings = _timings.get()
+    if timings is not None:
+        for name, seconds in phases.items():
+            timings.add(name, seconds)
+
+
+def run_timed(fn: Callable, *args, **kwargs) -> Tuple[object, Dict[str, float]]:
+    """Call fn with its own phase recorder and return (result, phases).
+
+    Executors do not carry the caller's context into worker threads or processes,
+    so work sent to the pool reports its phases back through the return value.
+    """
+    token = _timings.set(Timings())
+    try:
+        result = fn(*args, **kwargs)
+        return result, _timings.get().phases
+    finally:
+        _timings.reset(token)
+
+
+class MetricsMiddleware:
+    """Records per-route request metrics and adds a Server-Timing header.
+
+    Must be the outermost middleware so sizes are measured on the wire and the
+    compression phase is already known when the response starts.
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = True):
+        self.app = app
+        self.server_timing = server_timing
+        self._routes: Dict[object, str] = {}
+
+    def route_label(self, scope: Scope) -> str:
+        """Path template of the matched route; unmatched paths share one label to bound cardinality"""
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        label = self._routes.get(endpoint)
+        if label is None:
+            router = scope.get("router") or getattr(scope.get("app"), "router", None)
+            for route in getattr(router, "routes", ()):
+                if getattr(route, "endpoint", None) is endpoint:
+                    label = self._routes[endpoint] = route.path
+                    break
+            else:
+                label = "unmatched"
+        return label
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = Timings()
+        token = _timings.set(timings)
+        received = 0
+        sent = 0
+        status = 500
+
+        async def counting_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            received += len(message.get("body", b""))
+            return message
+
+        async def instrumented_send(message: Message):
+            nonlocal sent, status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    MutableHeaders(raw=message["headers"]).append("Server-Timing", timings.header())
+            elif message["type"] == "http.response.body":
+                sent += len(message.get("body", b""))
+            await send(message)
+
+        in_flight.inc()
+        try:
+            await self.app(scope, counting_receive, instrumented_send)
+        except Exception:
+            status = 500
+            raise
+        finally:
+            in_flight.dec()
+            _timings.reset(token)
+            route = self.route_label(scope)
+            method = scope["method"]
+            requests_total.inc(method, route, str(status))
+            request_duration.observe(time.perf_counter() - timings.start, method, route)
+            request_size.observe(received, route)
+            response_size.observe(sent, route)
+            for name, seconds in timings.phases.items():
+                phase_duration.observe(seconds, name)
+            if status >= 500:
+                request_errors.inc(route)
@@ -0,0 +1,70 @@
+"""Request parameter models shared by the API and the offline dataset CLI"""
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+# How the ideal curves are computed: closed-form expressions, circuits on the statevector
+# engine, or the Lindblad master equation (time-domain experiments only)
+Engine = Literal["analytic", "statevector", "lindblad"]
+BellEngine = Literal["analytic", "statevector"]
+
+# "interleaved" draws noise and counts point by point from a legacy RandomState, reproducing
+# the data a seed gave before the vectorized PCG64 sampler became the default
+DrawOrder = Literal["vectorized", "interleaved"]
+
+# Correlated noise channels added on top of noise_rate, e.g. [{"type": "pink", "sigma": 0.03}]; see noise.py
+NoiseModel = Optional[List[Dict[str, Any]]]
+
+
+class RabiParams(BaseModel):
+    omega: float = Field(1.0, gt=0)  # Drive frequency
+    time_max: float = Field(10.0, gt=0)
+    time_steps: int = Field(100, gt=0)
+    noise_rate: float = Field(0.1, ge=0)
+    shots: int = Field(1000, gt=0)
+    seed: Optional[int] = None
+    draw_order: DrawOrder = "vectorized"
+    per_shot: bool = False  # Also return every shot outcome, bit-packed
+    engine: Engine = "analytic"
+    t1: Optional[float] = Field(None, gt=0)  # Relaxation and coherence times for the lindblad engine
+    t2: Optional[float] = Field(None, gt=0)
+    ensemble_size: int = Field(1, ge=1)  # Noise realizations; above 1 the response summarizes them
+    ensemble_raw: bool = False  # Also return every realization's trace
+    ensemble_fit: bool = False  # Fit every realization rather than only the ensemble mean
+    noise_model: NoiseModel = None
+
+
+class DecayParams(BaseModel):
+    t1: float = Field(5.0, gt=0)  # T1 decay time
+    t2: float = Field(3.0, gt=0)  # T2 decay time
+    time_max: float = Field(15.0, gt=0)
+    time_steps: int = Field(100, gt=0)
+    noise_rate: float = Field(0.05, ge=0)
+    shots: int = Field(1000, gt=0)
+    seed: Optional[int] = None
+    draw_order: DrawOrder = "vectorized"
+    per_shot: bool = False
+    engine: Engine = "analytic"
+    ensemble_size: int = Field(1, ge=1)
+    ensemble_raw: bool = False
+    ensemble_fit: bool = False
+    noise_model: NoiseModel = None
+
+
+class BellParams(BaseModel):
+    noise_rate: float = Field(0.1, ge=0)
+    shots: int = Field(10000, gt=0)
+    theta: float = 0.0  # Bell state parameter
+    seed: Optional[int] = None
+    per_shot: bool = False
+    engine: BellEngine = "analytic"
+    ensemble_size: int = Field(1, ge=1)
+    ensemble_raw: bool = False
+    noise_model: NoiseModel = None
+
+
+PARAM_MODELS = {
+    "rabi": RabiParams,
+    "decay": DecayParams,
+    "bell": BellParams,
+}
@@ -0,0 +1,142 @@
+"""Composable noise channels added to ideal curves before shots are sampled.
+
+A noise model is a list of channel specs whose contributions are summed:
+
+    [{"type": "white", "sigma": 0.02},
+     {"type": "pink", "sigma": 0.03},
+     {"type": "drift", "sigma": 0.01, "slope": 0.001},
+     {"type": "telegraph", "amplitude": 0.05, "rate": 0.2}]
+
+Channels run along the last (time) axis of the array they perturb and are
+independent across any leading axes (channels, sweep rows, realizations).
+Every channel is generated for the whole trace in a few array operations:
+colored noise by shaping a white spectrum and one inverse FFT, drift and
+telegraph noise by cumulative sums, so a trace of n points costs O(n log n)
+at most and no Python loop runs per sample.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Channel type -> (parameter defaults, required parameters)
+CHANNELS: Dict[str, Tuple[Dict[str, float], Tuple[str, ...]]] = {
+    # Independent Gaussian noise per point
+    "white": ({}, ("sigma",)),
+    # Stationary noise with power spectral density ~ 1/f^exponent
+    "colored": ({}, ("sigma", "exponent")),
+    "pink": ({"exponent": 1.0}, ("sigma",)),
+    "brown": ({"exponent": 2.0}, ("sigma",)),
+    # Random walk reaching a standard deviation of sigma at the end of the trace, plus a linear slope per unit time
+    "drift": ({"slope": 0.0}, ("sigma",)),
+    # Symmetric random telegraph noise: +-amplitude, switching `rate` times per unit time on average
+    "telegraph": ({}, ("amplitude", "rate")),
+}
+
+
+def parse_model(spec: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Validate a noise model and fill in defaults; raises ValueError with a readable message"""
+    if not spec:
+        return []
+    if not isinstance(spec, list):
+        raise ValueError("noise_model must be a list of channels")
+    channels = []
+    for index, channel in enumerate(spec):
+        if not isinstance(channel, dict) or channel.get("type") not in CHANNELS:
+            raise ValueError(f"noise_model[{index}]: type must be one of {', '.join(CHANNELS)}")
+        defaults, required = CHANNELS[channel["type"]]
+        allowed = set(defaults) | set(required)
+        unknown = set(channel) - allowed - {"type"}
+        if unknown:
+            raise ValueError(f"noise_model[{index}]: unknown parameters {', '.join(sorted(unknown))}")
+        missing = [name for name in required if name not in channel]
+        if missing:
+            raise ValueError(f"noise_model[{index}]: missing {', '.join(missing)}")
+        values = dict(defaults)
+        for name in allowed & set(channel):
+            try:
+                values[name] = float(channel[name])
+            except (TypeError, ValueError):
+                raise ValueError(f"noise_model[{index}].{name} must be a number")
+            if not np.isfinite(values[name]):
+                raise ValueError(f"noise_model[{index}].{name} must be finite")
+        for name in ("sigma", "amplitude", "rate"):
+            if values.get(name, 0.0) < 0:
+                raise ValueError(f"noise_model[{index}].{name} must not be negative")
+        channels.append({"type": channel["type"], **values})
+    return channels
+
+
+def _spacing(time: np.ndarray) -> float:
+    if time.size < 2:
+        return 1.0
+    return float(time[-1] - time[0]) / (time.size - 1) or 1.0
+
+
+def colored(rng: np.random.Generator, shape: Tuple[int, ...], time: np.ndarray,
+            sigma: float, exponent: float) -> np.ndarray:
+    """Gaussian noise with spectral density ~ 1/f^exponent, by shaping white noise in the frequency domain.
+
+    The spectrum is drawn for twice the trace length and the first half kept, so
+    the circular wrap-around of the inverse FFT never joins the two ends of the
+    trace. The result is scaled to the expected standard deviation sigma (not
+    the sample's), so realizations keep their natural spread.
+    """
+    points = shape[-1]
+    length = 2 * points
+    frequency = np.fft.rfftfreq(length, _spacing(time))
+    # DC and Nyquist bins stay empty, so every shaped bin is a full complex pair
+    weight = np.zeros_like(frequency)
+    weight[1:-1] = frequency[1:-1] ** (-exponent / 2)
+
+    # Pairs of standard normals viewed as complex values, shaped in place
+    spectrum = rng.standard_normal(shape[:-1] + (2 * frequency.size,)).view(np.complex128)
+    spectrum *= weight
+
+    # Per-sample variance of irfft(weight * complex standard normal)
+    variance = 4 * np.sum(weight ** 2) / length ** 2
+    scale = sigma / np.sqrt(variance) if variance > 0 else 0.0
+    return np.fft.irfft(spectrum, n=length, axis=-1)[..., :points] * scale
+
+
+def drift(rng: np.random.Generator, shape: Tuple[int, ...], time: np.ndarray,
+          sigma: float, slope: float) -> np.ndarray:
+    """Wiener process with variance sigma^2 at the end of the trace, plus slope * time"""
+    span = float(time[-1] - time[0]) if time.size > 1 else 1.0
+    steps = np.diff(time, prepend=time[0]) / (span or 1.0)
+    walk = np.cumsum(rng.standard_normal(shape) * (sigma * np.sqrt(steps)), axis=-1)
+    return walk + slope * (time - time[0])
+
+
+def telegraph(rng: np.random.Generator, shape: Tuple[int, ...], time: np.ndarray,
+              amplitude: float, rate: float) -> np.ndarray:
+    """Symmetric random telegraph signal between +-amplitude.
+
+    Over an interval dt the state flips with probability (1 - exp(-2 rate dt)) / 2,
+    the exact two-state Markov transition, so the flips are drawn independently
+    and the state follows from the parity of their running count.
+    """
+    steps = np.diff(time, prepend=time[0])
+    flip = rng.random(shape) < (1 - np.exp(-2 * rate * steps)) / 2
+    start = np.where(rng.random(shape[:-1] + (1,)) < 0.5, -amplitude, amplitude)
+    return start * (1 - 2 * (np.cumsum(flip, axis=-1) & 1))
+
+
+def sample_model(rng: np.random.Generator, model: List[Dict[str, Any]], shape: Tuple[int, ...],
+                 time: np.ndarray) -> Optional[np.ndarray]:
+    """Sum of the model's channels for an array of `shape` whose last axis follows `time`; None when empty"""
+    if not model:
+        return None
+    shape = tuple(shape)
+    time = np.asarray(time, dtype=float)
+    total = np.zeros(shape)
+    for channel in model:
+        kind = channel["type"]
+        if kind == "white":
+            total += rng.normal(0, channel["sigma"], size=shape)
+        elif kind == "drift":
+            total += drift(rng, shape, time, channel["sigma"], channel["slope"])
+        elif kind == "telegraph":
+            total += telegraph(rng, shape, time, channel["amplitude"], channel["rate"])
+        else:
+            total += colored(rng, shape, time, channel["sigma"], channel["exponent"])
+    return total
@@ -166,20 +166,20 @@
             
 #             # Generate correlated measurements
 #             prob_same = (1 + noisy_corr) / 2  # Convert correlation to probability
-            
+                
 #             # Generate measurement outcomes
 #             same_outcome_count = self.rng.binomial(shots, prob_same)
 #             diff_outcome_count = shots - same_outcome_count
-            
+                
 #             # Distribute between 00+11 and 01+10
 #             prob_00 = prob_11 = same_outcome_count / (2 * shots)
 #             prob_01 = prob_10 = diff_outcome_count / (2 * shots)
-            
+                
 #             count_00 = self.rng.binomial(shots, prob_00)
 #             count_11 = self.rng.binomial(shots, prob_11)
 #             count_01 = self.rng.binomial(shots, prob_01)
 #             count_10 = shots - count_00 - count_11 - count_01
-            
+                
 #             measured_corr = (count_00 + count_11 - count_01 - count_10) / shots
             
 #             measurements[basis] = {
@@ -216,57 +216,487 @@
 #                 'total_shots': shots * len(bases)
 #             }
 #         }
+import functools
 import numpy as np
-from typing import Dict, List, Any
+from typing import Callable, Dict, Iterator, List, Any
+import base64
 import json
+from statevector import CNOT, H, X, Statevector, amplitude_damping, controlled, rx, ry, rz
+from lindblad import SIGMA_X, SIGMA_Z, evolve, liouvillian, qubit_dissipators
+from fitting import fit_damped_cosine, fit_exponential, fit_rabi, fit_stride
+from noise import parse_model, sample_model
 
 class QuantumSimulator:
-    def __init__(self):
-        self.rng = np.random.RandomState()
+    # Parameters that /generate/{experiment}/sweep may scan, per experiment
+    SWEEP_PARAMETERS = {
+        'rabi': ('omega', 'noise_rate'),
+        'decay': ('t1', 't2', 'noise_rate'),
+        'bell': ('theta', 'noise_rate')
+    }
     
-    def set_seed(self, seed: int):
-        if seed is not None:
-            self.rng.seed(seed)
-            np.random.seed(seed)
+    # Bell basis labels; the measurement angles for each are in BELL_ANGLES, in the same order
+    BELL_BASES = ('XX', 'XY', 'YX', 'YY')
+    # Measurement axes of qubits A and B for each basis, as angles from Z in the X-Z plane.
+    # These are the CHSH-optimal settings: |XX - XY| + |YX + YY| = 2*sqrt(2) at theta = 0
+    BELL_ANGLES = np.array([[0, np.pi/4], [0, 3*np.pi/4], [np.pi/2, np.pi/4], [np.pi/2, 3*np.pi/4]])
     
-    def generate_rabi_data(self, omega: float, time_max: float, time_steps: int, 
-                          noise_rate: float, shots: int, seed: int = None) -> Dict[str, Any]:
-        """Generate Rabi oscillation synthetic data"""
-        self.set_seed(seed)
+    # Percentile bands of ensemble output, returned as <column>_pNN
+    ENSEMBLE_PERCENTILES = (5, 25, 50, 75, 95)
+    
+    @staticmethod
+    def _make_rng(seed=None, draw_order: str = 'vectorized'):
+        """Create the random generator for a single request.
+
+        Each call gets its own PCG64 Generator, so concurrent requests never share
+        a stream and global NumPy state is left alone. The 'interleaved' order uses
+        a private legacy RandomState so existing seeds keep their original output.
+        An existing generator is passed through unchanged.
+        """
+        if isinstance(seed, (np.random.Generator, np.random.RandomState)):
+            return seed
+        if draw_order == 'interleaved':
+            return np.random.RandomState(seed)
+        return np.random.Generator(np.random.PCG64(seed))
+    
+    @staticmethod
+    def _sample_counts(rng, theory_prob: np.ndarray, noise_rate: float, shots: int,
+                       draw_order: str = 'vectorized', correlated: np.ndarray = None) -> np.ndarray:
+        """Add Gaussian noise to theory probabilities and draw binomial shot counts.
+
+        'vectorized' draws all noise in one call and all counts in one call.
+        'interleaved' reproduces the original per-point normal/binomial order;
+        for stacked channels the points are visited column by column.
+        `correlated` is noise already drawn from a noise model, added on top.
+        """
+        if correlated is not None and draw_order != 'vectorized':
+            raise ValueError("noise_model needs draw_order='vectorized'")
+        if draw_order == 'vectorized':
+            noise = rng.normal(0, noise_rate, size=theory_prob.shape)
+            if correlated is not None:
+                noise += correlated
+            noisy_prob = np.clip(theory_prob + noise, 0, 1)
+            return rng.binomial(shots, noisy_prob)
+
+        if draw_order == 'interleaved':
+            ones_count = np.empty(theory_prob.size, dtype=np.int64)
+            for i, prob in enumerate(theory_prob.ravel(order='F')):
+                noisy_prob = np.clip(prob + rng.normal(0, noise_rate), 0, 1)
+                ones_count[i] = rng.binomial(shots, noisy_prob)
+            return ones_count.reshape(theory_prob.shape, order='F')
+
+        raise ValueError(f"Unknown draw_order '{draw_order}'")
+
+    @staticmethod
+    def _shot_blocks(rows: int, shots: int, block_size: int = 1 << 22) -> Iterator[tuple]:
+        """Split a (rows x shots) outcome matrix into blocks of about `block_size` shots.
+
+        Yields (row_start, row_stop, shot_start, shot_stop); shot bounds are multiples
+        of 8 so every block packs into whole bytes of the output row.
+        """
+        if shots <= block_size:
+            step = max(1, block_size // max(shots, 1))
+            for row in range(0, rows, step):
+                yield row, min(row + step, rows), 0, shots
+        else:
+            width = block_size - block_size % 8
+            for row in range(rows):
+                for shot in range(0, shots, width):
+                    yield row, row + 1, shot, min(shot + width, shots)
+    
+    @classmethod
+    def _sample_shots(cls, rng, theory_prob: np.ndarray, noise_rate: float, shots: int,
+                      correlated: np.ndarray = None):
+        """Draw every shot outcome instead of binomial totals.
+
+        Returns (ones_count, packed) where `packed` holds the outcomes bit-packed
+        8 shots per byte (big bit order), shape theory_prob.shape + (ceil(shots / 8),).
+        Outcomes are generated block by block, so only the packed buffer grows with
+        the total number of shots.
+        """
+        noise = rng.normal(0, noise_rate, size=theory_prob.shape)
+        if correlated is not None:
+            noise += correlated
+        noisy_prob = np.clip(theory_prob + noise, 0, 1).reshape(-1)
         
-        # Time array
-        time = np.linspace(0, time_max, time_steps)
+        ones_count = np.zeros(noisy_prob.size, dtype=np.int64)
+        packed = np.empty((noisy_prob.size, (shots + 7) // 8), dtype=np.uint8)
+        for r0, r1, s0, s1 in cls._shot_blocks(noisy_prob.size, shots):
+            outcomes = rng.random((r1 - r0, s1 - s0), dtype=np.float32) < noisy_prob[r0:r1, None]
+            ones_count[r0:r1] += np.count_nonzero(outcomes, axis=1)
+            packed[r0:r1, s0 // 8:(s1 + 7) // 8] = np.packbits(outcomes, axis=1)
         
+        return ones_count.reshape(theory_prob.shape), packed.reshape(theory_prob.shape + (-1,))
+    
+    @classmethod
+    def _sample_joint_shots(cls, rng, probs: np.ndarray, shots: int):
+        """Draw two-qubit shots from joint outcome probabilities (rows x [00, 01, 10, 11]).
+
+        Returns (counts, packed_a, packed_b): counts per outcome and the bit-packed
+        results of qubit A and qubit B, one row per probability row.
+        """
+        rows = probs.shape[0]
+        cumulative = np.cumsum(probs, axis=1)
+        counts = np.zeros((rows, 4), dtype=np.int64)
+        packed_a = np.empty((rows, (shots + 7) // 8), dtype=np.uint8)
+        packed_b = np.empty_like(packed_a)
+        for r0, r1, s0, s1 in cls._shot_blocks(rows, shots):
+            u = rng.random((r1 - r0, s1 - s0))
+            c = cumulative[r0:r1, :, None]
+            bit_a = u >= c[:, 1]
+            bit_b = (u >= c[:, 0]) & ~bit_a | (u >= c[:, 2])
+            n_a = np.count_nonzero(bit_a, axis=1)
+            n_b = np.count_nonzero(bit_b, axis=1)
+            n_11 = np.count_nonzero(bit_a & bit_b, axis=1)
+            counts[r0:r1] += np.stack([(s1 - s0) - n_a - n_b + n_11, n_b - n_11, n_a - n_11, n_11], axis=1)
+            packed_a[r0:r1, s0 // 8:(s1 + 7) // 8] = np.packbits(bit_a, axis=1)
+            packed_b[r0:r1, s0 // 8:(s1 + 7) // 8] = np.packbits(bit_b, axis=1)
+        return counts, packed_a, packed_b
+    
+    @staticmethod
+    def _pop_shots(columns: Dict[str, np.ndarray], shots: int, format: str) -> Dict[str, Any]:
+        """Move the packed per-shot arrays out of `columns` into a 'shots' block.
+
+        JSON layouts carry the packed bytes base64-encoded; 'arrays' keeps the uint8 arrays.
+        """
+        block = {'shots_per_point': shots, 'bit_order': 'big'}
+        for key in [key for key in columns if key.startswith('shots_packed')]:
+            packed = columns.pop(key)
+            block['shape'] = list(packed.shape)
+            if format == 'arrays':
+                block[key] = packed
+            else:
+                block['encoding'] = 'base64'
+                block[key] = base64.b64encode(np.ascontiguousarray(packed)).decode('ascii')
+        return block
+    
+    @staticmethod
+    def _to_records(columns: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+        """Turn measurement columns into a list of per-point dicts"""
+        keys = list(columns)
+        return [dict(zip(keys, row)) for row in zip(*(columns[k].tolist() for k in keys))]
+    
+    @classmethod
+    def _format_columns(cls, columns: Dict[str, np.ndarray], format: str):
+        """Lay out measurement columns as 'records' (list of dicts) or one NumPy array per field.
+
+        'columnar' (JSON responses, written natively by serialization.dumps) and
+        'arrays' (binary exporters) both keep the arrays as they are.
+        """
+        if format == 'records':
+            return cls._to_records(columns)
+        if format in ('columnar', 'arrays'):
+            return dict(columns)
+        raise ValueError(f"Unknown format '{format}'")
+    
+    @staticmethod
+    def _check_ensemble(draw_order: str, per_shot: bool):
+        if draw_order != 'vectorized':
+            raise ValueError("Ensembles need draw_order='vectorized'")
+        if per_shot:
+            raise ValueError("per_shot output is not supported for ensembles")
+    
+    @classmethod
+    def _ensemble_columns(cls, name: str, stack: np.ndarray, raw: bool) -> Dict[str, np.ndarray]:
+        """Per-point mean, standard deviation and percentile bands of a (realizations, points) stack.
+
+        The mean keeps the column's plain name. The raw stack is returned as
+        <name>_ensemble with the realizations on the last axis, so its rows line
+        up with the points like every other column.
+        """
+        columns = {name: stack.mean(axis=0), f'{name}_std': stack.std(axis=0)}
+        bands = np.percentile(stack, cls.ENSEMBLE_PERCENTILES, axis=0)
+        for q, band in zip(cls.ENSEMBLE_PERCENTILES, bands):
+            columns[f'{name}_p{q:02d}'] = band
+        if raw:
+            columns[f'{name}_ensemble'] = np.ascontiguousarray(stack.T)
+        return columns
+    
+    @staticmethod
+    def _correlated_noise(rng, noise_model, shape: tuple, time: np.ndarray) -> np.ndarray:
+        """Noise-model contribution for an array of `shape` along `time`, or None without a model"""
+        return sample_model(rng, parse_model(noise_model), shape, time)
+    
+    @staticmethod
+    def _ensemble_statistics(values: Dict[str, np.ndarray]) -> Dict[str, float]:
+        """Mean and standard deviation over the realizations of each per-realization statistic"""
+        statistics = {}
+        for name, value in values.items():
+            statistics[name] = float(np.mean(value))
+            statistics[f'{name}_std'] = float(np.std(value))
+        return statistics
+    
+    @classmethod
+    def _ensemble_fit(cls, fit: Callable[..., Dict[str, np.ndarray]], stacks: tuple, members: bool) -> Dict[str, float]:
+        """Curve-fit statistics of an ensemble.
+
+        With `members` every realization is fitted and the statistics carry their
+        spread, like _ensemble_statistics. Otherwise only the per-point mean trace
+        is fitted: one fit instead of K, which dominates the cost of large ensembles.
+        """
+        if members:
+            return cls._ensemble_statistics(fit(*stacks))
+        return {name: float(value[0]) for name, value in fit(*(stack.mean(axis=0) for stack in stacks)).items()}
+    
+    @staticmethod
+    def _rabi_theory(omega, time: np.ndarray, time_max: float) -> np.ndarray:
+        """Decaying Rabi curve; `omega` may be a column of values to broadcast over time"""
         # Theoretical Rabi oscillation: P(|1⟩) = sin²(Ωt/2)
-        theory_prob = np.sin(omega * time / 2) ** 2
+        theory_prob = np.sin(np.multiply(omega, time) / 2) ** 2
         
         # Add T2 decay envelope
-        decay_envelope = np.exp(-time / (time_max * 0.3))
-        theory_prob *= decay_envelope
+        theory_prob *= np.exp(-time / (time_max * 0.3))
+        return theory_prob
+    
+    @staticmethod
+    def _decay_theory(t1, t2, time: np.ndarray) -> np.ndarray:
+        """T1 and T2 curves stacked on a leading channel axis; t1/t2 may be columns"""
+        shape = np.broadcast(np.asarray(t1), np.asarray(t2), time).shape
+        theory = np.empty((2,) + shape)
         
-        # Add noise and sample
-        measurements = []
-        measured_prob = []
+        # T1 decay (amplitude decay)
+        np.exp(-time / t1, out=theory[0])
         
-        for i, prob in enumerate(theory_prob):
-            # Add Gaussian noise to probability
-            noisy_prob = np.clip(prob + self.rng.normal(0, noise_rate), 0, 1)
-            
-            # Sample binomial for shot noise
-            ones_count = self.rng.binomial(shots, noisy_prob)
-            measurements.append({
-                'time': float(time[i]),
-                'theory_prob': float(prob),
-                'measured_prob': float(ones_count / shots),
-                'ones_count': int(ones_count),
-                'zeros_count': int(shots - ones_count)
-            })
-            measured_prob.append(ones_count / shots)
+        # T2 decay (coherence decay with oscillation), normalized to [0,1]
+        np.multiply(theory[0], np.cos(2 * np.pi * time / 2), out=theory[1])
+        theory[1] *= np.exp(-time / t2)
+        theory[1] += 1
+        theory[1] /= 2
+        return theory
+    
+    @staticmethod
+    def _rabi_circuit(omega: float, time: np.ndarray, time_max: float) -> np.ndarray:
+        """Rabi curve from the statevector engine, one circuit per time point.
+
+        Rx(omega * t) drives the qubit; the decay envelope is amplitude damping into
+        an ancilla with the same exp(-t / (0.3 * time_max)) profile as _rabi_theory.
+        """
+        state = Statevector(2, batch_size=time.size)
+        state.apply(rx(omega * time), [0])
+        state.apply(amplitude_damping(1 - np.exp(-time / (time_max * 0.3))), [0, 1])
+        return state.probabilities([0])[:, 1]
+    
+    @staticmethod
+    def _decay_circuit(t1: float, t2: float, time: np.ndarray) -> np.ndarray:
+        """T1 and T2 curves from the statevector engine, stacked like _decay_theory.
+
+        T1: prepare |1> and damp it into an ancilla. T2: a Ramsey sequence whose free
+        evolution precesses at the same detuning as _decay_theory, with the coherence
+        loss carried out by a controlled rotation that entangles the qubit with an ancilla.
+        """
+        t1_state = Statevector(2, batch_size=time.size)
+        t1_state.apply(X, [0])
+        t1_state.apply(amplitude_damping(1 - np.exp(-time / t1)), [0, 1])
         
-        # Calculate fit metrics
-        mse = np.mean((np.array(measured_prob) - theory_prob) ** 2)
+        # The ancilla overlap cos(phi / 2) scales the qubit's coherence
+        coherence = np.exp(-time / t1) * np.exp(-time / t2)
+        t2_state = Statevector(2, batch_size=time.size)
+        t2_state.apply(ry(np.pi / 2), [0])
+        t2_state.apply(rz(2 * np.pi * time / 2), [0])
+        t2_state.apply(controlled(ry(2 * np.arccos(np.clip(coherence, 0, 1)))), [0, 1])
+        t2_state.apply(ry(np.pi / 2), [0])
         
+        return np.stack([t1_state.probabilities([0])[:, 1], t2_state.probabilities([0])[:, 1]])
+    
+    @classmethod
+    def _bell_circuit(cls, theta, noise_rate=0.0) -> np.ndarray:
+        """Bell outcome probabilities from the statevector engine; same layout as bell_probabilities.
+
+        H and CNOT prepare |Phi+>, Ry(theta) rotates qubit B and each basis rotates
+        both qubits onto its measurement axes. Depolarizing noise mixes in the uniform
+        distribution afterwards, which is exact because the channel commutes with the
+        rotations.
+        """
+        theta = np.asarray(theta, dtype=float)
+        bases = len(cls.BELL_ANGLES)
+        angles = np.broadcast_to(theta[..., None], theta.shape + (bases,)).ravel()
+        
+        state = Statevector(2, batch_size=angles.size)
+        state.apply(H, [0])
+        state.apply(CNOT, [0, 1])
+        state.apply(ry(angles), [1])
+        state.apply(ry(-np.tile(cls.BELL_ANGLES[:, 0], theta.size)), [0])
+        state.apply(ry(-np.tile(cls.BELL_ANGLES[:, 1], theta.size)), [1])
+        probs = state.probabilities().reshape(theta.shape + (bases, 4))
+        
+        keep = (1 - np.clip(np.asarray(noise_rate, dtype=float), 0, 1))[..., None, None]
+        return np.clip(keep * probs + (1 - keep) / 4, 0, 1)
+    
+    @staticmethod
+    def _rabi_lindblad(omega: float, time: np.ndarray, time_max: float,
+                       t1: float = None, t2: float = None) -> np.ndarray:
+        """Rabi curve from the Lindblad solver: resonant drive omega/2 sigma_x with T1 relaxation and dephasing.
+
+        Missing t1/t2 default to the 0.3 * time_max time constant of the analytic envelope.
+        """
+        generator = liouvillian(0.5 * omega * SIGMA_X,
+                                qubit_dissipators(t1 or 0.3 * time_max, t2 or 0.3 * time_max))
+        rho = evolve(generator, np.diag([1, 0]), time)
+        return np.clip(rho[:, 1, 1].real, 0, 1)
+    
+    @staticmethod
+    def _decay_lindblad(t1: float, t2: float, time: np.ndarray) -> np.ndarray:
+        """T1 and T2 curves from the Lindblad solver, stacked like _decay_theory.
+
+        T1: relaxation of |1>. T2: a Ramsey experiment, |+> precessing at the detuning
+        of _decay_theory and read out along X.
+        """
+        dissipators = qubit_dissipators(t1, t2)
+        t1_rho = evolve(liouvillian(np.zeros((2, 2)), dissipators), np.diag([0, 1]), time)
+        t2_rho = evolve(liouvillian(0.5 * (2 * np.pi / 2) * SIGMA_Z, dissipators), np.full((2, 2), 0.5), time)
+        return np.clip(np.stack([t1_rho[:, 1, 1].real, 0.5 + t2_rho[:, 0, 1].real]), 0, 1)
+    
+    @staticmethod
+    def _fit_points(time: np.ndarray, *signals: np.ndarray) -> tuple:
+        """Strided time grid and (N, T) signal rows the fits run on; None if there are too few points"""
+        stride = fit_stride(time.size)
+        if time[::stride].size < 8:
+            return None
+        return (time[::stride],) + tuple(np.atleast_2d(signal)[:, ::stride] for signal in signals)
+    
+    @classmethod
+    def _rabi_fit(cls, time: np.ndarray, measured_prob: np.ndarray) -> Dict[str, np.ndarray]:
+        """Fitted Rabi frequency and decay time, with standard errors, for each row of `measured_prob`"""
+        points = cls._fit_points(time, measured_prob)
+        if points is None:
+            nan = np.full(np.atleast_2d(measured_prob).shape[0], np.nan)
+            return dict.fromkeys(('omega_fitted', 'omega_fitted_error', 'decay_time_fitted',
+                                  'decay_time_fitted_error'), nan)
+        fit = fit_rabi(*points)
         return {
+            'omega_fitted': fit['params']['omega'],
+            'omega_fitted_error': fit['errors']['omega'],
+            'decay_time_fitted': fit['params']['tau'],
+            'decay_time_fitted_error': fit['errors']['tau']
+        }
+    
+    @classmethod
+    def _decay_fit(cls, time: np.ndarray, t1_signal: np.ndarray, t2_signal: np.ndarray,
+                   engine: str = 'analytic') -> Dict[str, np.ndarray]:
+        """T1 from an exponential fit and T2 from a damped-cosine (Ramsey) fit, with standard errors.
+
+        The analytic and statevector Ramsey curves decay at 1/T1 + 1/T2, so the
+        fitted T1 rate is taken out of the damped-cosine rate to report T2; the
+        Lindblad curve already decays at 1/T2. Rows whose remaining rate is not
+        positive report NaN.
+        """
+        points = cls._fit_points(time, t1_signal, t2_signal)
+        if points is None:
+            nan = np.full(np.atleast_2d(t1_signal).shape[0], np.nan)
+            return dict.fromkeys(('t1_fitted', 't1_fitted_error', 't2_fitted', 't2_fitted_error'), nan)
+        time, t1_signal, t2_signal = points
+        t1_fit = fit_exponential(time, t1_signal)
+        t2_fit = fit_damped_cosine(time, t2_signal)
+        t1, t1_error = t1_fit['params']['tau'], t1_fit['errors']['tau']
+        t2, t2_error = t2_fit['params']['tau'], t2_fit['errors']['tau']
+        if engine != 'lindblad':
+            with np.errstate(divide='ignore', invalid='ignore'):
+                rate = 1 / t2 - 1 / t1
+                # Rate errors add in quadrature; d(1/rate) = d(rate) / rate^2
+                rate_error = np.hypot(t2_error / t2 ** 2, t1_error / t1 ** 2)
+                t2 = np.where(rate > 0, 1 / rate, np.nan)
+                t2_error = np.where(rate > 0, rate_error * t2 ** 2, np.nan)
+        return {
+            't1_fitted': t1,
+            't1_fitted_error': t1_error,
+            't2_fitted': t2,
+            't2_fitted_error': t2_error
+        }
+    
+    @staticmethod
+    def _time_slice(time_max: float, time_steps: int, start: int, stop: int) -> np.ndarray:
+        """Points [start, stop) of np.linspace(0, time_max, time_steps) without building the full grid"""
+        if time_steps == 1:
+            return np.zeros(stop - start)
+        time = np.arange(start, stop) * (time_max / (time_steps - 1))
+        if stop == time_steps and stop > start:
+            time[-1] = time_max
+        return time
+    
+    def rabi_arrays(self, omega: float, time_max: float, time_steps: int,
+                    noise_rate: float, shots: int, seed: int = None,
+                    draw_order: str = 'vectorized', per_shot: bool = False,
+                    engine: str = 'analytic', t1: float = None, t2: float = None,
+                    noise_model: List[Dict[str, Any]] = None) -> Dict[str, np.ndarray]:
+        """Generate Rabi oscillation measurement columns as NumPy arrays.
+
+        With per_shot=True the columns also hold 'shots_packed', every shot's
+        outcome bit-packed into a (time_steps, ceil(shots / 8)) uint8 array.
+        engine='statevector' computes the curve from circuits instead of closed form;
+        engine='lindblad' solves the driven master equation with relaxation times t1/t2.
+        noise_model adds correlated noise channels (see noise.py) to the i.i.d. noise_rate.
+        """
+        rng = self._make_rng(seed, draw_order)
+        
+        # Time array
+        time = np.linspace(0, time_max, time_steps)
+        correlated = self._correlated_noise(rng, noise_model, time.shape, time)
+        return self._rabi_columns(rng, time, omega, time_max, noise_rate, shots, draw_order, per_shot,
+                                  engine, t1, t2, correlated)
+    
+    def _rabi_curve(self, time: np.ndarray, omega: float, time_max: float, engine: str = 'analytic',
+                    t1: float = None, t2: float = None) -> np.ndarray:
+        """Ideal Rabi probabilities from the chosen engine"""
+        if engine == 'analytic':
+            return self._rabi_theory(omega, time, time_max)
+        if engine == 'statevector':
+            return self._rabi_circuit(omega, time, time_max)
+        if engine == 'lindblad':
+            return self._rabi_lindblad(omega, time, time_max, t1, t2)
+        raise ValueError(f"Unknown engine '{engine}'")
+    
+    def _rabi_columns(self, rng, time: np.ndarray, omega: float, time_max: float,
+                      noise_rate: float, shots: int, draw_order: str = 'vectorized',
+                      per_shot: bool = False, engine: str = 'analytic',
+                      t1: float = None, t2: float = None, correlated: np.ndarray = None) -> Dict[str, np.ndarray]:
+        """Rabi measurement columns for the given time points, with `correlated` model noise for them"""
+        theory_prob = self._rabi_curve(time, omega, time_max, engine, t1, t2)
+        
+        # Add noise and sample shot counts for every time point at once
+        if per_shot:
+            if draw_order != 'vectorized':
+                raise ValueError("per_shot output needs draw_order='vectorized'")
+            ones_count, packed = self._sample_shots(rng, theory_prob, noise_rate, shots, correlated)
+        else:
+            ones_count = self._sample_counts(rng, theory_prob, noise_rate, shots, draw_order, correlated)
+        
+        columns = {
+            'time': time,
+            'theory_prob': theory_prob,
+            'measured_prob': ones_count / shots,
+            'ones_count': ones_count,
+            'zeros_count': shots - ones_count
+        }
+        if per_shot:
+            columns['shots_packed'] = packed
+        return columns
+    
+    def generate_rabi_data(self, omega: float, time_max: float, time_steps: int, 
+                          noise_rate: float, shots: int, seed: int = None,
+                          draw_order: str = 'vectorized', format: str = 'records',
+                          per_shot: bool = False, engine: str = 'analytic',
+                          t1: float = None, t2: float = None,
+                          ensemble_size: int = 1, ensemble_raw: bool = False,
+                          noise_model: List[Dict[str, Any]] = None,
+                          ensemble_fit: bool = False) -> Dict[str, Any]:
+        """Generate Rabi oscillation synthetic data; ensemble_size > 1 returns an ensemble summary"""
+        noise_model = parse_model(noise_model)
+        if ensemble_size > 1:
+            self._check_ensemble(draw_order, per_shot)
+            return self._rabi_ensemble(omega, time_max, time_steps, noise_rate, shots, seed,
+                                       format, engine, t1, t2, ensemble_size, ensemble_raw, noise_model,
+                                       ensemble_fit)
+        columns = self.rabi_arrays(omega, time_max, time_steps, noise_rate, shots,
+                                   seed=seed, draw_order=draw_order, per_shot=per_shot,
+                                   engine=engine, t1=t1, t2=t2, noise_model=noise_model)
+        shots_block = self._pop_shots(columns, shots, format) if per_shot else None
+        theory_prob = columns['theory_prob']
+        measured_prob = columns['measured_prob']
+        measurements = self._format_columns(columns, format)
+        
+        # Calculate fit metrics
+        mse = np.mean((measured_prob - theory_prob) ** 2)
+        
+        data = {
             'experiment_type': 'rabi_oscillation',
             'parameters': {
                 'omega': omega,
@@ -274,63 +704,242 @@ class QuantumSimulator:
                 'time_steps': time_steps,
                 'noise_rate': noise_rate,
                 'shots': shots,
-                'seed': seed
+                'seed': seed,
+                'engine': engine,
+                't1': t1,
+                't2': t2,
+                'noise_model': noise_model
             },
             'measurements': measurements,
             'statistics': {
                 'mse': float(mse),
                 'max_prob': float(np.max(measured_prob)),
-                'oscillation_period': float(2 * np.pi / omega)
+                'oscillation_period': float(2 * np.pi / omega),
+                **{name: float(value[0]) for name, value in self._rabi_fit(columns['time'], measured_prob).items()}
             },
             'metadata': {
                 'total_measurements': time_steps,
                 'total_shots': shots * time_steps
             }
         }
+        if per_shot:
+            data['shots'] = shots_block
+        return data
     
-    def generate_decay_data(self, t1: float, t2: float, time_max: float, time_steps: int,
-                           noise_rate: float, shots: int, seed: int = None) -> Dict[str, Any]:
-        """Generate T1/T2 decay synthetic data"""
-        self.set_seed(seed)
-        
+    def _rabi_ensemble(self, omega: float, time_max: float, time_steps: int, noise_rate: float,
+                       shots: int, seed: int, format: str, engine: str, t1: float, t2: float,
+                       ensemble_size: int, raw: bool, noise_model: List[Dict[str, Any]],
+                       fit_members: bool) -> Dict[str, Any]:
+        """Rabi ensemble: every realization's noise and counts drawn as one (ensemble_size, time_steps) matrix.
+
+        The ideal curve is computed once and broadcast, so the Python overhead is
+        that of a single realization; only the sampling and the summaries grow
+        with the ensemble.
+        """
+        rng = self._make_rng(seed)
         time = np.linspace(0, time_max, time_steps)
+        theory_prob = self._rabi_curve(time, omega, time_max, engine, t1, t2)
+        correlated = self._correlated_noise(rng, noise_model, (ensemble_size, time_steps), time)
+        ones_count = self._sample_counts(rng, np.broadcast_to(theory_prob, (ensemble_size, time_steps)),
+                                         noise_rate, shots, correlated=correlated)
+        measured_prob = ones_count / shots
         
-        # T1 decay (amplitude decay)
-        t1_decay = np.exp(-time / t1)
-        
-        # T2 decay (coherence decay with oscillation)
-        t2_oscillation = t1_decay * np.cos(2 * np.pi * time / 2) * np.exp(-time / t2)
+        columns = {
+            'time': time,
+            'theory_prob': theory_prob,
+            **self._ensemble_columns('measured_prob', measured_prob, raw)
+        }
+        return {
+            'experiment_type': 'rabi_oscillation_ensemble',
+            'parameters': {
+                'omega': omega,
+                'time_max': time_max,
+                'time_steps': time_steps,
+                'noise_rate': noise_rate,
+                'shots': shots,
+                'seed': seed,
+                'engine': engine,
+                't1': t1,
+                't2': t2,
+                'noise_model': noise_model,
+                'ensemble_size': ensemble_size,
+                'ensemble_fit': fit_members
+            },
+            'measurements': self._format_columns(columns, format),
+            'statistics': {
+                'oscillation_period': float(2 * np.pi / omega),
+                **self._ensemble_statistics({
+                    'mse': np.mean((measured_prob - theory_prob) ** 2, axis=1),
+                    'max_prob': np.max(measured_prob, axis=1)
+                }),
+                **self._ensemble_fit(functools.partial(self._rabi_fit, time), (measured_prob,), fit_members)
+            },
+            'metadata': {
+                'ensemble_size': ensemble_size,
+                'total_measurements': time_steps * ensemble_size,
+                'total_shots': shots * time_steps * ensemble_size
+            }
+        }
+    
+    def stream_rabi_data(self, omega: float, time_max: float, time_steps: int,
+                         noise_rate: float, shots: int, seed: int = None,
+                         format: str = 'records', chunk_size: int = 10000,
+                         engine: str = 'analytic', t1: float = None, t2: float = None,
+                         noise_model: List[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """Generate Rabi oscillation data chunk by chunk.
+
+        Yields a header record, one record per chunk of `chunk_size` points and a
+        trailing statistics record. Memory stays bounded by the chunk size, and
+        the statistics are accumulated as the chunks go by; each chunk carries
+        them so far under `running`. Correlated noise spans the whole trace, so
+        with a noise_model it is drawn once up front (one float per point).
+        """
+        rng = self._make_rng(seed)
+        noise_model = parse_model(noise_model)
+        correlated = self._correlated_noise(rng, noise_model, (time_steps,), np.linspace(0, time_max, time_steps))
         
-        measurements_t1 = []
-        measurements_t2 = []
+        yield {
+            'type': 'header',
+            'experiment_type': 'rabi_oscillation',
+            'parameters': {
+                'omega': omega,
+                'time_max': time_max,
+                'time_steps': time_steps,
+                'noise_rate': noise_rate,
+                'shots': shots,
+                'seed': seed,
+                'engine': engine,
+                't1': t1,
+                't2': t2,
+                'noise_model': noise_model
+            }
+        }
         
-        for i, t in enumerate(time):
-            # T1 measurements
-            prob_t1 = np.clip(t1_decay[i] + self.rng.normal(0, noise_rate), 0, 1)
-            ones_t1 = self.rng.binomial(shots, prob_t1)
+        squared_error = 0.0
+        max_prob = 0.0
+        # Keep the points the final fit runs on (the same strided subset generate_rabi_data fits)
+        stride = fit_stride(time_steps)
+        fit_time, fit_prob = [], []
+        for start in range(0, time_steps, chunk_size):
+            stop = min(start + chunk_size, time_steps)
+            time = self._time_slice(time_max, time_steps, start, stop)
+            columns = self._rabi_columns(rng, time, omega, time_max, noise_rate, shots,
+                                         engine=engine, t1=t1, t2=t2,
+                                         correlated=None if correlated is None else correlated[start:stop])
             
-            measurements_t1.append({
-                'time': float(t),
-                'theory_signal': float(t1_decay[i]),
-                'measured_signal': float(ones_t1 / shots),
-                'ones_count': int(ones_t1),
-                'zeros_count': int(shots - ones_t1)
-            })
+            squared_error += np.sum((columns['measured_prob'] - columns['theory_prob']) ** 2)
+            max_prob = max(max_prob, np.max(columns['measured_prob']))
+            offset = -start % stride
+            fit_time.append(time[offset::stride])
+            fit_prob.append(columns['measured_prob'][offset::stride])
             
-            # T2 measurements (coherence)
-            signal_t2 = (t2_oscillation[i] + 1) / 2  # Normalize to [0,1]
-            prob_t2 = np.clip(signal_t2 + self.rng.normal(0, noise_rate), 0, 1)
-            ones_t2 = self.rng.binomial(shots, prob_t2)
-            
-            measurements_t2.append({
-                'time': float(t),
-                'theory_signal': float(signal_t2),
-                'measured_signal': float(ones_t2 / shots),
-                'ones_count': int(ones_t2),
-                'zeros_count': int(shots - ones_t2)
-            })
+            yield {
+                'type': 'measurements',
+                'start': start,
+                'measurements': self._format_columns(columns, format),
+                'running': {
+                    'points': stop,
+                    'mse': float(squared_error / stop),
+                    'max_prob': float(max_prob)
+                }
+            }
         
-        return {
+        yield {
+            'type': 'statistics',
+            'statistics': {
+                'mse': float(squared_error / max(time_steps, 1)),
+                'max_prob': float(max_prob),
+                'oscillation_period': float(2 * np.pi / omega),
+                **{
+                    name: float(value[0])
+                    for name, value in self._rabi_fit(np.concatenate(fit_time), np.concatenate(fit_prob)).items()
+                }
+            },
+            'metadata': {
+                'total_measurements': time_steps,
+                'total_shots': shots * time_steps
+            }
+        }
+    
+    def decay_arrays(self, t1: float, t2: float, time_max: float, time_steps: int,
+                     noise_rate: float, shots: int, seed: int = None,
+                     draw_order: str = 'vectorized', per_shot: bool = False,
+                     engine: str = 'analytic', noise_model: List[Dict[str, Any]] = None) -> Dict[str, Dict[str, np.ndarray]]:
+        """Generate T1 and T2 measurement columns as NumPy arrays (see rabi_arrays for the options)"""
+        rng = self._make_rng(seed, draw_order)
+        
+        time = np.linspace(0, time_max, time_steps)
+        correlated = self._correlated_noise(rng, noise_model, (2, time_steps), time)
+        return self._decay_columns(rng, time, t1, t2, noise_rate, shots, draw_order, per_shot, engine, correlated)
+    
+    def _decay_curve(self, time: np.ndarray, t1: float, t2: float, engine: str = 'analytic') -> np.ndarray:
+        """Ideal T1 and T2 signals from the chosen engine, stacked as (2, points)"""
+        if engine == 'analytic':
+            return self._decay_theory(t1, t2, time)
+        if engine == 'statevector':
+            return self._decay_circuit(t1, t2, time)
+        if engine == 'lindblad':
+            return self._decay_lindblad(t1, t2, time)
+        raise ValueError(f"Unknown engine '{engine}'")
+    
+    def _decay_columns(self, rng, time: np.ndarray, t1: float, t2: float, noise_rate: float,
+                       shots: int, draw_order: str = 'vectorized', per_shot: bool = False,
+                       engine: str = 'analytic', correlated: np.ndarray = None) -> Dict[str, Dict[str, np.ndarray]]:
+        """T1 and T2 measurement columns for the given time points, with `correlated` (2, points) model noise"""
+        # Both channels share one (2, time_steps) buffer: row 0 is T1, row 1 is T2
+        theory = self._decay_curve(time, t1, t2, engine)
+        
+        # 'vectorized' draws every T1 and T2 sample in one pass over the stacked
+        # buffer; 'interleaved' keeps the original T1, T2, T1, ... order
+        if per_shot:
+            if draw_order != 'vectorized':
+                raise ValueError("per_shot output needs draw_order='vectorized'")
+            ones_count, packed = self._sample_shots(rng, theory, noise_rate, shots, correlated)
+        else:
+            ones_count = self._sample_counts(rng, theory, noise_rate, shots, draw_order, correlated)
+        measured = ones_count / shots
+        zeros_count = shots - ones_count
+        
+        channels = {
+            channel: {
+                'time': time,
+                'theory_signal': theory[row],
+                'measured_signal': measured[row],
+                'ones_count': ones_count[row],
+                'zeros_count': zeros_count[row]
+            }
+            for row, channel in enumerate(('t1_decay', 't2_coherence'))
+        }
+        if per_shot:
+            for row, columns in enumerate(channels.values()):
+                columns['shots_packed'] = packed[row]
+        return channels
+    
+    def generate_decay_data(self, t1: float, t2: float, time_max: float, time_steps: int,
+                           noise_rate: float, shots: int, seed: int = None,
+                           draw_order: str = 'vectorized', format: str = 'records',
+                           per_shot: bool = False, engine: str = 'analytic',
+                           ensemble_size: int = 1, ensemble_raw: bool = False,
+                           noise_model: List[Dict[str, Any]] = None,
+                           ensemble_fit: bool = False) -> Dict[str, Any]:
+        """Generate T1/T2 decay synthetic data; ensemble_size > 1 returns an ensemble summary"""
+        noise_model = parse_model(noise_model)
+        if ensemble_size > 1:
+            self._check_ensemble(draw_order, per_shot)
+            return self._decay_ensemble(t1, t2, time_max, time_steps, noise_rate, shots, seed,
+                                        format, engine, ensemble_size, ensemble_raw, noise_model,
+                                        ensemble_fit)
+        rng = self._make_rng(seed, draw_order)
+        channels = self.decay_arrays(t1, t2, time_max, time_steps, noise_rate, shots,
+                                     seed=rng, draw_order=draw_order, per_shot=per_shot,
+                                     engine=engine, noise_model=noise_model)
+        if per_shot:
+            shots_blocks = {
+                channel: self._pop_shots(columns, shots, format)
+                for channel, columns in channels.items()
+            }
+        
+        data = {
             'experiment_type': 't1_t2_decay',
             'parameters': {
                 't1': t1,
@@ -339,89 +948,293 @@ class QuantumSimulator:
                 'time_steps': time_steps,
                 'noise_rate': noise_rate,
                 'shots': shots,
-                'seed': seed
+                'seed': seed,
+                'engine': engine,
+                'noise_model': noise_model
             },
             'measurements': {
-                't1_decay': measurements_t1,
-                't2_coherence': measurements_t2
+                channel: self._format_columns(columns, format)
+                for channel, columns in channels.items()
             },
             'statistics': {
-                't1_fitted': float(t1 * (1 + self.rng.normal(0, 0.1))),
-                't2_fitted': float(t2 * (1 + self.rng.normal(0, 0.1)))
+                name: float(value[0])
+                for name, value in self._decay_fit(channels['t1_decay']['time'],
+                                                   channels['t1_decay']['measured_signal'],
+                                                   channels['t2_coherence']['measured_signal'],
+                                                   engine).items()
             },
             'metadata': {
                 'total_measurements': time_steps * 2,
                 'total_shots': shots * time_steps * 2
             }
         }
+        if per_shot:
+            data['shots'] = shots_blocks
+        return data
     
-    def generate_bell_data(self, noise_rate: float, shots: int, theta: float = 0.0, 
-                          seed: int = None) -> Dict[str, Any]:
-        """Generate Bell state measurement synthetic data"""
-        self.set_seed(seed)
+    def _decay_ensemble(self, t1: float, t2: float, time_max: float, time_steps: int, noise_rate: float,
+                        shots: int, seed: int, format: str, engine: str,
+                        ensemble_size: int, raw: bool, noise_model: List[Dict[str, Any]],
+                        fit_members: bool) -> Dict[str, Any]:
+        """T1/T2 ensemble drawn as one (2, ensemble_size, time_steps) matrix; see _rabi_ensemble"""
+        rng = self._make_rng(seed)
+        time = np.linspace(0, time_max, time_steps)
+        theory = self._decay_curve(time, t1, t2, engine)
+        correlated = self._correlated_noise(rng, noise_model, (2, ensemble_size, time_steps), time)
+        ones_count = self._sample_counts(rng, np.broadcast_to(theory[:, None], (2, ensemble_size, time_steps)),
+                                         noise_rate, shots, correlated=correlated)
+        measured = ones_count / shots
         
-        # Bell state measurement basis
-        bases = ['XX', 'XY', 'YX', 'YY']
-        measurements = {}
-        
-        # Theoretical Bell state correlations
-        theory_correlations = {
-            'XX': np.cos(theta),
-            'XY': np.cos(theta + np.pi/2),
-            'YX': np.cos(theta - np.pi/2),
-            'YY': np.cos(theta + np.pi)
+        channels = {
+            channel: {
+                'time': time,
+                'theory_signal': theory[row],
+                **self._ensemble_columns('measured_signal', measured[row], raw)
+            }
+            for row, channel in enumerate(('t1_decay', 't2_coherence'))
         }
+        return {
+            'experiment_type': 't1_t2_decay_ensemble',
+            'parameters': {
+                't1': t1,
+                't2': t2,
+                'time_max': time_max,
+                'time_steps': time_steps,
+                'noise_rate': noise_rate,
+                'shots': shots,
+                'seed': seed,
+                'engine': engine,
+                'noise_model': noise_model,
+                'ensemble_size': ensemble_size,
+                'ensemble_fit': fit_members
+            },
+            'measurements': {
+                channel: self._format_columns(columns, format)
+                for channel, columns in channels.items()
+            },
+            'statistics': self._ensemble_fit(functools.partial(self._decay_fit, time, engine=engine),
+                                             (measured[0], measured[1]), fit_members),
+            'metadata': {
+                'ensemble_size': ensemble_size,
+                'total_measurements': time_steps * 2 * ensemble_size,
+                'total_shots': shots * time_steps * 2 * ensemble_size
+            }
+        }
+    
+    def stream_decay_data(self, t1: float, t2: float, time_max: float, time_steps: int,
+                          noise_rate: float, shots: int, seed: int = None,
+                          format: str = 'records', chunk_size: int = 10000,
+                          engine: str = 'analytic', noise_model: List[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+        """Generate T1/T2 decay data chunk by chunk; see stream_rabi_data for the record layout"""
+        rng = self._make_rng(seed)
+        noise_model = parse_model(noise_model)
+        correlated = self._correlated_noise(rng, noise_model, (2, time_steps), np.linspace(0, time_max, time_steps))
         
-        total_correlation = 0
+        yield {
+            'type': 'header',
+            'experiment_type': 't1_t2_decay',
+            'parameters': {
+                't1': t1,
+                't2': t2,
+                'time_max': time_max,
+                'time_steps': time_steps,
+                'noise_rate': noise_rate,
+                'shots': shots,
+                'seed': seed,
+                'engine': engine,
+                'noise_model': noise_model
+            }
+        }
         
-        for basis in bases:
-            # Theoretical correlation for this basis
-            theory_corr = theory_correlations[basis]
-            
-            # Add noise to correlation
-            noisy_corr = theory_corr + self.rng.normal(0, noise_rate)
-            noisy_corr = np.clip(noisy_corr, -1, 1)
-            
-            # Generate correlated measurements
-            prob_same = (1 + noisy_corr) / 2  # Convert correlation to probability
-            
-            # Generate measurement outcomes
-            same_outcome_count = self.rng.binomial(shots, prob_same)
-            diff_outcome_count = shots - same_outcome_count
-            
-            # Distribute between 00+11 and 01+10
-            prob_00 = prob_11 = same_outcome_count / (2 * shots)
-            prob_01 = prob_10 = diff_outcome_count / (2 * shots)
-            
-            count_00 = self.rng.binomial(shots, prob_00)
-            count_11 = self.rng.binomial(shots, prob_11)
-            count_01 = self.rng.binomial(shots, prob_01)
-            count_10 = shots - count_00 - count_11 - count_01
+        squared_error = {'t1_decay': 0.0, 't2_coherence': 0.0}
+        stride = fit_stride(time_steps)
+        fit_time, fit_t1, fit_t2 = [], [], []
+        for start in range(0, time_steps, chunk_size):
+            stop = min(start + chunk_size, time_steps)
+            time = self._time_slice(time_max, time_steps, start, stop)
+            channels = self._decay_columns(rng, time, t1, t2, noise_rate, shots, engine=engine,
+                                           correlated=None if correlated is None else correlated[:, start:stop])
+            offset = -start % stride
+            fit_time.append(time[offset::stride])
+            fit_t1.append(channels['t1_decay']['measured_signal'][offset::stride])
+            fit_t2.append(channels['t2_coherence']['measured_signal'][offset::stride])
+            for channel, columns in channels.items():
+                squared_error[channel] += np.sum((columns['measured_signal'] - columns['theory_signal']) ** 2)
             
-            measured_corr = (count_00 + count_11 - count_01 - count_10) / shots
-            
-            measurements[basis] = {
-                'count_00': int(count_00),
-                'count_01': int(count_01),
-                'count_10': int(count_10),
-                'count_11': int(count_11),
-                'theory_correlation': float(theory_corr),
-                'measured_correlation': float(measured_corr)
+            yield {
+                'type': 'measurements',
+                'start': start,
+                'measurements': {
+                    channel: self._format_columns(columns, format)
+                    for channel, columns in channels.items()
+                },
+                'running': {
+                    'points': stop,
+                    't1_mse': float(squared_error['t1_decay'] / stop),
+                    't2_mse': float(squared_error['t2_coherence'] / stop)
+                }
             }
-            
-            total_correlation += abs(measured_corr)
+        
+        yield {
+            'type': 'statistics',
+            'statistics': {
+                name: float(value[0])
+                for name, value in self._decay_fit(np.concatenate(fit_time), np.concatenate(fit_t1),
+                                                   np.concatenate(fit_t2), engine).items()
+            },
+            'metadata': {
+                'total_measurements': time_steps * 2,
+                'total_shots': shots * time_steps * 2
+            }
+        }
+    
+    @staticmethod
+    def _ry(angle) -> np.ndarray:
+        """Single-qubit Y rotation matrices, stacked over the shape of `angle`"""
+        c, s = np.cos(np.asarray(angle) / 2), np.sin(np.asarray(angle) / 2)
+        return np.stack([np.stack([c, -s], axis=-1), np.stack([s, c], axis=-1)], axis=-2)
+    
+    @classmethod
+    def bell_probabilities(cls, theta, noise_rate=0.0) -> np.ndarray:
+        """Exact joint outcome probabilities of the Bell experiment.
+
+        The state (I x Ry(theta))|Phi+> goes through a depolarizing channel of
+        strength noise_rate, then each basis rotates both qubits onto its
+        measurement axes before a Z readout. theta and noise_rate broadcast; the
+        result has shape broadcast(theta, noise_rate).shape + (4 bases, 4 outcomes),
+        outcomes ordered 00, 01, 10, 11.
+        """
+        theta = np.asarray(theta, dtype=float)
+        noise_rate = np.clip(np.asarray(noise_rate, dtype=float), 0, 1)
+        
+        # Two-qubit amplitudes as (A, B) matrices, so a gate U on qubit B is psi @ U.T
+        phi_plus = np.eye(2) / np.sqrt(2)
+        psi = (phi_plus @ np.swapaxes(cls._ry(theta), -1, -2)).reshape(theta.shape + (4,))
+        rho = psi[..., :, None] * psi[..., None, :]
+        
+        # Basis change per setting: Ry(-angle) takes each measurement axis onto Z
+        rotations = np.stack([np.kron(cls._ry(-a), cls._ry(-b)) for a, b in cls.BELL_ANGLES])
+        probs = np.einsum('kij,...jl,kil->...ki', rotations, rho, rotations)
+        
+        # Depolarizing channel: mix towards the maximally mixed state, which reads out uniformly
+        keep = (1 - noise_rate)[..., None, None]
+        # Clip rounding residue (~1e-17 below zero) so the result is valid multinomial input
+        return np.clip(keep * probs + (1 - keep) / 4, 0, 1)
+    
+    @staticmethod
+    def _correlation(counts: np.ndarray) -> np.ndarray:
+        """<AB> from outcome counts or probabilities on a trailing 00/01/10/11 axis"""
+        return counts[..., 0] + counts[..., 3] - counts[..., 1] - counts[..., 2]
+    
+    def _bell_model(self, engine: str) -> Callable[..., np.ndarray]:
+        """Joint outcome probabilities function of the chosen engine"""
+        if engine == 'analytic':
+            return self.bell_probabilities
+        if engine == 'statevector':
+            return self._bell_circuit
+        raise ValueError(f"Unknown engine '{engine}'")
+    
+    def _bell_noisy(self, rng, probabilities: Callable[..., np.ndarray], theta: np.ndarray, noise_rate,
+                    noise_model: List[Dict[str, Any]]) -> np.ndarray:
+        """Noisy Bell outcome probabilities, with the noise model varying the depolarizing strength.
+
+        Model noise is added to noise_rate for each basis measurement, along the
+        acquisition order (every basis of the first theta, then the next, ...) with
+        one time unit per measurement, so drift and 1/f noise carry across a scan.
+        """
+        if not noise_model:
+            return probabilities(theta, noise_rate)
+        ideal = probabilities(theta)
+        sequence = ideal.shape[:-1]
+        steps = int(np.prod(sequence))
+        correlated = self._correlated_noise(rng, noise_model, (steps,), np.arange(steps, dtype=float))
+        rate = np.clip(np.expand_dims(noise_rate, -1) + correlated.reshape(sequence), 0, 1)[..., None]
+        # Depolarizing mixes towards the uniform outcome distribution, as in bell_probabilities
+        return (1 - rate) * ideal + rate / 4
+    
+    def bell_arrays(self, noise_rate: float, shots: int, theta=0.0,
+                    seed: int = None, per_shot: bool = False,
+                    engine: str = 'analytic', noise_model: List[Dict[str, Any]] = None) -> Dict[str, np.ndarray]:
+        """Generate Bell state measurement columns (one row per basis) as NumPy arrays.
+
+        `theta` may be an array: every column then gets a leading theta axis and the
+        whole scan is sampled in one multinomial call. With per_shot=True every shot
+        is drawn from the joint outcome distribution and the columns also hold
+        'shots_packed_a'/'shots_packed_b', the bit-packed results of each qubit.
+        """
+        rng = self._make_rng(seed)
+        theta = np.asarray(theta, dtype=float)
+        
+        # Bell state measurement basis
+        bases = np.array(self.BELL_BASES)
+        
+        probabilities = self._bell_model(engine)
+        theory_corr = self._correlation(probabilities(theta))
+        probs = self._bell_noisy(rng, probabilities, theta, noise_rate, parse_model(noise_model))
+        
+        if per_shot:
+            counts, packed_a, packed_b = self._sample_joint_shots(rng, probs.reshape(-1, 4), shots)
+            counts = counts.reshape(probs.shape)
+            packed_a = packed_a.reshape(probs.shape[:-1] + (-1,))
+            packed_b = packed_b.reshape(probs.shape[:-1] + (-1,))
+        else:
+            # One multinomial draw per basis (and theta) gives all four joint counts
+            counts = rng.multinomial(shots, probs)
+        
+        count_00, count_01, count_10, count_11 = np.moveaxis(counts, -1, 0)
+        
+        columns = {
+            'basis': bases,
+            'count_00': count_00,
+            'count_01': count_01,
+            'count_10': count_10,
+            'count_11': count_11,
+            'theory_correlation': theory_corr,
+            'measured_correlation': self._correlation(counts) / shots
+        }
+        if per_shot:
+            columns['shots_packed_a'] = packed_a
+            columns['shots_packed_b'] = packed_b
+        return columns
+    
+    def generate_bell_data(self, noise_rate: float, shots: int, theta: float = 0.0, 
+                          seed: int = None, format: str = 'records',
+                          per_shot: bool = False, engine: str = 'analytic',
+                          ensemble_size: int = 1, ensemble_raw: bool = False,
+                          noise_model: List[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Generate Bell state measurement synthetic data; ensemble_size > 1 returns an ensemble summary"""
+        noise_model = parse_model(noise_model)
+        if ensemble_size > 1:
+            self._check_ensemble('vectorized', per_shot)
+            return self._bell_ensemble(noise_rate, shots, theta, seed, format, engine,
+                                       ensemble_size, ensemble_raw, noise_model)
+        columns = self.bell_arrays(noise_rate, shots, theta=theta, seed=seed, per_shot=per_shot,
+                                   engine=engine, noise_model=noise_model)
+        shots_block = self._pop_shots(columns, shots, format) if per_shot else None
+        bases = columns['basis'].tolist()
+        correlations = dict(zip(bases, columns['measured_correlation'].tolist()))
+        total_correlation = np.sum(np.abs(columns['measured_correlation']))
+        
+        if format == 'records':
+            measurements = {
+                record.pop('basis'): record for record in self._to_records(columns)
+            }
+        else:
+            measurements = self._format_columns(columns, format)
         
         # CHSH inequality parameter
-        chsh_value = abs(measurements['XX']['measured_correlation'] - measurements['XY']['measured_correlation']) + \
-                    abs(measurements['YX']['measured_correlation'] + measurements['YY']['measured_correlation'])
+        chsh_value = abs(correlations['XX'] - correlations['XY']) + \
+                    abs(correlations['YX'] + correlations['YY'])
         
-        return {
+        data = {
             'experiment_type': 'bell_state',
             'parameters': {
                 'noise_rate': noise_rate,
                 'shots': shots,
                 'theta': theta,
-                'seed': seed
+                'seed': seed,
+                'engine': engine,
+                'noise_model': noise_model
             },
             'measurements': measurements,
             'statistics': {
@@ -434,3 +1247,176 @@ class QuantumSimulator:
                 'total_shots': shots * len(bases)
             }
         }
+        if per_shot:
+            data['shots'] = shots_block
+        return data
+    
+    def _bell_ensemble(self, noise_rate: float, shots: int, theta: float, seed: int, format: str,
+                       engine: str, ensemble_size: int, raw: bool, noise_model: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Bell ensemble: one multinomial draw over an (ensemble_size, bases) grid; see _rabi_ensemble"""
+        rng = self._make_rng(seed)
+        probabilities = self._bell_model(engine)
+        theory_corr = self._correlation(probabilities(theta))
+        # Realizations are measured one after another, so model noise runs across all of them
+        probs = self._bell_noisy(rng, probabilities, np.full(ensemble_size, float(theta)), noise_rate, noise_model)
+        counts = rng.multinomial(shots, probs)
+        measured_corr = self._correlation(counts) / shots
+        chsh_value = np.abs(measured_corr[:, 0] - measured_corr[:, 1]) + \
+                     np.abs(measured_corr[:, 2] + measured_corr[:, 3])
+        
+        columns = {
+            'basis': np.array(self.BELL_BASES),
+            'theory_correlation': theory_corr,
+            **self._ensemble_columns('measured_correlation', measured_corr, raw)
+        }
+        if format == 'records':
+            measurements = {
+                record.pop('basis'): record for record in self._to_records(columns)
+            }
+        else:
+            measurements = self._format_columns(columns, format)
+        
+        statistics = self._ensemble_statistics({
+            'chsh_value': chsh_value,
+            'total_correlation': np.sum(np.abs(measured_corr), axis=1)
+        })
+        return {
+            'experiment_type': 'bell_state_ensemble',
+            'parameters': {
+                'noise_rate': noise_rate,
+                'shots': shots,
+                'theta': theta,
+                'seed': seed,
+                'engine': engine,
+                'noise_model': noise_model,
+                'ensemble_size': ensemble_size
+            },
+            'measurements': measurements,
+            'statistics': {
+                **statistics,
+                'violation': statistics['chsh_value'] > 2.0,
+                # Share of realizations that violate the CHSH bound on their own
+                'violation_rate': float(np.mean(chsh_value > 2.0))
+            },
+            'metadata': {
+                'ensemble_size': ensemble_size,
+                'total_measurements': len(self.BELL_BASES) * ensemble_size,
+                'total_shots': shots * len(self.BELL_BASES) * ensemble_size
+            }
+        }
+    
+    def generate_sweep_data(self, experiment: str, sweep: Dict[str, np.ndarray],
+                            seed: int = None, **params) -> Dict[str, Any]:
+        """Generate one experiment over a grid of one or two swept parameters"""
+        names = list(sweep)
+        allowed = self.SWEEP_PARAMETERS[experiment]
+        if not 1 <= len(names) <= 2 or any(name not in allowed for name in names):
+            raise ValueError(f"{experiment} sweeps take one or two of {', '.join(allowed)}")
+        
+        rng = self._make_rng(seed)
+        params = dict(params, noise_model=parse_model(params.get('noise_model')))
+        noise_model = params['noise_model']
+        
+        # Flatten the parameter grid into rows; each swept value becomes a (rows, 1) column
+        mesh = np.meshgrid(*(np.asarray(sweep[name], dtype=float) for name in names), indexing='ij')
+        grid = {name: values.ravel() for name, values in zip(names, mesh)}
+        rows = mesh[0].size
+        values = dict(params, **{name: column[:, None] for name, column in grid.items()})
+        noise_rate = values['noise_rate']
+        shots = params['shots']
+        
+        if experiment == 'rabi':
+            time = np.linspace(0, params['time_max'], params['time_steps'])
+            theory_prob = np.broadcast_to(
+                self._rabi_theory(values['omega'], time, params['time_max']), (rows, time.size)
+            )
+            correlated = self._correlated_noise(rng, noise_model, theory_prob.shape, time)
+            ones_count = self._sample_counts(rng, theory_prob, noise_rate, shots, correlated=correlated)
+            measured_prob = ones_count / shots
+            
+            axes = {'time': time}
+            measurements = {
+                'theory_prob': theory_prob,
+                'measured_prob': measured_prob,
+                'ones_count': ones_count
+            }
+            statistics = {
+                'mse': np.mean((measured_prob - theory_prob) ** 2, axis=1),
+                'max_prob': np.max(measured_prob, axis=1),
+                'oscillation_period': np.broadcast_to(2 * np.pi / values['omega'], (rows, 1))[:, 0],
+                **self._rabi_fit(time, measured_prob)
+            }
+            experiment_type = 'rabi_oscillation_sweep'
+            points_per_row = time.size
+        
+        elif experiment == 'decay':
+            time = np.linspace(0, params['time_max'], params['time_steps'])
+            theory = np.broadcast_to(
+                self._decay_theory(values['t1'], values['t2'], time), (2, rows, time.size)
+            )
+            correlated = self._correlated_noise(rng, noise_model, theory.shape, time)
+            ones_count = self._sample_counts(rng, theory, noise_rate, shots, correlated=correlated)
+            measured = ones_count / shots
+            
+            axes = {'time': time}
+            measurements = {
+                channel: {
+                    'theory_signal': theory[row],
+                    'measured_signal': measured[row],
+                    'ones_count': ones_count[row]
+                }
+                for row, channel in enumerate(('t1_decay', 't2_coherence'))
+            }
+            statistics = self._decay_fit(time, measured[0], measured[1])
+            experiment_type = 't1_t2_decay_sweep'
+            points_per_row = 2 * time.size
+        
+        elif experiment == 'bell':
+            theta = np.broadcast_to(values['theta'], (rows, 1))[:, 0]
+            theory_corr = self._correlation(self.bell_probabilities(theta))
+            probs = self._bell_noisy(rng, self.bell_probabilities, theta,
+                                     np.broadcast_to(noise_rate, (rows, 1))[:, 0], noise_model)
+            counts = rng.multinomial(shots, probs)
+            count_00, count_01, count_10, count_11 = np.moveaxis(counts, -1, 0)
+            measured_corr = self._correlation(counts) / shots
+            
+            # CHSH inequality parameter per row
+            chsh_value = np.abs(measured_corr[:, 0] - measured_corr[:, 1]) + \
+                         np.abs(measured_corr[:, 2] + measured_corr[:, 3])
+            
+            axes = {'basis': np.array(self.BELL_BASES)}
+            measurements = {
+                'count_00': count_00,
+                'count_01': count_01,
+                'count_10': count_10,
+                'count_11': count_11,
+                'theory_correlation': theory_corr,
+                'measured_correlation': measured_corr
+            }
+            statistics = {
+                'chsh_value': chsh_value,
+                'violation': chsh_value > 2.0,
+                'total_correlation': np.sum(np.abs(measured_corr), axis=1)
+            }
+            experiment_type = 'bell_state_sweep'
+            points_per_row = len(self.BELL_BASES)
+        
+        else:
+            raise ValueError(f"Unknown experiment '{experiment}'")
+        
+        return {
+            'experiment_type': experiment_type,
+            'parameters': dict(params, seed=seed, sweep={
+                name: {'start': float(sweep[name][0]), 'stop': float(sweep[name][-1]), 'num': len(sweep[name])}
+                for name in names
+            }),
+            'grid': dict(grid, **axes),
+            'measurements': measurements,
+            'statistics': statistics,
+            'metadata': {
+                'rows': rows,
+                'grid_shape': [len(sweep[name]) for name in names],
+                'total_measurements': rows * points_per_row,
+                'total_shots': shots * rows * points_per_row
+            }
+        }
@@ -0,0 +1,35 @@
+import json
+from typing import Any
+
+import numpy as np
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # Falls back to the standard library encoder
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Encode what the fast path can't: non-contiguous or string arrays and NumPy scalars"""
+    if isinstance(obj, np.ndarray):
+        if orjson is not None and obj.dtype.kind in "biuf" and not obj.flags.c_contiguous:
+            return np.ascontiguousarray(obj)
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to JSON bytes, writing NumPy arrays natively without going through Python lists"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, default=_default).encode()
+
+
+class NumpyJSONResponse(JSONResponse):
+    """JSON response rendered with `dumps`, so handlers can return NumPy arrays directly"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,152 @@
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+# Amplitudes touched per einsum call; bounds the temporary memory of a gate application
+CHUNK_SIZE = 1 << 20
+
+# Qubits are numbered big-endian: qubit 0 is the most significant bit of a basis index,
+# so for two qubits the outcomes read 00, 01, 10, 11 as (qubit 0, qubit 1)
+
+
+def rx(angle) -> np.ndarray:
+    """X rotation(s), stacked over the shape of `angle`"""
+    c, s = np.cos(np.asarray(angle) / 2), np.sin(np.asarray(angle) / 2)
+    return np.stack([np.stack([c, -1j * s], axis=-1), np.stack([-1j * s, c], axis=-1)], axis=-2)
+
+
+def ry(angle) -> np.ndarray:
+    """Y rotation(s), stacked over the shape of `angle`"""
+    c, s = np.cos(np.asarray(angle) / 2), np.sin(np.asarray(angle) / 2)
+    return np.stack([np.stack([c, -s], axis=-1), np.stack([s, c], axis=-1)], axis=-2).astype(complex)
+
+
+def rz(angle) -> np.ndarray:
+    """Z rotation(s), stacked over the shape of `angle`"""
+    phase = np.exp(0.5j * np.asarray(angle))
+    zero = np.zeros_like(phase)
+    return np.stack([np.stack([phase.conj(), zero], axis=-1), np.stack([zero, phase], axis=-1)], axis=-2)
+
+
+X = np.array([[0, 1], [1, 0]], dtype=complex)
+H = np.array([[1, 1], [1, -1]], dtype=complex) / np.sqrt(2)
+CNOT = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]], dtype=complex)
+
+
+def controlled(gate) -> np.ndarray:
+    """Controlled version of a (stack of) single-qubit gate(s); the control is the first qubit"""
+    gate = np.asarray(gate)
+    out = np.zeros(gate.shape[:-2] + (4, 4), dtype=complex)
+    out[..., 0, 0] = out[..., 1, 1] = 1
+    out[..., 2:, 2:] = gate
+    return out
+
+
+def amplitude_damping(gamma) -> np.ndarray:
+    """Two-qubit dilation of amplitude damping on (system, ancilla).
+
+    With the ancilla starting in |0>, the system decays |1> -> |0> with probability
+    `gamma` and the excitation moves to the ancilla; tracing the ancilla out gives the
+    usual amplitude-damping channel.
+    """
+    gamma = np.asarray(gamma, dtype=float)
+    keep, leak = np.sqrt(1 - gamma), np.sqrt(gamma)
+    out = np.zeros(gamma.shape + (4, 4), dtype=complex)
+    out[..., 0, 0] = out[..., 3, 3] = 1
+    out[..., 2, 2] = out[..., 1, 1] = keep
+    out[..., 1, 2] = leak
+    out[..., 2, 1] = -leak
+    return out
+
+
+class Statevector:
+    """Pure state of `num_qubits` qubits, optionally a batch of independent states.
+
+    Amplitudes live in one (batch, 2**num_qubits) array. Gates are applied in place by
+    viewing that array as a (batch, 2, 2, ..., 2) tensor and contracting the gate with
+    the target axes chunk by chunk, so no 2**n x 2**n matrix and no second copy of the
+    state is ever built. complex64 halves the memory for 25-26 qubits.
+    """
+
+    def __init__(self, num_qubits: int, batch_size: int = 1, dtype=np.complex128):
+        self.num_qubits = num_qubits
+        self.batch_size = batch_size
+        self.data = np.zeros((batch_size, 1 << num_qubits), dtype=dtype)
+        self.data[:, 0] = 1
+
+    def apply(self, gate, qubits: Sequence[int]) -> "Statevector":
+        """Apply a 2**k x 2**k gate to `qubits` (in gate order), in place.
+
+        `gate` may carry a leading batch axis to apply a different gate to every state.
+        """
+        qubits = tuple(qubits)
+        n, k = self.num_qubits, len(qubits)
+        gate = np.asarray(gate, dtype=self.data.dtype)
+        tensor = self.data.reshape((self.batch_size,) + (2,) * n)
+
+        # Loop over the most significant untouched qubits so each update sees at
+        # most CHUNK_SIZE amplitudes
+        free = [q for q in range(n) if q not in qubits]
+        loop, size = [], self.data.size
+        while size > CHUNK_SIZE and free:
+            loop.append(free.pop(0))
+            size //= 2
+        remaining = [q for q in range(n) if q not in loop]
+        targets = [remaining.index(q) + 1 for q in qubits]
+        if gate.ndim == 3:
+            # One gate per state: coefficients broadcast against the batch axis of each slice
+            gate = gate.reshape((self.batch_size,) + (1,) * (len(remaining) - k) + gate.shape[1:])
+        outcomes = list(np.ndindex(*(2,) * k))
+
+        for index in np.ndindex(*(2,) * len(loop)):
+            selector = [slice(None)] * (n + 1)
+            for q, i in zip(loop, index):
+                selector[q + 1] = i
+            # Target axes first: slices[j] is the view where the targets read outcome j
+            chunk = np.moveaxis(tensor[tuple(selector)], targets, list(range(k)))
+            slices = [chunk[bits] for bits in outcomes]
+            old = [s.copy() for s in slices]
+            for i, s in enumerate(slices):
+                s[...] = 0
+                for j, amplitude in enumerate(old):
+                    coefficient = gate[..., i, j]
+                    if np.any(coefficient):
+                        s += coefficient * amplitude
+        return self
+
+    def probabilities(self, qubits: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Outcome probabilities per state, marginalized onto `qubits` (all qubits by default)"""
+        probs = self.data.real ** 2 + self.data.imag ** 2
+        if qubits is None:
+            return probs
+        qubits = tuple(qubits)
+        tensor = probs.reshape((self.batch_size,) + (2,) * self.num_qubits)
+        other = tuple(q + 1 for q in range(self.num_qubits) if q not in qubits)
+        marginal = tensor.sum(axis=other)
+        # Summing keeps the qubit axes in ascending order; put them in the requested order
+        rank = np.argsort(np.argsort(qubits))
+        return marginal.transpose((0,) + tuple(rank + 1)).reshape(self.batch_size, -1)
+
+    def sample(self, rng, shots: int) -> np.ndarray:
+        """Draw `shots` basis-state indices per state in one pass.
+
+        All cumulative distributions are laid end to end (row i spans [i, i + 1]) so a
+        single searchsorted locates every shot of every state.
+        """
+        cumulative = np.cumsum(self.probabilities(), axis=1, dtype=np.float64)
+        cumulative /= cumulative[:, -1:]
+        offsets = np.arange(self.batch_size)[:, None]
+        cumulative += offsets
+        u = rng.random((self.batch_size, shots)) + offsets
+        indices = np.searchsorted(cumulative.ravel(), u.ravel(), side='right').reshape(u.shape)
+        return np.minimum(indices - offsets * cumulative.shape[1], cumulative.shape[1] - 1)
+
+    def sample_counts(self, rng, shots: int, qubits: Optional[Sequence[int]] = None) -> np.ndarray:
+        """Outcome counts of `shots` measurements per state (same distribution as counting sample())"""
+        probs = self.probabilities(qubits)
+        return rng.multinomial(shots, probs / probs.sum(axis=1, keepdims=True))
+
+
+def bits(indices: np.ndarray, num_qubits: int, qubits: Sequence[int]) -> Tuple[np.ndarray, ...]:
+    """Per-qubit outcome bits of sampled basis-state indices"""
+    return tuple((indices >> (num_qubits - 1 - q)) & 1 for q in qubits)
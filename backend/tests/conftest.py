@@ -0,0 +1,22 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Backend modules import each other by their flat names
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Settings are read at import, so the stores must point somewhere disposable before main is loaded
+_scratch = tempfile.mkdtemp(prefix="qp-tests-")
+os.environ.setdefault("QP_DATASET_DIR", os.path.join(_scratch, "datasets"))
+os.environ.setdefault("QP_JOB_DIR", os.path.join(_scratch, "jobs"))
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    import main
+    with TestClient(main.app) as client:
+        yield client
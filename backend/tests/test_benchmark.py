@@ -0,0 +1,46 @@
+import json
+
+import benchmark
+
+
+def result(time_min, peak_bytes):
+    return {"time_min": time_min, "time_median": time_min, "peak_bytes": peak_bytes}
+
+
+def test_compare_flags_time_and_memory_regressions():
+    baseline = {"a": result(1.0, 1000), "b": result(1.0, 1000), "c": result(0.001, 1000)}
+    current = {
+        "a": result(1.3, 1000),      # 30% slower
+        "b": result(1.1, 1200),      # within the time threshold, 20% more memory
+        "c": result(0.0015, 1000),   # 50% slower but only by 0.5 ms
+        "new": result(9.0, 10 ** 9),  # no baseline to compare with
+    }
+    regressions = benchmark.compare(current, baseline, threshold=0.25, memory_threshold=0.10, min_delta=0.002)
+    assert regressions == ["a: time +30%", "b: memory +20%"]
+
+
+def test_quick_cases_cover_every_generator_within_limit():
+    full, quick = benchmark.cases(), benchmark.cases(quick=True)
+    assert set(quick) < set(full)
+    assert {name.split("/")[0] for name in quick} == {"rabi", "decay", "bell"}
+    assert all(int(name.rsplit("e", 1)[1]) <= benchmark.QUICK_LIMIT for name in quick)
+
+
+def test_baseline_covers_every_case():
+    with open(benchmark.DEFAULT_BASELINE) as f:
+        stored = json.load(f)
+    assert set(benchmark.cases()) <= set(stored["results"])
+
+
+def test_save_then_compare_round_trip(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    args = ["--baseline", str(baseline), "--quick", "-k", "bell/shots=1e2", "--repeat", "1"]
+
+    assert benchmark.main(args + ["--save"]) == 0
+    stored = json.loads(baseline.read_text())
+    assert list(stored["results"]) == ["bell/shots=1e2"]
+    assert stored["environment"] == benchmark.environment()
+
+    # Comparing against itself with a generous threshold finds no regression
+    assert benchmark.main(args + ["--threshold", "10", "--memory-threshold", "10"]) == 0
+    assert "bell/shots=1e2" in capsys.readouterr().out
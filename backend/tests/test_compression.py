@@ -0,0 +1,89 @@
+import gzip
+import json
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import Response, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from compression import CompressionMiddleware, choose_encoding
+
+zstandard = pytest.importorskip("zstandard")
+
+BODY = json.dumps([{"time": i / 10, "measured_prob": (i % 7) / 7} for i in range(2000)]).encode()
+
+
+def decompress(encoding, body):
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+
+
+async def full(request):
+    return Response(BODY, media_type="application/json")
+
+
+async def tiny(request):
+    return Response(b"{}", media_type="application/json")
+
+
+async def stream(request):
+    async def lines():
+        for start in range(0, len(BODY), 4096):
+            yield BODY[start:start + 4096]
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+@pytest.fixture(scope="module")
+def raw_client():
+    app = Starlette(routes=[Route("/full", full), Route("/tiny", tiny), Route("/stream", stream)])
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    # Undecoded bodies, so the test sees exactly what went over the wire
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip", "gzip"),
+    ("gzip, zstd", "zstd"),
+    ("zstd;q=0, gzip", "gzip"),
+    ("*", "zstd"),
+    ("identity", None),
+    ("gzip;q=0", None),
+    ("", None),
+])
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header) == expected
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "zstd"])
+@pytest.mark.parametrize("path", ["/full", "/stream"])
+def test_round_trip(raw_client, encoding, path):
+    with raw_client.stream("GET", path, headers={"Accept-Encoding": encoding}) as response:
+        body = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == encoding
+    assert "accept-encoding" in response.headers["vary"].lower()
+    assert len(body) < len(BODY)
+    assert decompress(encoding, body) == BODY
+    if path == "/full":
+        assert int(response.headers["content-length"]) == len(body)
+
+
+def test_small_and_unnegotiated_bodies_pass_through(raw_client):
+    response = raw_client.get("/tiny", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.content == b"{}"
+
+    response = raw_client.get("/full", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.content == BODY
+
+
+def test_api_responses_decode(client):
+    params = {"time_steps": 2000, "seed": 1}
+    plain = client.post("/generate/rabi", json=params, headers={"Accept-Encoding": "identity"}).json()
+    for encoding in ("gzip", "zstd"):
+        response = client.post("/generate/rabi", json=params, headers={"Accept-Encoding": encoding})
+        assert response.headers["content-encoding"] == encoding
+        assert response.json() == plain
@@ -0,0 +1,45 @@
+import os
+
+import main
+
+
+def stored_bytes(directory):
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(directory) for name in names if name.endswith(".npy"))
+
+
+def test_unseeded_downsampled_requests_stay_within_budget(client, monkeypatch):
+    params = {"time_steps": 5000}
+    first = client.post("/generate/rabi", params={"max_points": 100}, json=params)
+    assert first.status_code == 200
+    size = main.datasets.describe(first.json()["data"]["resolution"]["dataset"])["bytes"]
+
+    # Room for two datasets of this size
+    monkeypatch.setattr(main.datasets, "max_bytes", 2 * size + size // 2)
+    ids = set()
+    for _ in range(6):
+        response = client.post("/generate/rabi", params={"max_points": 100}, json=params)
+        assert response.status_code == 200
+        ids.add(response.json()["data"]["resolution"]["dataset"])
+
+    assert len(ids) == 6
+    assert len(main.datasets.list()) <= 2
+    assert main.datasets.total_bytes <= main.datasets.max_bytes
+    assert stored_bytes(main.datasets.directory) <= main.datasets.max_bytes
+    # The most recent dataset is the one the last response points at, so it can still be zoomed into
+    latest = response.json()["data"]["resolution"]["dataset"]
+    assert client.get(f"/datasets/{latest}/slice", params={"stop": 10}).status_code == 200
+
+
+def test_store_reloads_within_budget(tmp_path):
+    store = main.DatasetStore(str(tmp_path))
+    for seed in range(3):
+        key = main.ResultCache.make_key("dataset/rabi", {"seed": seed})
+        store.register(main.build_dataset(store.directory, key, "rabi", main.simulator.generate_rabi_data,
+                                          dict(omega=1.0, time_max=10.0, time_steps=100, noise_rate=0.05,
+                                               shots=100, seed=seed)))
+    size = store.list()[0]["bytes"]
+
+    reloaded = main.DatasetStore(str(tmp_path), max_bytes=size)
+    assert [summary["id"] for summary in reloaded.list()] == [store.list()[-1]["id"]]
+    assert reloaded.evictions == 2
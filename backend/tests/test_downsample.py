@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from downsample import downsample_columns, lttb
+
+
+@pytest.mark.parametrize("size, num_points", [(10_000, 100), (1001, 3), (5000, 4999), (257, 50)])
+def test_lttb_keeps_endpoints_and_point_budget(size, num_points):
+    x = np.linspace(0, 10, size)
+    y = np.sin(x) + np.random.default_rng(0).normal(0, 0.1, size)
+    indices = lttb(x, y, num_points)
+
+    assert len(indices) == num_points
+    assert indices[0] == 0 and indices[-1] == size - 1
+    assert (np.diff(indices) > 0).all()
+
+
+def test_lttb_returns_everything_when_under_budget():
+    x = np.arange(10.0)
+    np.testing.assert_array_equal(lttb(x, x, 10), np.arange(10))
+    np.testing.assert_array_equal(lttb(x, x, 50), np.arange(10))
+    np.testing.assert_array_equal(lttb(x, x, 2), np.arange(10))
+
+
+def test_lttb_keeps_isolated_spikes():
+    x = np.arange(100_000.0)
+    y = np.zeros_like(x)
+    spikes = [12_345, 50_001, 87_654]
+    y[spikes] = [5.0, -3.0, 4.0]
+    indices = lttb(x, y, 200)
+    assert set(spikes) <= set(indices.tolist())
+    # Striding to the same budget would miss them
+    assert not set(spikes) & set(range(0, x.size, x.size // 200))
+
+
+def test_downsample_columns_keeps_channel_rows_aligned():
+    time = np.linspace(0, 1, 5000)
+    columns = {
+        "t1_decay.time": time,
+        "t1_decay.measured_signal": np.exp(-time),
+        "t1_decay.ones_count": np.arange(5000),
+        "t2_coherence.time": time,
+        "t2_coherence.measured_signal": np.cos(40 * time),
+        "t2_coherence.ones_count": np.arange(5000) * 2,
+    }
+    reduced = downsample_columns(columns, 100)
+
+    assert set(reduced) == set(columns)
+    for channel, factor in (("t1_decay", 1), ("t2_coherence", 2)):
+        kept = reduced[f"{channel}.ones_count"] // factor
+        assert len(kept) == 100
+        np.testing.assert_array_equal(reduced[f"{channel}.time"], time[kept])
+        np.testing.assert_array_equal(reduced[f"{channel}.measured_signal"], columns[f"{channel}.measured_signal"][kept])
+
+
+def test_downsample_columns_without_time_spreads_evenly():
+    reduced = downsample_columns({"value": np.arange(1000)}, 10)
+    assert len(reduced["value"]) == 10
+    assert reduced["value"][0] == 0 and reduced["value"][-1] == 999
+
+
+def test_downsampled_response_reports_resolution(client):
+    response = client.post("/generate/rabi", params={"max_points": 300, "format": "columnar"},
+                           json={"time_steps": 20_000, "seed": 5})
+    data = response.json()["data"]
+    assert len(data["measurements"]["time"]) == 300
+    assert data["resolution"]["total_points"] == 20_000
+    assert data["metadata"]["total_measurements"] == 20_000
+
+    full = client.get(data["resolution"]["slice_url"], params={"columns": "time"}).json()
+    assert full["rows"] == 20_000
+    assert set(data["measurements"]["time"]) <= set(full["columns"]["time"])
@@ -0,0 +1,35 @@
+import pytest
+
+import main
+
+
+@pytest.mark.parametrize("experiment, params", [
+    ("rabi", {"omega": 1.3, "time_steps": 50, "seed": 11}),
+    ("decay", {"t1": 4.0, "t2": 2.5, "time_steps": 50, "seed": 11}),
+])
+def test_interleaved_draw_order_reproduces_simulator(client, experiment, params):
+    response = client.post(f"/generate/{experiment}", params={"format": "columnar"},
+                           json=dict(params, draw_order="interleaved"))
+    assert response.status_code == 200
+    measurements = response.json()["data"]["measurements"]
+
+    defaults = main.PARAM_MODELS[experiment](**params).model_dump(
+        exclude={"per_shot", "ensemble_size", "ensemble_raw", "noise_model", "draw_order"})
+    expected = main.GENERATORS[experiment](**defaults, draw_order="interleaved", format="arrays")["measurements"]
+    counts = measurements["ones_count"] if experiment == "rabi" else measurements["t1_decay"]["ones_count"]
+    reference = expected["ones_count"] if experiment == "rabi" else expected["t1_decay"]["ones_count"]
+    assert counts == reference.tolist()
+
+    vectorized = client.post(f"/generate/{experiment}", params={"format": "columnar"}, json=params)
+    assert vectorized.json()["data"]["measurements"] != measurements
+
+
+def test_interleaved_draw_order_rejects_vectorized_only_options(client):
+    for extra in ({"per_shot": True}, {"ensemble_size": 4}, {"noise_model": [{"type": "white", "sigma": 0.01}]}):
+        response = client.post("/generate/rabi", json=dict(extra, draw_order="interleaved"))
+        assert response.status_code == 400
+    response = client.post("/stream/rabi", json={"draw_order": "interleaved"})
+    assert response.status_code == 400
+    response = client.post("/generate/rabi/sweep", json={"params": {"draw_order": "interleaved"},
+                                                         "sweep": {"omega": {"start": 1, "stop": 2, "num": 3}}})
+    assert response.status_code == 400
@@ -0,0 +1,35 @@
+import pytest
+
+# Experiment, fitted statistic, and the parameters it should recover
+CASES = [
+    ("rabi", "omega_fitted", {"omega": 1.8}, 1.8),
+    ("decay", "t1_fitted", {}, 5.0),
+]
+
+
+def ensemble(client, experiment, **params):
+    response = client.post(f"/generate/{experiment}", params={"format": "columnar"},
+                           json=dict(params, ensemble_size=200, seed=11))
+    assert response.status_code == 200
+    return response.json()["data"]
+
+
+@pytest.mark.parametrize("experiment,fitted,params,truth", CASES)
+def test_ensemble_fits_the_mean_trace_by_default(client, experiment, fitted, params, truth):
+    data = ensemble(client, experiment, **params)
+    statistics = data["statistics"]
+
+    assert data["parameters"]["ensemble_fit"] is False
+    assert statistics[fitted] == pytest.approx(truth, rel=0.1)
+    assert f"{fitted}_error" in statistics
+    assert f"{fitted}_std" not in statistics
+
+
+@pytest.mark.parametrize("experiment,fitted,params,truth", CASES)
+def test_ensemble_fit_spreads_over_realizations(client, experiment, fitted, params, truth):
+    mean_trace = ensemble(client, experiment, **params)["statistics"]
+    members = ensemble(client, experiment, ensemble_fit=True, **params)
+
+    assert members["parameters"]["ensemble_fit"] is True
+    assert members["statistics"][f"{fitted}_std"] > 0
+    assert members["statistics"][fitted] == pytest.approx(mean_trace[fitted], rel=0.05)
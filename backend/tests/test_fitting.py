@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from fitting import (MAX_FIT_POINTS, damped_cosine, exponential, fit_damped_cosine, fit_exponential, fit_rabi,
+                     fit_stride, levenberg_marquardt, rabi)
+from quantum_simulator import QuantumSimulator
+
+
+@pytest.mark.parametrize("model, params", [
+    (exponential, [0.8, 2.5, 0.1]),
+    (damped_cosine, [0.4, 6.0, 0.5, 0.3, 0.5]),
+    (rabi, [0.9, 1.3, 8.0]),
+])
+def test_jacobians_match_finite_differences(model, params):
+    x = np.linspace(0, 10, 50)
+    params = np.array([params])
+    _, jacobian = model(x, params)
+    for i in range(params.shape[1]):
+        step = np.zeros_like(params)
+        step[0, i] = 1e-6 * max(1.0, abs(params[0, i]))
+        numeric = (model(x, params + step)[0] - model(x, params - step)[0]) / (2 * step[0, i])
+        np.testing.assert_allclose(jacobian[..., i], numeric, atol=1e-6)
+
+
+def test_levenberg_marquardt_fits_each_row_independently():
+    x = np.linspace(0, 10, 200)
+    truth = np.array([[1.0, 2.0, 0.0], [0.5, 5.0, 0.2], [2.0, 0.7, -0.1]])
+    y, _ = exponential(x, truth)
+    result = levenberg_marquardt(exponential, x, y, np.tile([1.0, 1.0, 0.0], (3, 1)))
+
+    assert result['converged'].all()
+    np.testing.assert_allclose(result['params'], truth, rtol=1e-6, atol=1e-8)
+    assert (result['cost'] < 1e-12).all()
+
+
+def test_fit_exponential_recovers_parameters_with_errors():
+    rng = np.random.default_rng(4)
+    x = np.linspace(0, 15, 300)
+    y = 0.9 * np.exp(-x / 3.0) + 0.05 + rng.normal(0, 0.01, (20, x.size))
+    fit = fit_exponential(x, y)
+
+    assert np.abs(fit['params']['tau'] - 3.0).max() < 0.15
+    # Standard errors agree with the spread over noise realizations
+    assert fit['errors']['tau'].mean() == pytest.approx(fit['params']['tau'].std(), rel=0.5)
+
+
+def test_fit_damped_cosine_recovers_parameters():
+    x = np.linspace(0, 15, 400)
+    y = 0.5 + 0.45 * np.exp(-x / 4.0) * np.cos(2 * np.pi * 0.5 * x + 0.2)
+    y = y + np.random.default_rng(5).normal(0, 0.005, x.size)
+    params = fit_damped_cosine(x, y)['params']
+
+    assert params['tau'][0] == pytest.approx(4.0, rel=0.02)
+    assert params['frequency'][0] == pytest.approx(0.5, rel=1e-3)
+    assert params['offset'][0] == pytest.approx(0.5, abs=0.005)
+
+
+@pytest.mark.parametrize("omega", [1.0, 1.8, 2.5])
+def test_fit_rabi_recovers_frequency_and_decay(omega):
+    x = np.linspace(0, 10, 200)
+    y = np.exp(-x / 3.0) * np.sin(omega * x / 2) ** 2 + np.random.default_rng(6).normal(0, 0.01, x.size)
+    params = fit_rabi(x, y)['params']
+
+    assert params['omega'][0] == pytest.approx(omega, rel=0.02)
+    assert params['tau'][0] == pytest.approx(3.0, rel=0.1)
+
+
+def test_fit_stride_caps_points():
+    assert fit_stride(100) == 1
+    assert fit_stride(MAX_FIT_POINTS) == 1
+    assert 1_000_000 // fit_stride(1_000_000) <= MAX_FIT_POINTS
+
+
+@pytest.mark.parametrize("engine", ["analytic", "statevector", "lindblad"])
+def test_decay_fit_reports_t2_not_combined_rate(engine):
+    data = QuantumSimulator().generate_decay_data(5.0, 2.5, 15.0, 400, 0.01, 20000, seed=3, engine=engine)
+    statistics = data['statistics']
+
+    assert statistics['t1_fitted'] == pytest.approx(5.0, rel=0.05)
+    # The combined constant 1/(1/T1 + 1/T2) would be about 1.67
+    assert statistics['t2_fitted'] == pytest.approx(2.5, rel=0.05)
+    assert 0 < statistics['t2_fitted_error'] < 0.2
+
+
+def test_decay_fit_without_remaining_rate_is_nan():
+    time = np.linspace(0, 15, 200)
+    t1_signal = np.exp(-time / 5.0)
+    # Ramsey envelope slower than T1 alone leaves no positive T2 rate
+    t2_signal = (1 + np.exp(-time / 8.0) * np.cos(np.pi * time)) / 2
+    fit = QuantumSimulator._decay_fit(time, t1_signal, t2_signal)
+
+    assert np.isnan(fit['t2_fitted'][0])
+    assert fit['t1_fitted'][0] == pytest.approx(5.0, rel=1e-3)
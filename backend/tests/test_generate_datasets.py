@@ -0,0 +1,54 @@
+import json
+
+import numpy as np
+import pytest
+
+import generate_datasets
+
+
+def write_spec(tmp_path, **spec):
+    path = tmp_path / "spec.json"
+    path.write_text(json.dumps(spec))
+    return str(path)
+
+
+def test_missing_parameters_take_api_defaults(tmp_path):
+    spec = write_spec(tmp_path, experiment="rabi", count=3, seed=1, shard_size=2,
+                      params={"omega": {"uniform": [0.5, 3.0]}})
+    output = tmp_path / "out"
+    assert generate_datasets.main([spec, "--output", str(output), "--workers", "1"]) == 0
+
+    manifest = json.loads((output / "manifest.json").read_text())
+    parameters = manifest["datasets"][0]["parameters"]
+    assert (parameters["time_max"], parameters["time_steps"], parameters["noise_rate"]) == (10.0, 100, 0.1)
+    assert 0.5 <= parameters["omega"] <= 3.0
+    assert [shard["datasets"] for shard in manifest["shards"]] == [[0, 2], [2, 3]]
+
+
+def test_workers_do_not_change_output(tmp_path):
+    spec = write_spec(tmp_path, experiment="decay", count=4, seed=7, shard_size=1,
+                      params={"t1": {"uniform": [2, 6]}, "time_steps": 50})
+    digests = []
+    for workers in ("1", "2"):
+        output = tmp_path / f"out{workers}"
+        assert generate_datasets.main([spec, "--output", str(output), "--workers", workers]) == 0
+        digests.append([shard["sha256"] for shard in json.loads((output / "manifest.json").read_text())["shards"]])
+    assert digests[0] == digests[1]
+
+
+@pytest.mark.parametrize("params, message", [
+    ({"bogus": 1}, "unknown rabi parameters: bogus"),
+    ({"shots": "many"}, "invalid rabi parameters: shots"),
+    ({"seed": 3}, "'seed' cannot be set per dataset"),
+])
+def test_invalid_specs_fail_before_generation(tmp_path, params, message):
+    spec = write_spec(tmp_path, experiment="rabi", count=2, params=params)
+    with pytest.raises(ValueError, match=message):
+        generate_datasets.load_spec(spec, {})
+
+
+def test_dataset_seeds_match_spawn():
+    spawned = np.random.SeedSequence(42).spawn(5)
+    for index in (0, 3, 4):
+        direct = generate_datasets.dataset_seeds(42, index)
+        np.testing.assert_array_equal(direct.generate_state(4), spawned[index].generate_state(4))
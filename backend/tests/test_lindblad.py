@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from lindblad import SIGMA_MINUS, SIGMA_X, SIGMA_Z, evolve, expm, liouvillian, qubit_dissipators
+from quantum_simulator import QuantumSimulator
+
+
+def test_expm_matches_eigendecomposition():
+    rng = np.random.default_rng(0)
+    a = rng.normal(size=(4, 6, 6)) * np.array([0.1, 1.0, 10.0, 40.0])[:, None, None]
+    a = (a + np.swapaxes(a, -1, -2)) / 2
+    eigenvalues, vectors = np.linalg.eigh(a)
+    expected = (vectors * np.exp(eigenvalues)[..., None, :]) @ np.swapaxes(vectors, -1, -2)
+    np.testing.assert_allclose(expm(a), expected, rtol=1e-10, atol=1e-12 * np.abs(expected).max())
+
+
+def test_free_decay_matches_analytic_t1_and_t2():
+    t1, t2 = 5.0, 3.0
+    time = np.linspace(0, 20, 401)
+    generator = liouvillian(np.zeros((2, 2)), qubit_dissipators(t1, t2))
+
+    excited = evolve(generator, np.diag([0, 1]), time)
+    np.testing.assert_allclose(excited[:, 1, 1].real, np.exp(-time / t1), atol=1e-10)
+
+    coherent = evolve(generator, np.full((2, 2), 0.5), time)
+    np.testing.assert_allclose(coherent[:, 0, 1].real, 0.5 * np.exp(-time / t2), atol=1e-10)
+    np.testing.assert_allclose(np.trace(coherent, axis1=1, axis2=2).real, 1, atol=1e-12)
+
+
+def test_non_uniform_grid_matches_uniform_propagation():
+    generator = liouvillian(0.5 * 2.0 * SIGMA_X, [np.sqrt(0.2) * SIGMA_MINUS, np.sqrt(0.05) * SIGMA_Z])
+    uniform = np.linspace(0, 10, 101)
+    irregular = np.sort(np.random.default_rng(1).uniform(0, 10, 50))
+    rho0 = np.diag([1, 0]).astype(complex)
+
+    expected = expm(generator * irregular[:, None, None]) @ rho0.ravel()
+    np.testing.assert_allclose(evolve(generator, rho0, irregular).reshape(50, 4), expected, atol=1e-10)
+    expected = expm(generator * uniform[:, None, None]) @ rho0.ravel()
+    np.testing.assert_allclose(evolve(generator, rho0, uniform).reshape(101, 4), expected, atol=1e-10)
+
+
+def test_t2_is_capped_at_twice_t1():
+    # Relaxation alone already dephases at 1/(2 T1); no extra jump is added beyond it
+    assert len(qubit_dissipators(1.0, 5.0)) == 1
+    assert len(qubit_dissipators(1.0, 1.0)) == 2
+
+
+def test_undamped_rabi_matches_closed_form():
+    omega = 1.7
+    time = np.linspace(0, 10, 300)
+    rho = evolve(liouvillian(0.5 * omega * SIGMA_X), np.diag([1, 0]), time)
+    np.testing.assert_allclose(rho[:, 1, 1].real, np.sin(omega * time / 2) ** 2, atol=1e-10)
+
+
+@pytest.mark.parametrize("t1, t2", [(5.0, 3.0), (8.0, 2.0)])
+def test_decay_engine_matches_analytic_t1_curve(t1, t2):
+    time = np.linspace(0, 15, 200)
+    lindblad = QuantumSimulator._decay_lindblad(t1, t2, time)
+    analytic = QuantumSimulator._decay_theory(t1, t2, time)
+    np.testing.assert_allclose(lindblad[0], analytic[0], atol=1e-10)
+    # The Ramsey fringe precesses at the same detuning but its envelope decays at 1/T2
+    envelope = np.exp(-time / t2) * np.cos(np.pi * time)
+    np.testing.assert_allclose(lindblad[1], np.clip((1 + envelope) / 2, 0, 1), atol=1e-9)
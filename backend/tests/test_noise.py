@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from noise import colored, drift, parse_model, sample_model, telegraph
+from quantum_simulator import QuantumSimulator
+
+
+def test_parse_model_fills_defaults():
+    assert parse_model(None) == []
+    assert parse_model([{"type": "pink", "sigma": "0.1"}, {"type": "drift", "sigma": 0.2}]) == [
+        {"type": "pink", "exponent": 1.0, "sigma": 0.1},
+        {"type": "drift", "slope": 0.0, "sigma": 0.2},
+    ]
+
+
+@pytest.mark.parametrize("spec, message", [
+    ({"type": "pink"}, "must be a list"),
+    ([{"type": "violet", "sigma": 1}], "type must be one of"),
+    ([{"type": "white"}], "missing sigma"),
+    ([{"type": "white", "sigma": 1, "rate": 2}], "unknown parameters rate"),
+    ([{"type": "telegraph", "amplitude": 1, "rate": -1}], "rate must not be negative"),
+    ([{"type": "colored", "sigma": 1, "exponent": "steep"}], "exponent must be a number"),
+    ([{"type": "white", "sigma": float("inf")}], "sigma must be finite"),
+])
+def test_parse_model_rejects_invalid_specs(spec, message):
+    with pytest.raises(ValueError, match=message):
+        parse_model(spec)
+
+
+@pytest.mark.parametrize("exponent", [0.0, 1.0, 2.0])
+def test_colored_noise_has_requested_sigma_and_slope(exponent):
+    rng = np.random.default_rng(0)
+    time = np.linspace(0, 100, 4096)
+    noise = colored(rng, (400, time.size), time, 0.05, exponent)
+
+    assert noise.std() == pytest.approx(0.05, rel=0.1 if exponent < 2 else 0.3)
+    # Log-log slope of the averaged periodogram over the middle of the band
+    power = np.mean(np.abs(np.fft.rfft(noise, axis=1)) ** 2, axis=0)
+    frequency = np.fft.rfftfreq(time.size, time[1] - time[0])
+    band = slice(20, 400)
+    slope = np.polyfit(np.log(frequency[band]), np.log(power[band]), 1)[0]
+    assert slope == pytest.approx(-exponent, abs=0.2)
+
+
+def test_drift_reaches_sigma_at_the_end_with_slope():
+    rng = np.random.default_rng(1)
+    time = np.linspace(0, 10, 500)
+    walk = drift(rng, (5000, time.size), time, 0.3, 0.0)
+    assert walk[:, 0].std() == pytest.approx(0.0, abs=1e-12)
+    assert walk[:, -1].std() == pytest.approx(0.3, rel=0.05)
+
+    sloped = drift(rng, (1, time.size), time, 0.0, 0.02)
+    np.testing.assert_allclose(sloped[0], 0.02 * time)
+
+
+def test_telegraph_switches_between_levels_at_rate():
+    rng = np.random.default_rng(2)
+    time = np.linspace(0, 1000, 100_001)
+    signal = telegraph(rng, (4, time.size), time, 0.05, 0.2)
+
+    np.testing.assert_allclose(np.abs(signal), 0.05)
+    switches = np.count_nonzero(np.diff(signal, axis=1), axis=1)
+    np.testing.assert_allclose(switches / 1000, 0.2, rtol=0.15)
+
+
+def test_sample_model_sums_channels_and_is_independent_across_rows():
+    rng = np.random.default_rng(3)
+    time = np.linspace(0, 10, 1000)
+    assert sample_model(rng, [], (2, 1000), time) is None
+
+    model = parse_model([{"type": "white", "sigma": 0.02}, {"type": "pink", "sigma": 0.02}])
+    noise = sample_model(rng, model, (2, 1000), time)
+    assert noise.shape == (2, 1000)
+    assert noise.std() == pytest.approx(np.hypot(0.02, 0.02), rel=0.3)
+    assert abs(np.corrcoef(noise)[0, 1]) < 0.3
+
+
+def test_generators_apply_noise_model_only_when_given():
+    simulator = QuantumSimulator()
+    args = dict(omega=1.0, time_max=10.0, time_steps=200, noise_rate=0.0, shots=100_000, seed=4, format="arrays")
+    plain = simulator.generate_rabi_data(**args)
+    empty = simulator.generate_rabi_data(**args, noise_model=[])
+    noisy = simulator.generate_rabi_data(**args, noise_model=[{"type": "drift", "sigma": 0.2, "slope": 0.01}])
+
+    np.testing.assert_array_equal(plain["measurements"]["ones_count"], empty["measurements"]["ones_count"])
+    assert not np.array_equal(plain["measurements"]["ones_count"], noisy["measurements"]["ones_count"])
+    assert noisy["parameters"]["noise_model"] == [{"type": "drift", "slope": 0.01, "sigma": 0.2}]
+
+
+def test_stream_with_noise_model_covers_every_point():
+    simulator = QuantumSimulator()
+    args = dict(omega=1.0, time_max=10.0, time_steps=300, noise_rate=0.0, shots=100, seed=5,
+                noise_model=[{"type": "pink", "sigma": 0.05}])
+    records = list(simulator.stream_rabi_data(**args, chunk_size=50, format="columnar"))
+    chunks = [record for record in records if record["type"] == "measurements"]
+    assert [chunk["start"] for chunk in chunks] == list(range(0, 300, 50))
+    assert sum(len(chunk["measurements"]["time"]) for chunk in chunks) == 300
@@ -0,0 +1,43 @@
+import pytest
+
+INVALID = [
+    ("rabi", {"time_steps": 0}),
+    ("rabi", {"time_steps": -5}),
+    ("rabi", {"shots": 0}),
+    ("rabi", {"omega": 0}),
+    ("rabi", {"time_max": 0}),
+    ("rabi", {"noise_rate": -0.1}),
+    ("decay", {"t1": 0}),
+    ("decay", {"t2": -1.0}),
+    ("decay", {"shots": 0}),
+    ("bell", {"shots": 0}),
+    ("bell", {"noise_rate": -0.1}),
+]
+
+
+@pytest.mark.parametrize("experiment,params", INVALID)
+def test_generate_rejects_out_of_range_params(client, experiment, params):
+    for extra in ({}, {"ensemble_size": 4}):
+        response = client.post(f"/generate/{experiment}", json=dict(params, **extra))
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"][-1] == next(iter(params))
+
+
+@pytest.mark.parametrize("path", ["/stream/rabi", "/export/rabi", "/export/rabi/shots", "/datasets/rabi"])
+def test_other_endpoints_reject_out_of_range_params(client, path):
+    assert client.post(path, json={"shots": 0}).status_code == 422
+
+
+def test_sweep_rejects_out_of_range_params(client):
+    fixed = client.post("/generate/rabi/sweep", json={
+        "params": {"shots": 0}, "sweep": {"omega": {"start": 0.5, "stop": 2.0, "num": 4}}})
+    assert fixed.status_code == 422
+
+    swept = client.post("/generate/decay/sweep", json={
+        "params": {}, "sweep": {"t1": {"start": 0.0, "stop": 5.0, "num": 4}}})
+    assert swept.status_code == 422
+    assert swept.json()["detail"][0]["loc"][-1] == "t1"
+
+    noise = client.post("/generate/rabi/sweep", json={
+        "params": {}, "sweep": {"noise_rate": {"start": 0.0, "stop": 0.2, "num": 3}}})
+    assert noise.status_code == 200
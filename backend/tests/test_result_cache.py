@@ -0,0 +1,58 @@
+import main
+from result_cache import ResultCache
+
+
+def test_make_key_is_canonical():
+    key = ResultCache.make_key("rabi", {"omega": 1.0, "seed": 3}, format="records")
+    assert key == ResultCache.make_key("rabi", {"seed": 3, "omega": 1.0}, format="records")
+    assert key != ResultCache.make_key("rabi", {"omega": 1.0, "seed": 3}, format="columnar")
+    assert key != ResultCache.make_key("decay", {"omega": 1.0, "seed": 3}, format="records")
+
+
+def test_evicts_least_recently_used_within_byte_budget():
+    cache = ResultCache(max_bytes=30)
+    cache.put("a", b"x" * 10)
+    cache.put("b", b"y" * 10)
+    cache.put("c", b"z" * 10)
+    assert cache.get("a") == b"x" * 10  # a is now the most recent
+
+    cache.put("d", b"w" * 10)
+    assert cache.get("b") is None
+    assert [cache.get(key) is not None for key in "acd"] == [True, True, True]
+    stats = cache.stats()
+    assert stats["bytes"] == 30 and stats["entries"] == 3 and stats["evictions"] == 1
+
+    # One large entry pushes out as many as needed
+    cache.put("e", b"v" * 25)
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["bytes"] == 25
+
+
+def test_oversized_and_replaced_entries():
+    cache = ResultCache(max_bytes=10)
+    cache.put("big", b"x" * 11)
+    assert cache.get("big") is None
+    assert cache.stats()["bytes"] == 0
+
+    cache.put("k", b"1234")
+    cache.put("k", b"12345678")
+    assert cache.get("k") == b"12345678"
+    assert cache.stats()["bytes"] == 8
+
+    disabled = ResultCache(max_bytes=0)
+    disabled.put("k", b"1")
+    assert disabled.get("k") is None
+
+
+def test_seeded_requests_hit_the_cache(client):
+    params = {"time_steps": 100, "seed": 123, "omega": 1.234}
+    before = main.cache.stats()
+    first = client.post("/generate/rabi", json=params)
+    second = client.post("/generate/rabi", json=params)
+    after = main.cache.stats()
+
+    assert first.content == second.content
+    assert after["hits"] == before["hits"] + 1
+    # Unseeded requests are never cached
+    client.post("/generate/rabi", json={"time_steps": 100})
+    assert main.cache.stats()["entries"] == after["entries"]
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+
+import statevector
+from statevector import CNOT, H, X, Statevector, amplitude_damping, bits, controlled, rx, ry, rz
+
+
+def dense(gate, qubits, num_qubits):
+    """Full 2**n x 2**n matrix of `gate` on `qubits`, built one basis state at a time"""
+    size, k = 1 << num_qubits, len(qubits)
+    matrix = np.zeros((size, size), dtype=complex)
+    for column in range(size):
+        j = sum(((column >> (num_qubits - 1 - q)) & 1) << (k - 1 - position) for position, q in enumerate(qubits))
+        for i in range(1 << k):
+            row = column
+            for position, q in enumerate(qubits):
+                bit = (i >> (k - 1 - position)) & 1
+                row = (row & ~(1 << (num_qubits - 1 - q))) | (bit << (num_qubits - 1 - q))
+            matrix[row, column] += gate[i, j]
+    return matrix
+
+
+def random_unitary(rng, dim):
+    q, r = np.linalg.qr(rng.normal(size=(dim, dim)) + 1j * rng.normal(size=(dim, dim)))
+    return q * (np.diag(r) / np.abs(np.diag(r)))
+
+
+def random_state(rng, num_qubits, batch_size=1):
+    state = Statevector(num_qubits, batch_size)
+    data = rng.normal(size=state.data.shape) + 1j * rng.normal(size=state.data.shape)
+    state.data[:] = data / np.linalg.norm(data, axis=1, keepdims=True)
+    return state
+
+
+@pytest.mark.parametrize("qubits", [(0,), (3,), (2, 0), (1, 3), (3, 0, 2)])
+@pytest.mark.parametrize("chunk_size", [statevector.CHUNK_SIZE, 4])
+def test_apply_matches_dense_matrix(monkeypatch, qubits, chunk_size):
+    # A small chunk size forces the loop over untouched qubits
+    monkeypatch.setattr(statevector, "CHUNK_SIZE", chunk_size)
+    rng = np.random.default_rng(1)
+    gate = random_unitary(rng, 1 << len(qubits))
+    state = random_state(rng, 4, batch_size=3)
+    expected = state.data @ dense(gate, qubits, 4).T
+
+    state.apply(gate, qubits)
+    np.testing.assert_allclose(state.data, expected, atol=1e-12)
+
+
+@pytest.mark.parametrize("chunk_size", [statevector.CHUNK_SIZE, 8])
+def test_batched_gates_apply_per_state(monkeypatch, chunk_size):
+    monkeypatch.setattr(statevector, "CHUNK_SIZE", chunk_size)
+    rng = np.random.default_rng(2)
+    angles = rng.uniform(0, 2 * np.pi, 5)
+    state = random_state(rng, 3, batch_size=5)
+    expected = np.stack([dense(gate, (1,), 3) @ row for gate, row in zip(ry(angles), state.data)])
+
+    state.apply(ry(angles), [1])
+    np.testing.assert_allclose(state.data, expected, atol=1e-12)
+
+
+def test_bell_circuit_probabilities_and_marginals():
+    state = Statevector(3).apply(H, [0]).apply(CNOT, [0, 2])
+    np.testing.assert_allclose(state.probabilities([0, 2]), [[0.5, 0, 0, 0.5]], atol=1e-12)
+    np.testing.assert_allclose(state.probabilities([1]), [[1, 0]], atol=1e-12)
+
+    # Marginals follow the requested qubit order
+    state = Statevector(2).apply(X, [0])
+    np.testing.assert_allclose(state.probabilities([0, 1]), [[0, 0, 1, 0]])
+    np.testing.assert_allclose(state.probabilities([1, 0]), [[0, 1, 0, 0]])
+
+
+def test_rotations_are_unitary_and_compose():
+    angles = np.linspace(0, 2 * np.pi, 7)
+    for gate in (rx(angles), ry(angles), rz(angles), controlled(ry(angles)), amplitude_damping(angles / 7)):
+        identity = np.broadcast_to(np.eye(gate.shape[-1]), gate.shape)
+        np.testing.assert_allclose(gate @ np.conj(np.swapaxes(gate, -1, -2)), identity, atol=1e-12)
+    np.testing.assert_allclose(rz(0.3) @ rz(0.4), rz(0.7), atol=1e-12)
+
+
+def test_amplitude_damping_moves_excitation_to_ancilla():
+    state = Statevector(2, batch_size=3).apply(X, [0])
+    gamma = np.array([0.0, 0.25, 1.0])
+    state.apply(amplitude_damping(gamma), [0, 1])
+    np.testing.assert_allclose(state.probabilities([0])[:, 1], 1 - gamma, atol=1e-12)
+    np.testing.assert_allclose(state.probabilities([1])[:, 1], gamma, atol=1e-12)
+
+
+def test_sampling_follows_probabilities():
+    rng = np.random.default_rng(3)
+    state = Statevector(2, batch_size=2).apply(ry([np.pi / 3, np.pi / 2]), [0])
+    probs = state.probabilities([0])
+
+    indices = state.sample(rng, 200_000)
+    ones = bits(indices, 2, [0])[0].mean(axis=1)
+    np.testing.assert_allclose(ones, probs[:, 1], atol=0.01)
+
+    counts = state.sample_counts(rng, 200_000, [0])
+    assert (counts.sum(axis=1) == 200_000).all()
+    np.testing.assert_allclose(counts[:, 1] / 200_000, probs[:, 1], atol=0.01)
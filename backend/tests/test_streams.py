@@ -0,0 +1,46 @@
+import json
+
+
+def stream(client, experiment, params):
+    response = client.post(f"/stream/{experiment}", params={"format": "columnar", "chunk_size": 50}, json=params)
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def measured(records):
+    return [value for record in records if record["type"] == "measurements"
+            for value in record["measurements"]["measured_prob"]]
+
+
+def test_stream_applies_noise_model(client):
+    params = {"time_steps": 200, "seed": 7, "noise_rate": 0.0}
+    drift = [{"type": "drift", "sigma": 0.2, "slope": 0.05}]
+    plain = stream(client, "rabi", params)
+    noisy = stream(client, "rabi", dict(params, noise_model=drift))
+
+    assert noisy[0]["parameters"]["noise_model"] == [{"type": "drift", "sigma": 0.2, "slope": 0.05}]
+    assert len(measured(noisy)) == len(measured(plain)) == 200
+    assert measured(noisy) != measured(plain)
+
+
+def test_stream_rejects_invalid_noise_model(client):
+    for experiment in ("rabi", "decay"):
+        response = client.post(f"/stream/{experiment}", json={"noise_model": [{"type": "drift"}]})
+        assert response.status_code == 422
+
+
+def test_stream_rejected_when_pool_is_full(client, monkeypatch):
+    from main import pool
+
+    monkeypatch.setattr(pool, "pending", pool.workers + pool.queue_depth)
+    for experiment in ("rabi", "decay"):
+        response = client.post(f"/stream/{experiment}", json={"time_steps": 50})
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+
+def test_stream_releases_pool_slots(client):
+    from main import pool
+
+    stream(client, "decay", {"time_steps": 120, "seed": 3})
+    assert pool.pending == 0
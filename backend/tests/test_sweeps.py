@@ -0,0 +1,22 @@
+import main
+
+
+def sweep(client, params, sweep):
+    return client.post("/generate/rabi/sweep", json={"params": params, "sweep": sweep})
+
+
+def test_sweep_grid_is_capped(client, monkeypatch):
+    monkeypatch.setattr(main, "settings", main.settings.__class__(sweep_max_points=10_000))
+    grid = {"omega": {"start": 0.5, "stop": 3.0, "num": 20}, "noise_rate": {"start": 0.0, "stop": 0.1, "num": 5}}
+
+    assert sweep(client, {"time_steps": 100, "seed": 1}, grid).status_code == 200
+    response = sweep(client, {"time_steps": 101, "seed": 1}, grid)
+    assert response.status_code == 422
+    assert "10000" in response.json()["detail"]
+
+
+def test_sweep_job_grid_is_capped(client):
+    grid = {"omega": {"start": 0.5, "stop": 3.0, "num": 1000}, "noise_rate": {"start": 0.0, "stop": 0.1, "num": 1000}}
+    response = client.post("/jobs", json={"task": "sweep", "experiment": "rabi", "params": {"time_steps": 1000},
+                                          "sweep": grid})
+    assert response.status_code == 422
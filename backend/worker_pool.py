@@ -0,0 +1,68 @@
+import asyncio
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+
+class PoolOverloaded(Exception):
+    """Raised when every worker is busy and the wait queue is full"""
+
+
+class GenerationPool:
+    """Runs CPU-bound generation off the event loop with a bounded backlog.
+
+    At most `workers` calls execute at once and up to `queue_depth` more may wait
+    for a worker; anything beyond that is rejected immediately with
+    PoolOverloaded instead of piling up latency.
+    """
+
+    def __init__(self, kind: str = "thread", workers: int = 1, queue_depth: int = 0):
+        if kind == "thread":
+            self._executor: Executor = ThreadPoolExecutor(max_workers=workers)
+        elif kind == "process":
+            self._executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            raise ValueError(f"Unknown worker pool kind '{kind}'")
+        self.kind = kind
+        self.workers = workers
+        self.queue_depth = queue_depth
+        # Only touched from the event loop thread, so no lock is needed
+        self.pending = 0
+
+    def admit(self):
+        """Raise PoolOverloaded if another call would exceed the backlog"""
+        if self.pending >= self.workers + self.queue_depth:
+            raise PoolOverloaded(
+                f"Generation queue is full ({self.workers} workers, {self.queue_depth} queued)"
+            )
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        self.admit()
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+        finally:
+            self.pending -= 1
+
+    async def iterate(self, iterator):
+        """Step a generator in a thread, counting each step against the backlog.
+
+        Generators cannot be sent to a process, so streams call admit() once up
+        front and then draw every chunk through here; steps are never rejected,
+        so an admitted stream is not cut off mid-response.
+        """
+        loop = asyncio.get_running_loop()
+        done = object()
+        while True:
+            self.pending += 1
+            try:
+                item = await loop.run_in_executor(None, next, iterator, done)
+            finally:
+                self.pending -= 1
+            if item is done:
+                return
+            yield item
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -6,7 +6,12 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import numpy as np
+import time
+import threading
 import warnings
+from collections import OrderedDict
+from websockets.exceptions import WebSocketException
+from websockets.sync.client import connect as ws_connect
 
 # Suppress deprecation warnings
 warnings.filterwarnings("ignore", category=DeprecationWarning)
@@ -38,6 +43,238 @@ def load_js():
 # API base URL
 API_BASE = "http://localhost:8000"
 
+WS_BASE = API_BASE.replace("http", "ws", 1)
+
+# Seeded responses are reused for up to this long, within this many bytes of response bodies
+CACHE_TTL_SECONDS = 600
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Longer traces come back LTTB-downsampled to this many points per channel
+MAX_POINTS = 2000
+# Above this many points per trace, plot with WebGL instead of SVG
+WEBGL_THRESHOLD = 1000
+TIME_STEP_OPTIONS = [50, 100, 200, 500, 1000, 10_000, 100_000, 1_000_000]
+
+# Live acquisition: points per streamed batch, batches the backend may send ahead of our acks,
+# and the shortest interval between redraws of the growing plot
+LIVE_CHUNK_SIZE = 2000
+LIVE_WINDOW = 4
+LIVE_REDRAW_SECONDS = 0.25
+
+ENDPOINTS = {
+    "Rabi Oscillations": "rabi",
+    "T1/T2 Decay": "decay",
+    "Bell State Measurements": "bell"
+}
+
+class ApiError(Exception):
+    """Non-200 response from the backend"""
+
+class ResponseCache:
+    """Response bodies keyed by request, bounded by their total size and a TTL.
+
+    Bodies are kept as received and decoded on every hit, so the bound is the
+    memory actually held and each caller gets its own objects.
+    """
+
+    def __init__(self, max_bytes, ttl):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # key -> (expires at, body), least recently used first
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                self.total_bytes -= len(entry[1])
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, body):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= len(previous[1])
+            # Expired bodies that were never asked for again still count against the budget
+            now = time.monotonic()
+            for stale in [k for k, (expires, _) in self._entries.items() if expires < now]:
+                self.total_bytes -= len(self._entries.pop(stale)[1])
+            while self._entries and self.total_bytes + len(body) > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.total_bytes -= len(evicted)
+            self._entries[key] = (time.monotonic() + self.ttl, body)
+            self.total_bytes += len(body)
+
+@st.cache_resource
+def get_session():
+    """Keep-alive HTTP session shared by every rerun and browser session"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_resource
+def get_response_cache():
+    """Response cache shared by every rerun and browser session"""
+    return ResponseCache(CACHE_MAX_BYTES, CACHE_TTL_SECONDS)
+
+def request_json(method, url, cached=False, **kwargs):
+    """Decoded JSON body of a backend call; with cached, bodies are reused by request. Errors are not cached"""
+    key = json.dumps([method, url, kwargs], sort_keys=True)
+    body = get_response_cache().get(key) if cached else None
+    if body is None:
+        response = get_session().request(method, url, **kwargs)
+        if response.status_code != 200:
+            raise ApiError(response.text)
+        body = response.content
+        if cached:
+            get_response_cache().put(key, body)
+    return json.loads(body)
+
+def post_generate(endpoint, params, cached=False):
+    # Columnar measurements load straight into DataFrames without per-point dicts
+    return request_json(
+        "POST",
+        f"{API_BASE}/generate/{endpoint}",
+        cached=cached,
+        params={"format": "columnar", "max_points": MAX_POINTS},
+        json=params
+    )['data']
+
+def fetch_window(slice_url, time_start, time_stop):
+    """Stored full-resolution data between two times, downsampled to MAX_POINTS by the backend"""
+    body = request_json(
+        "GET",
+        f"{API_BASE}{slice_url}",
+        cached=True,
+        params={"time_start": time_start, "time_stop": time_stop, "max_points": MAX_POINTS}
+    )
+    channels = split_columns(body['columns'])
+    return {prefix: pd.DataFrame(fields) for prefix, fields in channels.items()}
+
+def split_columns(columns):
+    """Flat 'channel.field' slice columns back into one dict of fields per channel"""
+    channels = {}
+    for name, values in columns.items():
+        prefix, _, field = name.rpartition(".")
+        channels.setdefault(prefix, {})[field] = values
+    return channels
+
+def full_resolution(data):
+    """The response with its LTTB view replaced by every stored point, for downloads"""
+    response = get_session().get(f"{API_BASE}{data['resolution']['slice_url']}")
+    if response.status_code != 200:
+        raise ApiError(response.text)
+    channels = split_columns(response.json()['columns'])
+    full = {key: value for key, value in data.items() if key != 'resolution'}
+    full['measurements'] = channels[""] if "" in channels else channels
+    return full
+
+def zoom_window(data, frame):
+    """Full-resolution frames for the selected time window, or None to plot the overview"""
+    resolution = data.get('resolution')
+    if resolution is None:
+        return None
+    t_min, t_max = float(frame['time'].iloc[0]), float(frame['time'].iloc[-1])
+    st.caption(f"Showing {resolution['points']:,} of {resolution['total_points']:,} points per channel "
+               f"(LTTB); zoom in to load full resolution")
+    window = st.slider("🔍 Time Window", t_min, t_max, (t_min, t_max), key=f"zoom_{resolution['dataset']}")
+    if window == (t_min, t_max):
+        return None
+    try:
+        return fetch_window(resolution['slice_url'], *window)
+    except (ApiError, requests.exceptions.ConnectionError) as e:
+        st.warning(f"⚠️ Could not load the zoomed window: {e}")
+        return None
+
+def scatter(points, **kwargs):
+    """Scatter trace, drawn with WebGL when SVG would struggle with the point count"""
+    return go.Scattergl(**kwargs) if points > WEBGL_THRESHOLD else go.Scatter(**kwargs)
+
+def live_figure(channels, time_max):
+    """Measured traces received so far, thinned to MAX_POINTS for the in-progress view"""
+    fig = go.Figure()
+    for channel, columns in channels.items():
+        step = max(1, len(columns['time']) // MAX_POINTS)
+        measured = columns['measured_prob'] if 'measured_prob' in columns else columns['measured_signal']
+        fig.add_trace(scatter(len(columns['time']) // step, x=columns['time'][::step], y=measured[::step],
+                              name=channel.replace('_', ' ').title() if channel else 'Measured', mode='lines'))
+    fig.update_layout(height=400, title_text="Live Acquisition", xaxis_title="Time")
+    fig.update_xaxes(range=[0, time_max])
+    return fig
+
+def stream_live(endpoint, params, area):
+    """Acquire over the WebSocket stream, plotting points as they arrive.
+
+    Each measurement record is acknowledged once it has been handled, so the
+    backend is never more than LIVE_WINDOW records ahead of the app.
+    """
+    with area:
+        progress = st.progress(0.0, text="Acquiring...")
+        stats = st.empty()
+        chart = st.empty()
+    
+    channels = {}
+    redraws, last_redraw = 0, 0.0
+    with ws_connect(f"{WS_BASE}/ws/stream/{endpoint}", max_size=None) as ws:
+        ws.send(json.dumps({"params": params, "format": "columnar",
+                            "chunk_size": LIVE_CHUNK_SIZE, "window": LIVE_WINDOW}))
+        header = json.loads(ws.recv())
+        if header['type'] == 'error':
+            raise ApiError(header['detail'])
+        total = header['parameters']['time_steps']
+        
+        for message in ws:
+            record = json.loads(message)
+            if record['type'] == 'measurements':
+                # Decay batches hold one set of columns per channel, Rabi batches a single set
+                batch = record['measurements'] if endpoint == 'decay' else {"": record['measurements']}
+                for channel, columns in batch.items():
+                    received = channels.setdefault(channel, {})
+                    for field, values in columns.items():
+                        received.setdefault(field, []).extend(values)
+                
+                running = record['running']
+                progress.progress(running['points'] / total, text=f"Acquired {running['points']:,} of {total:,} points")
+                stats.caption(" · ".join(f"{name}: {value:.4g}" for name, value in running.items() if name != 'points'))
+                if time.monotonic() - last_redraw >= LIVE_REDRAW_SECONDS or running['points'] == total:
+                    redraws += 1
+                    chart.plotly_chart(live_figure(channels, params['time_max']), width='stretch',
+                                       key=f"live_{redraws}")
+                    last_redraw = time.monotonic()
+            elif record['type'] == 'statistics':
+                # The last record: the backend closes right after it, so it is not acknowledged
+                statistics, metadata = record['statistics'], record['metadata']
+                break
+            ws.send(json.dumps({"ack": record['seq']}))
+    
+    progress.empty()
+    stats.empty()
+    chart.empty()
+    return {
+        "experiment_type": header['experiment_type'],
+        "parameters": header['parameters'],
+        "measurements": channels if endpoint == 'decay' else channels[""],
+        "statistics": statistics,
+        "metadata": metadata
+    }
+
+def memoized(name, build):
+    """Value derived from the current dataset, built once per dataset instead of on every rerun"""
+    derived = st.session_state.setdefault("derived", {})
+    if name not in derived:
+        derived[name] = build()
+    return derived[name]
+
 def main():
     load_css()
     load_js()
@@ -66,6 +303,7 @@ def main():
         shots = st.slider("📊 Number of Shots", 100, 10000, 1000, step=100)
         noise_rate = st.slider("🔊 Noise Level", 0.0, 0.5, 0.1, step=0.01)
         seed = st.number_input("🎲 Random Seed (optional)", value=None, placeholder="Leave empty for random")
+        live = st.toggle("📡 Live Acquisition", help="Plot Rabi and T1/T2 points as they are generated")
         
         st.markdown("---")
         
@@ -75,7 +313,7 @@ def main():
             st.markdown('<div class="param-section">Rabi Parameters</div>', unsafe_allow_html=True)
             omega = st.slider("⚡ Drive Frequency (Ω)", 0.5, 3.0, 1.0, step=0.1)
             time_max = st.slider("⏱️ Maximum Time", 5.0, 20.0, 10.0, step=1.0)
-            time_steps = st.slider("📈 Time Steps", 50, 200, 100, step=10)
+            time_steps = st.select_slider("📈 Time Steps", TIME_STEP_OPTIONS, 100)
             
             params = {
                 "omega": omega,
@@ -91,7 +329,7 @@ def main():
             t1 = st.slider("T₁ Decay Time", 1.0, 10.0, 5.0, step=0.5)
             t2 = st.slider("T₂ Coherence Time", 1.0, 8.0, 3.0, step=0.5)
             time_max = st.slider("⏱️ Maximum Time", 10.0, 25.0, 15.0, step=1.0)
-            time_steps = st.slider("📈 Time Steps", 50, 200, 100, step=10)
+            time_steps = st.select_slider("📈 Time Steps", TIME_STEP_OPTIONS, 100)
             
             params = {
                 "t1": t1,
@@ -121,7 +359,7 @@ def main():
         st.markdown('<div class="control-panel">', unsafe_allow_html=True)
         
         if st.button("🚀 Generate Data", type="primary", width='stretch'):
-            generate_data(experiment_type, params)
+            generate_data(experiment_type, params, live, col1)
         
         if st.button("💾 Download Example", width='stretch'):
             show_example_data()
@@ -133,29 +371,27 @@ def main():
         if 'data' in st.session_state:
             display_results(st.session_state.data, experiment_type)
 
-def generate_data(experiment_type, params):
+def generate_data(experiment_type, params, live=False, area=None):
     """Generate synthetic quantum data"""
     with st.spinner("Generating synthetic quantum data..."):
         try:
-            # Map experiment type to API endpoint
-            endpoint_map = {
-                "Rabi Oscillations": "rabi",
-                "T1/T2 Decay": "decay", 
-                "Bell State Measurements": "bell"
-            }
-            
-            endpoint = endpoint_map[experiment_type]
-            response = requests.post(f"{API_BASE}/generate/{endpoint}", json=params)
-            
-            if response.status_code == 200:
-                data = response.json()['data']
-                st.session_state.data = data
-                st.success("✅ Data generated successfully!")
+            endpoint = ENDPOINTS[experiment_type]
+            if live and endpoint != "bell":
+                data = stream_live(endpoint, params, area)
             else:
-                st.error(f"❌ Error: {response.text}")
+                # Unseeded requests must draw fresh data every time, so only seeded ones are cached
+                data = post_generate(endpoint, params, cached=params.get("seed") is not None)
+            
+            st.session_state.data = data
+            st.session_state.derived = {}
+            st.success("✅ Data generated successfully!")
                 
-        except requests.exceptions.ConnectionError:
+        except ApiError as e:
+            st.error(f"❌ Error: {e}")
+        except (requests.exceptions.ConnectionError, ConnectionRefusedError):
             st.error("❌ Cannot connect to API server. Make sure the backend is running!")
+        except WebSocketException as e:
+            st.error(f"❌ Live stream interrupted: {e}")
         except Exception as e:
             st.error(f"❌ Unexpected error: {str(e)}")
 
@@ -187,7 +423,7 @@ def display_results(data, experiment_type):
         st.markdown('<div class="stats-panel">', unsafe_allow_html=True)
         st.markdown("### 📈 Statistics")
         
-        stats_df = pd.DataFrame(list(data['statistics'].items()), columns=['Metric', 'Value'])
+        stats_df = memoized("statistics", lambda: pd.DataFrame(list(data['statistics'].items()), columns=['Metric', 'Value']))
         st.dataframe(stats_df, width='stretch', hide_index=True)
         
         st.markdown('</div>', unsafe_allow_html=True)
@@ -196,58 +432,67 @@ def display_results(data, experiment_type):
         st.markdown('<div class="download-panel">', unsafe_allow_html=True)
         st.markdown("### 💾 Download Data")
         
-        # JSON download
-        json_data = json.dumps(data, indent=2)
-        st.download_button(
-            "📄 Download JSON",
-            json_data,
-            f"{data['experiment_type']}_data.json",
-            "application/json",
-            width='stretch'
-        )
+        # The plot may show an LTTB view; downloads always carry every point
+        derived = st.session_state.setdefault("derived", {})
+        resolution = data.get('resolution')
+        if resolution is not None and "full" not in derived:
+            st.caption(f"The plot shows {resolution['points']:,} of {resolution['total_points']:,} points "
+                       f"per channel; downloads need the full dataset.")
+            if st.button("⬇️ Prepare Full-Resolution Download", width='stretch'):
+                try:
+                    memoized("full", lambda: full_resolution(data))
+                except (ApiError, requests.exceptions.ConnectionError) as e:
+                    st.warning(f"⚠️ Could not load the full dataset: {e}")
+        export = derived.get("full", data if resolution is None else None)
+        
+        if export is not None:
+            # JSON download
+            json_data = memoized("json", lambda: json.dumps(export, indent=2))
+            st.download_button(
+                "📄 Download JSON",
+                json_data,
+                f"{data['experiment_type']}_data.json",
+                "application/json",
+                width='stretch'
+            )
         
-        # CSV download
-        if experiment_type == "Rabi Oscillations":
-            csv_data = pd.DataFrame(data['measurements']).to_csv(index=False)
-        elif experiment_type == "T1/T2 Decay":
-            if isinstance(data['measurements'], dict):
-                t1_df = pd.DataFrame(data['measurements']['t1_decay'])
-                t2_df = pd.DataFrame(data['measurements']['t2_coherence'])
-                csv_data = pd.concat([t1_df.add_prefix('t1_'), t2_df.add_prefix('t2_')], axis=1).to_csv(index=False)
-            else:
-                csv_data = pd.DataFrame(data['measurements']).to_csv(index=False)
-        else:  # Bell State
-            bell_data = []
-            for basis, meas in data['measurements'].items():
-                bell_data.append({
-                    'basis': basis,
-                    **meas
-                })
-            csv_data = pd.DataFrame(bell_data).to_csv(index=False)
-        
-        st.download_button(
-            "📊 Download CSV",
-            csv_data,
-            f"{data['experiment_type']}_data.csv",
-            "text/csv",
-            width='stretch'
-        )
+            # CSV download
+            csv_data = memoized("csv", lambda: measurements_csv(export, experiment_type))
+        
+            st.download_button(
+                "📊 Download CSV",
+                csv_data,
+                f"{data['experiment_type']}_data.csv",
+                "text/csv",
+                width='stretch'
+            )
         
         st.markdown('</div>', unsafe_allow_html=True)
     
     st.markdown('</div>', unsafe_allow_html=True)
 
+def measurements_csv(data, experiment_type):
+    # Built from the download data, which may differ from the plotted view memoized under the channel names
+    if experiment_type == "T1/T2 Decay" and isinstance(data['measurements'], dict):
+        t1_df = pd.DataFrame(data['measurements']['t1_decay'])
+        t2_df = pd.DataFrame(data['measurements']['t2_coherence'])
+        return pd.concat([t1_df.add_prefix('t1_'), t2_df.add_prefix('t2_')], axis=1).to_csv(index=False)
+    return pd.DataFrame(data['measurements']).to_csv(index=False)
+
 def display_rabi_results(data):
     """Display Rabi oscillation results with error handling"""
     try:
         measurements = data['measurements']
         
-        if not isinstance(measurements, list):
-            st.error("❌ Expected Rabi measurements to be a list")
+        if not isinstance(measurements, dict):
+            st.error("❌ Expected columnar Rabi measurements")
             st.json(measurements)
             return
             
-        df = pd.DataFrame(measurements)
+        df = memoized("measurements", lambda: pd.DataFrame(measurements))
+        window = zoom_window(data, df)
+        if window is not None:
+            df = window[""]
         
         # Check for required columns
         required_cols = ['time', 'theory_prob', 'measured_prob', 'ones_count']
@@ -265,23 +510,25 @@ def display_rabi_results(data):
         
         # Probability plot
         fig.add_trace(
-            go.Scatter(x=df['time'], y=df['theory_prob'], 
-                      name='Theoretical', line=dict(color='blue', dash='dash')),
+            scatter(len(df), x=df['time'], y=df['theory_prob'],
+                    name='Theoretical', line=dict(color='blue', dash='dash')),
             row=1, col=1
         )
         fig.add_trace(
-            go.Scatter(x=df['time'], y=df['measured_prob'], 
-                      name='Measured', line=dict(color='red'), 
-                      mode='lines+markers'),
+            scatter(len(df), x=df['time'], y=df['measured_prob'],
+                    name='Measured', line=dict(color='red'),
+                    mode='lines+markers'),
             row=1, col=1
         )
         
-        # Counts histogram
-        fig.add_trace(
-            go.Bar(x=df['time'], y=df['ones_count'], 
-                   name='|1⟩ counts', marker_color='orange'),
-            row=2, col=1
-        )
+        # Counts histogram; thousands of bars are drawn as a WebGL line instead
+        if len(df) > WEBGL_THRESHOLD:
+            counts = go.Scattergl(x=df['time'], y=df['ones_count'], name='|1⟩ counts',
+                                  line=dict(color='orange'), mode='lines')
+        else:
+            counts = go.Bar(x=df['time'], y=df['ones_count'],
+                            name='|1⟩ counts', marker_color='orange')
+        fig.add_trace(counts, row=2, col=1)
         
         fig.update_layout(height=600, title_text="Rabi Oscillation Analysis")
         fig.update_xaxes(title_text="Time", row=2, col=1)
@@ -302,8 +549,11 @@ def display_decay_results(data):
         if isinstance(measurements, dict):
             # Expected structure: dict with 't1_decay' and 't2_coherence' keys
             if 't1_decay' in measurements and 't2_coherence' in measurements:
-                t1_data = pd.DataFrame(measurements['t1_decay'])
-                t2_data = pd.DataFrame(measurements['t2_coherence'])
+                t1_data = memoized("t1_decay", lambda: pd.DataFrame(measurements['t1_decay']))
+                t2_data = memoized("t2_coherence", lambda: pd.DataFrame(measurements['t2_coherence']))
+                window = zoom_window(data, t1_data)
+                if window is not None:
+                    t1_data, t2_data = window['t1_decay'], window['t2_coherence']
                 
                 # Create two subplots for T1 and T2
                 fig = make_subplots(rows=1, cols=2,
@@ -311,25 +561,25 @@ def display_decay_results(data):
                 
                 # T1 decay
                 fig.add_trace(
-                    go.Scatter(x=t1_data['time'], y=t1_data['theory_signal'],
-                              name='T₁ Theory', line=dict(color='blue', dash='dash')),
+                    scatter(len(t1_data), x=t1_data['time'], y=t1_data['theory_signal'],
+                            name='T₁ Theory', line=dict(color='blue', dash='dash')),
                     row=1, col=1
                 )
                 fig.add_trace(
-                    go.Scatter(x=t1_data['time'], y=t1_data['measured_signal'],
-                              name='T₁ Measured', line=dict(color='red'), mode='lines+markers'),
+                    scatter(len(t1_data), x=t1_data['time'], y=t1_data['measured_signal'],
+                            name='T₁ Measured', line=dict(color='red'), mode='lines+markers'),
                     row=1, col=1
                 )
                 
                 # T2 coherence
                 fig.add_trace(
-                    go.Scatter(x=t2_data['time'], y=t2_data['theory_signal'],
-                              name='T₂ Theory', line=dict(color='green', dash='dash')),
+                    scatter(len(t2_data), x=t2_data['time'], y=t2_data['theory_signal'],
+                            name='T₂ Theory', line=dict(color='green', dash='dash')),
                     row=1, col=2
                 )
                 fig.add_trace(
-                    go.Scatter(x=t2_data['time'], y=t2_data['measured_signal'],
-                              name='T₂ Measured', line=dict(color='orange'), mode='lines+markers'),
+                    scatter(len(t2_data), x=t2_data['time'], y=t2_data['measured_signal'],
+                            name='T₂ Measured', line=dict(color='orange'), mode='lines+markers'),
                     row=1, col=2
                 )
                 
@@ -345,7 +595,7 @@ def display_decay_results(data):
         elif isinstance(measurements, list):
             # If measurements is a list, treat as single decay
             st.warning("⚠️ Measurements is a list. Creating single decay plot.")
-            df = pd.DataFrame(measurements)
+            df = memoized("measurements", lambda: pd.DataFrame(measurements))
             
             fig = go.Figure()
             
@@ -385,19 +635,17 @@ def display_bell_results(data):
     try:
         measurements = data['measurements']
         
-        if not isinstance(measurements, dict):
-            st.error("❌ Expected Bell measurements to be a dictionary")
+        if not isinstance(measurements, dict) or 'basis' not in measurements:
+            st.error("❌ Expected columnar Bell measurements")
             st.json(measurements)
             return
         
         # Correlation plot
-        bases = list(measurements.keys())
-        theory_corr = [measurements[b]['theory_correlation'] for b in bases]
-        measured_corr = [measurements[b]['measured_correlation'] for b in bases]
+        df = memoized("measurements", lambda: pd.DataFrame(measurements))
         
         fig = go.Figure()
-        fig.add_trace(go.Bar(x=bases, y=theory_corr, name='Theory', marker_color='blue', opacity=0.7))
-        fig.add_trace(go.Bar(x=bases, y=measured_corr, name='Measured', marker_color='red', opacity=0.7))
+        fig.add_trace(go.Bar(x=df['basis'], y=df['theory_correlation'], name='Theory', marker_color='blue', opacity=0.7))
+        fig.add_trace(go.Bar(x=df['basis'], y=df['measured_correlation'], name='Measured', marker_color='red', opacity=0.7))
         
         fig.update_layout(
             title="Bell State Correlations",